@@ -1,9 +1,25 @@
+import time
+
 import streamlit as st
-import requests
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
+import altair as alt
 import pandas as pd
-from io import StringIO
-import re
+
+from crawlscope import (
+    FETCH_SUCCESS,
+    FETCH_UNREACHABLE,
+    analyze_url,
+    audit_sitemaps,
+    check_access_matrix,
+    get_crawler_index,
+    get_result_store,
+    normalize_url,
+    run_bulk_audit,
+    sitemap_insights,
+    url_variants
+)
+from crawlscope.bulk import BULK_MAX_CONCURRENCY, BULK_PER_HOST_CONCURRENCY
+from crawlscope.matrix import DEFAULT_MATRIX_PATHS, normalize_paths
 
 # Configure page
 st.set_page_config(
@@ -224,730 +240,53 @@ with st.sidebar:
     Bot information compiled from multiple sources including the comprehensive [Cloudflare Bot Directory](https://radar.cloudflare.com/bots/directory?kind=all) and other verified crawler databases. Special thanks to Cloudflare for maintaining their extensive bot directory.
     """)
 
-# Complete CRAWLERS dictionary
-CRAWLERS = {
-    "Search Engines": {
-        # Google Ecosystem
-        "Google": "Googlebot",
-        "Google News": "Googlebot-News",
-        "Google Images": "Googlebot-Image",
-        "Google Video": "Googlebot-Video",
-        "Google Other": "GoogleOther",
-        "Google Shopping": "Storebot-Google",
-        "Google Ads": "AdsBot-Google",
-        "Google Ads Mobile": "AdsBot-Google-Mobile",
-        "Google AdSense": "Mediapartners-Google",
-        "Google Extended": "Google-Extended",
-        "Google APIs": "APIs-Google",
-        "Google API": "Google API",
-        "Google Read Aloud": "Google-Read-Aloud",
-        "Google Favicon": "Google Favicon",
-        "Google Rich Snippets": "Google-AMPHTML",
-        "Google Assistant": "Google-Assistant",
-        "Google PageSpeed": "Google Page Speed",
-        "Google Digital Asset Links": "Google Digital Asset Links",
-        "Google Publisher Center": "Google Publisher Center",
-        "Google Schema Markup Testing Tool": "Google Schema Markup Testing Tool",
-        "Google AdWords Express": "Google-AdWords-Express",
-        "Google AdWords Instant": "Google-Adwords-Instant",
-        "Google Page Renderer": "Google-PageRenderer",
-        # Microsoft / Bing
-        "Bing": "BingBot",
-        "Bing Preview": "BingPreview",
-        "Bing Ads": "adidxbot",
-        "MSN Bot": "msnbot",
-        # Major Global Engines
-        "Baidu": "Baiduspider",
-        "Baidu Images": "Baiduspider-image",
-        "Baidu News": "Baiduspider-news",
-        "Yandex": "YandexBot",
-        "Yandex Images": "YandexImages",
-        "Yandex News": "YandexNews",
-        "DuckDuckGo": "DuckDuckBot",
-        "DuckDuckGo Assist": "DuckAssistBot",
-        "Brave": "BraveBot",
-        "Yahoo": "Slurp",
-        "Yahoo Japan": "Y!J-ASC",
-        # Privacy-Focused & Alternative
-        "Ecosia": "ecosia",
-        "Startpage": "Startpage",
-        "Mojeek": "MojeekBot",
-        "Qwant": "Qwantify",
-        # Regional Search Engines
-        "Naver (South Korea)": "Yeti",
-        "Seznam (Czech Republic)": "SeznamBot",
-        "360 Search (China)": "360Spider",
-        "Sogou (China)": "Sogou spider",
-        "CocCoc (Vietnam)": "coccocbot",
-        "PetalBot (Huawei)": "PetalBot",
-        # Apple Search
-        "Apple Search": "Applebot",
-        # Additional Search/Analysis
-        "Alpha Bot": "AlphaBot",
-        "Friendly Crawler": "FriendlyCrawler",
-        "Seekr": "Seekr",
-        "ZumBot": "ZumBot",
-    },
-    
-    "AI Crawlers": {
-        # OpenAI / ChatGPT
-        "GPTBot (Training)": "GPTBot",
-        "OAI-SearchBot (Search)": "OAI-SearchBot",
-        "ChatGPT-User (Browsing)": "ChatGPT-User",
-        "ChatGPT-User 2.0": "ChatGPT-User/2.0",
-        # Anthropic / Claude
-        "ClaudeBot": "ClaudeBot",
-        "Claude Web": "Claude-Web",
-        "Claude User": "Claude-User",
-        "Claude SearchBot": "Claude-SearchBot",
-        "Anthropic AI": "anthropic-ai",
-        # Perplexity AI
-        "PerplexityBot": "PerplexityBot",
-        "Perplexity-User": "Perplexity-User",
-        # Common Crawl
-        "Common Crawl": "CCBot",
-        # Big Tech AI
-        "Google AI": "Google-Extended",
-        "Google Agent Mariner": "GoogleAgent-Mariner",
-        "Google Cloud Vertex": "CloudVertexBot",
-        "Meta AI": "Meta-ExternalAgent",
-        "Meta Facebook": "facebookexternalhit",
-        "Apple AI": "Applebot-Extended",
-        "Amazon AI": "Amazonbot",
-        "Amazon Nova Act": "Nova Act",
-        "ByteDance AI (TikTok)": "Bytespider",
-        # AI-Powered Search Engines
-        "You.com": "YouBot",
-        "Kagi Search": "KagiBot",
-        "AddSearch": "AddSearchBot",
-        # Additional AI Companies
-        "Cohere AI": "cohere-ai",
-        "Cohere Training": "cohere-training-data-crawler",
-        "Mistral AI User": "MistralAI-User",
-        "DeepSeek": "DeepseekBot",
-        "Grok AI": "GrokBot",
-        "Hugging Face": "HuggingFaceBot",
-        "Hugging Face Crawler": "huggingface",
-        "Huawei PanGu": "PanguBot",
-        "OpenAssistant": "OpenAssistantBot",
-        # AI Content/Image Scrapers
-        "Image Dataset": "img2dataset",
-        "Magpie Crawler": "magpie-crawler",
-        "News Please": "news-please",
-        # AI Assistants
-        "BigSur AI": "bigsur.ai",
-        "Devin AI": "Devin",
-        "Gemini Deep Research": "Gemini-Deep-Research",
-        "Liner Bot": "LinerBot",
-        "Qualified Bot": "QualifiedBot",
-        # Research & Academic AI
-        "Allen Institute for Artificial Intelligence (Ai2)": "AI2Bot",
-        "Japan Research": "ICC-Crawler",
-        "Diffbot": "Diffbot",
-        "Omgili": "omgili",
-        "Omgili Bot": "omgilibot",
-        "Webz.io Extended": "Webzio-Extended",
-        # Emerging AI Search
-        "Timpi": "TimpiBot",
-    },
-    
-    "SEO & Analytics": {
-        # Major SEO Tools
-        "Ahrefs": "AhrefsBot",
-        "Ahrefs Site Audit": "Ahrefs Site Audit",
-        "Semrush": "SemrushBot",
-        "Semrush Site Audit": "SemrushBot-SA",
-        "Majestic": "MJ12bot",
-        "Moz": "rogerbot",
-        "Moz Links": "dotbot",
-        "Screaming Frog": "Screaming Frog SEO Spider",
-        # Additional verified SEO bots
-        "SerpStat": "serpstatbot",
-        "LinkResearchTools": "LRTBot",
-        "SEMScoop": "SEMScoopBot",
-        "DeepCrawl": "DeepCrawlBot",
-        "OnCrawl": "OnCrawlBot",
-        "Botify": "BotifyBot",
-        "Ryte": "RyteBot",
-        "Sistrix": "SistrixBot",
-        "SearchMetrics": "SearchMetricsBot",
-        "BrightEdge": "BrightEdgeBot",
-        "seoClarity": "seoClarityBot",
-        # SEO Tools from Cloudflare
-        "DataForSEO": "DataForSEO",
-        "Siteimprove Crawl": "Siteimprove Crawl",
-        "prerender": "prerender",
-        "Barkrowler": "Barkrowler",
-        # Marketing/Analytics Bots
-        "ADmantX": "ADmantX",
-        "Awario RSS": "AwarioRssBot",
-        "Awario Smart": "AwarioSmartBot",
-        "BLEX Bot": "BLEXBot",
-        "Clarity Bot": "claritybot",
-        "ImagesiftBot": "ImagesiftBot",
-        "Meltwater": "Meltwater",
-        "Pipl Bot": "PiplBot",
-        "Senti Bot": "SentiBot",
-        # Analytics Services from Cloudflare
-        "FullStory": "FullStory",
-        "Proximic": "Proximic",
-        "Taboola": "Taboola",
-        "klaviyo": "klaviyo",
-    },
-    
-    "Social Media": {
-        # Meta Platforms
-        "Facebook": "facebookexternalhit",
-        "Facebook Bot": "FacebookBot",
-        "Instagram": "facebookexternalhit",
-        "WhatsApp": "WhatsApp",
-        # X (Twitter)
-        "Twitter / X": "Twitterbot",
-        # Professional Networks
-        "LinkedIn": "LinkedInBot",
-        # Other Major Social Platforms
-        "Pinterest": "Pinterestbot",
-        "TikTok": "Bytespider",
-        "Reddit": "RedditBot",
-        "YouTube": "YouTubeBot",
-        "Snapchat": "SnapchatBot",
-        "Skype": "SkypeUriPreview",
-        "Bluesky": "Bluesky",
-        # Messaging Apps
-        "Telegram": "TelegramBot",
-        "Slack": "Slackbot",
-        "Slack Image Proxy": "Slack-ImgProxy",
-        "Slack Link Expanding": "Slackbot-LinkExpanding",
-        "Slack Image Proxy CF": "Slack Image Proxy",
-        "Discord": "Discordbot",
-        "WeChat": "WeChatBot",
-        "Line": "LineBot",
-        # Email/Social Extensions
-        "YahooMailProxy": "YahooMailProxy",
-        # Professional Networks
-        "Xing": "XingBot",
-        # Content Platforms
-        "Medium": "MediumBot",
-        "Substack": "SubstackBot",
-        "Tumblr": "TumblrBot"
-    },
-    
-    "Content Aggregators & News": {
-        # News & Media Platforms
-        "Apple News": "AppleNewsBot",
-        "Flipboard": "FlipboardProxy",
-        "SmartNews": "SmartNewsBot",
-        "NewsBreak": "NewsBreakBot",
-        "Yahoo News": "YahooNewsBot",
-        "BBC": "BBCBot",
-        "Reuters": "ReutersBot",
-        "Associated Press": "APBot",
-        # Content Aggregators
-        "Buzz Bot": "Buzzbot",
-        "NewsNow": "NewsNow",
-        "Panscient": "panscient.com",
-        "Scoop.it": "scoop.it",
-    },
-    
-    "E-commerce & Shopping": {
-        # Major E-commerce
-        "Amazon": "Amazonbot",
-        "eBay": "eBayBot",
-        "Shopify": "ShopifyBot",
-        "Shopify Captain Hook": "Shopify-Captain-Hook",
-        "WooCommerce": "WooCommerceBot",
-        "Magento": "MagentoBot",
-        "Etsy": "EtsyBot",
-        "Alibaba": "AlibabaBot",
-        "AliExpress": "AliExpressBot",
-        "Rakuten": "RakutenBot",
-        "Zalando": "ZalandoBot",
-        "PriceGrabber": "PriceGrabberBot",
-        "Shopping.com": "ShoppingBot",
-        "Kelkoo": "KelkooBot",
-        "Nextag": "NextagBot",
-        # Payment Processors
-        "Stripe": "Stripe",
-        "PayPal": "PayPal",
-        "Adyen": "Adyen",
-        "ChargeBee": "ChargeBee",
-    },
-    
-    "Email & Marketing": {
-        # Major Email/Marketing Platforms
-        "MailChimp": "MailChimpBot",
-        "Constant Contact": "ConstantContactBot",
-        "SendGrid": "SendGridBot",
-        "Campaign Monitor": "CampaignMonitorBot",
-        "HubSpot": "HubSpotBot",
-        "HubSpot Crawler": "HubSpot Crawler",
-        "Marketo": "MarketoBot",
-        "Pardot": "PardotBot",
-        "ActiveCampaign": "ActiveCampaignBot",
-        "ConvertKit": "ConvertKitBot",
-        "AWeber": "AWeberBot"
-    },
-    
-    "Security & Monitoring": {
-        # Security & Monitoring Tools
-        "Cloudflare": "CloudflareBot",
-        "Sucuri": "SucuriBot",
-        "Wordfence": "WordfenceBot",
-        "SiteLock": "SiteLockBot",
-        "Qualys": "QualysBot",
-        "Nessus": "NessusBot",
-        "OpenVAS": "OpenVASBot",
-        "Shodan": "ShodanBot",
-        "Censys": "CensysBot",
-        "ZoomEye": "ZoomEyeBot",
-        "BinaryEdge": "BinaryEdgeBot",
-        # Security Services
-        "Detectify": "Detectify",
-        "OneTrust CMP Scanner": "Onetrust CMP Scanner",
-        "Let's Encrypt": "Let's Encrypt",
-        "ProjectShield URL Check": "ProjectShield Url Check",
-        "Google Trust Services": "Google Trust Services (DCV Check)",
-    },
-    
-    "Site Monitoring & Analytics": {
-        # Site Monitoring Tools
-        "Pingdom": "PingdomBot",
-        "UptimeRobot": "UptimeRobotBot",
-        "Site24x7": "Site24x7Bot",
-        "StatusCake": "StatusCakeBot",
-        "GTmetrix": "GTmetrixBot",
-        "WebPageTest": "WebPageTestBot",
-        "Lighthouse": "LighthouseBot",
-        "Chrome Lighthouse": "Chrome-Lighthouse",
-        "PageSpeed Insights": "PageSpeedBot",
-        "Dareboost": "DareboostBot",
-        "Google Site Verification": "Google-Site-Verification",
-        "Google Association Service": "GoogleAssociationService",
-        "Datadog Synthetics": "Datadog Synthetics",
-        "Ghost Inspector": "Ghost Inspector",
-        "Hotjar": "Hotjar",
-        "New Relic": "NewRelicbot",
-        "Uptime.com": "Uptime.com",
-        "Catchpoint": "Catchpoint",
-        # Major Monitoring Services
-        "Better Uptime": "Better Uptime",
-        "Grafana Synthetic Monitoring": "Grafana's Synthetic Monitoring",
-        "Splunk Synthetics": "Splunk Synthetics",
-        "Uptime LLC": "Uptime LLC",
-        "Sentry Uptime Monitoring": "Sentry Uptime Monitoring",
-        "LogicMonitor": "logicmonitor",
-        "NodePing": "Nodeping",
-        "Sentry": "Sentry",
-    },
-    
-    "Academic & Research": {
-        # Academic/Research Platforms
-        "ResearchGate": "ResearchGateBot",
-        "Academia.edu": "AcademiaBot",
-        "JSTOR": "JSTORBot",
-        "PubMed": "PubMedBot",
-        "arXiv": "arXivBot",
-        "Semantic Scholar": "SemanticScholarBot",
-        "CORE": "COREBot",
-        "CrossRef": "CrossRefBot",
-        "ORCID": "ORCIDBot",
-        "Turnitin Bot": "TurnitinBot",
-    },
-    
-    "Archive & Backup": {
-        # Archive & Backup Tools
-        "Wayback Machine": "ia_archiver",
-        "Internet Archive Bot": "archive.org_bot",
-        "Internet Archive Extended": "ia_archiver-web.archive.org",
-        "Wikipedia Bot": "IABot",
-        "Archive.today": "archiveis_bot",
-        "Portuguese Archive": "Arquivo-web-crawler",
-        "French National Library": "bnf.fr_bot",
-        "Turnitin Crawler": "Turnitin",
-        "Heritrix": "heritrix",
-        "HTTrack": "httrack",
-        "Wget": "Wget",
-        "cURL": "curl",
-        "Nutch": "nutch"
-    },
-    
-    "Development & Testing": {
-        # Development Tools
-        "Postman": "PostmanRuntime",
-        "Insomnia": "insomnia",
-        "Selenium": "selenium",
-        "Puppeteer": "HeadlessChrome",
-        "Playwright": "Playwright",
-        "PhantomJS": "PhantomJS",
-        "SlimerJS": "SlimerJS",
-        "Cypress": "Cypress",
-        "WebDriver": "webdriver",
-        "Scrapy": "Scrapy",
-        "cron-job.org": "cron-job.org",
-        "Zapier": "Zapier",
-        "Retool": "Retool",
-        "VaultPress": "VaultPress",
-        "Make Platform": "Make Platform",
-    },
-    
-    "Feed Readers & Aggregators": {
-        # Feed Readers
-        "Feedly": "FeedlyBot",
-        "Feedbin": "Feedbin",
-        "Inoreader": "InoreaderBot",
-        "NewsBlur": "NewsBlurBot",
-        "The Old Reader": "OldReaderBot",
-        "Flipboard": "FlipboardBot",
-        "Pocket": "PocketBot",
-        "Overcast": "Overcast",
-        "Instapaper": "InstapaperBot",
-        "ReadWise": "ReadWiseBot",
-        "IFTTT": "IFTTT",
-        "Google Image Proxy": "GoogleImageProxy",
-        "Microsoft Preview": "MicrosoftPreview",
-        # Content/Feed Services from Cloudflare
-        "HubSpot Feed Fetcher": "HubSpot Feed Fetcher",
-        "HubSpot Page Fetcher": "HubSpot Page Fetcher",
-        "Google Feed Fetcher": "Google Feed Fetcher",
-        "RSS API": "RSS API",
-        "Pocket Casts Feed Parser": "Pocket Casts Feed Parser",
-        "Blogtrottr": "Blogtrottr",
-    },
-    
-    "Infrastructure & CDN": {
-        # Cloudflare's own services and CDN bots
-        "Cloudflare Prefetch": "Cloudflare Prefetch",
-        "Cloudflare Traffic Manager": "Cloudflare-Traffic-Manager",
-        "Cloudflare Healthchecks": "Cloudflare Healthchecks",
-        "Cloudflare Stream Webhook": "Cloudflare Stream Webhook",
-        "Cloudflare Custom Hostname Verification": "Cloudflare Custom Hostname Verification",
-        "Cloudflare SSLDetector": "Cloudflare SSLDetector",
-    },
-    
-    "Miscellaneous & Validators": {
-        # W3C Validators
-        "W3C Link Checker": "W3C_Validator",
-        "W3C CSS Validator": "Jigsaw",
-        "W3C Markup Validator": "W3C_Validator",
-        # CMS & Platform Bots
-        "WordPress": "WordPress",
-        "Drupal": "DrupalBot",
-        "Joomla": "JoomlaBot",
-        "Typepad": "TypePadBot",
-        # Other Bots
-        "Robozilla": "Robozilla",
-        "AASA-Bot": "AASA-Bot",
-        "PSBot": "psbot",
-        "SiteAuditBot": "SiteAuditBot",
-        "FeedBurner": "FeedBurner",
-        "Hatena Antenna": "Hatena Antenna",
-        "InfoNaviRobot": "InfoNaviRobot",
-        "Harvest": "Harvest",
-        # Generic Patterns
-        "Generic Bot": "bot",
-        "Spider": "spider",
-        "Crawler": "crawler"
-    }
-}
-
-class RobustRobotsParser:
-    """Custom robots.txt parser that handles malformed files properly"""
-    
-    def __init__(self, robots_content, base_url):
-        self.robots_content = robots_content
-        self.base_url = base_url
-        self.rules = self._parse_robots()
-    
-    def _parse_robots(self):
-        """Parse robots.txt content into structured rules"""
-        rules = {}
-        current_user_agents = []
-        
-        lines = self.robots_content.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            
-            # Skip empty lines and comments
-            if not line or line.startswith('#'):
-                continue
-            
-            # Handle User-agent directive
-            if line.lower().startswith('user-agent:'):
-                user_agent = line[11:].strip()
-                if user_agent:
-                    current_user_agents = [user_agent]
-                    if user_agent not in rules:
-                        rules[user_agent] = {
-                            'disallows': [],
-                            'allows': [],
-                            'crawl_delay': None
-                        }
-            
-            # Handle Disallow directive
-            elif line.lower().startswith('disallow:') and current_user_agents:
-                path = line[9:].strip()
-                for ua in current_user_agents:
-                    if ua in rules:
-                        rules[ua]['disallows'].append(path)
-            
-            # Handle Allow directive
-            elif line.lower().startswith('allow:') and current_user_agents:
-                path = line[6:].strip()
-                for ua in current_user_agents:
-                    if ua in rules:
-                        rules[ua]['allows'].append(path)
-            
-            # Handle Crawl-delay directive
-            elif line.lower().startswith('crawl-delay:') and current_user_agents:
-                try:
-                    delay = float(line[12:].strip())
-                    for ua in current_user_agents:
-                        if ua in rules:
-                            rules[ua]['crawl_delay'] = delay
-                except ValueError:
-                    pass
-        
-        return rules
-    
-    def _normalize_user_agent(self, user_agent):
-        """Normalize user agent for matching"""
-        return user_agent.lower().strip()
-    
-    def _path_matches(self, path, pattern):
-        """Check if a path matches a robots.txt pattern"""
-        if not pattern:
-            return False
-        
-        # Handle wildcard patterns
-        if '*' in pattern:
-            # Convert robots.txt wildcards to regex
-            regex_pattern = pattern.replace('*', '.*')
-            try:
-                return bool(re.match(regex_pattern, path))
-            except re.error:
-                return False
-        else:
-            # Exact prefix match
-            return path.startswith(pattern)
-    
-    def can_fetch(self, user_agent, path="/"):
-        """Check if a user agent can fetch the given path"""
-        if not user_agent:
-            return True
-        
-        normalized_ua = self._normalize_user_agent(user_agent)
-        
-        # Check for exact match first
-        matching_rules = None
-        
-        # Try exact match
-        for rule_ua in self.rules:
-            if self._normalize_user_agent(rule_ua) == normalized_ua:
-                matching_rules = self.rules[rule_ua]
-                break
-        
-        # If no exact match, try wildcard match
-        if not matching_rules:
-            for rule_ua in self.rules:
-                if rule_ua == '*':
-                    matching_rules = self.rules[rule_ua]
-                    break
-        
-        # If no rules found, default to allow
-        if not matching_rules:
-            return True
-        
-        # Check allows first (they take precedence)
-        for allow_pattern in matching_rules['allows']:
-            if self._path_matches(path, allow_pattern):
-                return True
-        
-        # Then check disallows
-        for disallow_pattern in matching_rules['disallows']:
-            if self._path_matches(path, disallow_pattern):
-                return False
-        
-        # If no specific rule matches, allow by default
-        return True
-    
-    def crawl_delay(self, user_agent):
-        """Get crawl delay for a user agent"""
-        if not user_agent:
-            return None
-        
-        normalized_ua = self._normalize_user_agent(user_agent)
-        
-        # Check for exact match first
-        for rule_ua in self.rules:
-            if self._normalize_user_agent(rule_ua) == normalized_ua:
-                return self.rules[rule_ua]['crawl_delay']
-        
-        # If no exact match, try wildcard match
-        for rule_ua in self.rules:
-            if rule_ua == '*':
-                return self.rules[rule_ua]['crawl_delay']
-        
-        return None
-
-def normalize_url(url):
-    """Normalize URL by adding protocol if missing"""
-    if not url.startswith(('http://', 'https://')):
-        url = 'https://' + url
-    return url
-
-def get_robots_txt_content(url):
-    """Fetch robots.txt content from URL"""
-    try:
-        parsed_url = urlparse(url)
-        robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
-        response = requests.get(robots_url, timeout=10)
-        if response.status_code == 200:
-            return robots_url, response.text
-        else:
-            return robots_url, None
-    except Exception as e:
-        return None, str(e)
-
-def check_crawler_access(robots_content, base_url, crawlers_dict):
-    """Check access status for all crawlers using robust parser"""
-    results = []
-    parser = RobustRobotsParser(robots_content, base_url)
-    
-    for category, crawlers in crawlers_dict.items():
-        for name, user_agent in crawlers.items():
-            try:
-                can_access = parser.can_fetch(user_agent, "/")
-                crawl_delay = parser.crawl_delay(user_agent)
-                results.append({
-                    'Category': category,
-                    'Platform': name,
-                    'User Agent': user_agent,
-                    'Access Status': '✅ Allowed' if can_access else '❌ Blocked',
-                    'Crawl Delay': f"{crawl_delay}s" if crawl_delay else "None",
-                    'Can Access': can_access
-                })
-            except Exception as e:
-                results.append({
-                    'Category': category,
-                    'Platform': name,
-                    'User Agent': user_agent,
-                    'Access Status': f'⚠️ Error: {str(e)}',
-                    'Crawl Delay': "N/A",
-                    'Can Access': False
-                })
-    return results
-
-def generate_insights(df, robots_content):
-    """Generate accurate insights based on the analysis results"""
-    insights = []
-    
-    if df.empty:
-        return ["No data available for analysis"]
-    
-    total_crawlers = len(df)
-    allowed_crawlers = (df['Can Access'] == True).sum()
-    blocked_crawlers = total_crawlers - allowed_crawlers
-    block_rate = (blocked_crawlers / total_crawlers) * 100
-    
-    # Overall access insights
-    if block_rate > 70:
-        insights.append(f"🔒 **High Security Mode**: {block_rate:.1f}% of crawlers are blocked - excellent for privacy protection")
-    elif block_rate > 40:
-        insights.append(f"⚖️ **Balanced Access**: {block_rate:.1f}% of crawlers are blocked - moderate protection")
-    elif block_rate > 10:
-        insights.append(f"🌍 **Open Policy**: {block_rate:.1f}% of crawlers are blocked - prioritizing visibility")
-    else:
-        insights.append(f"🚪 **Fully Open**: Only {block_rate:.1f}% of crawlers are blocked - maximum accessibility")
-    
-    # Category-specific insights
-    category_stats = df.groupby('Category')['Can Access'].agg(['count', 'sum']).reset_index()
-    category_stats['block_rate'] = ((category_stats['count'] - category_stats['sum']) / category_stats['count'] * 100).round(1)
-    
-    # AI Crawlers analysis
-    ai_stats = category_stats[category_stats['Category'] == 'AI Crawlers']
-    if not ai_stats.empty:
-        ai_block_rate = ai_stats.iloc[0]['block_rate']
-        ai_total = ai_stats.iloc[0]['count']
-        ai_blocked = ai_stats.iloc[0]['count'] - ai_stats.iloc[0]['sum']
-        
-        if ai_block_rate > 80:
-            insights.append(f"🤖 **AI Privacy Strong**: {ai_blocked}/{ai_total} AI crawlers blocked ({ai_block_rate:.1f}%) - protecting content from training")
-        elif ai_block_rate > 50:
-            insights.append(f"🤖 **AI Privacy Moderate**: {ai_blocked}/{ai_total} AI crawlers blocked ({ai_block_rate:.1f}%) - balanced AI access")
-        else:
-            insights.append(f"🤖 **AI Training Allowed**: Only {ai_blocked}/{ai_total} AI crawlers blocked ({ai_block_rate:.1f}%) - content available for training")
-    
-    # Search Engines analysis
-    search_stats = category_stats[category_stats['Category'] == 'Search Engines']
-    if not search_stats.empty:
-        search_block_rate = search_stats.iloc[0]['block_rate']
-        search_blocked = search_stats.iloc[0]['count'] - search_stats.iloc[0]['sum']
-        
-        if search_block_rate > 30:
-            insights.append(f"⚠️ **SEO Warning**: {search_block_rate:.1f}% of search engines blocked - may impact search visibility")
-        elif search_block_rate > 10:
-            insights.append(f"🔍 **SEO Caution**: {search_block_rate:.1f}% of search engines blocked - monitor search impact")
-        else:
-            insights.append(f"✅ **SEO Friendly**: Only {search_block_rate:.1f}% of search engines blocked - excellent for visibility")
-    
-    # SEO & Analytics analysis
-    seo_stats = category_stats[category_stats['Category'] == 'SEO & Analytics']
-    if not seo_stats.empty:
-        seo_block_rate = seo_stats.iloc[0]['block_rate']
-        
-        if seo_block_rate > 60:
-            insights.append(f"📊 **Limited Analytics**: {seo_block_rate:.1f}% of SEO tools blocked - reduced insights available")
-        elif seo_block_rate > 30:
-            insights.append(f"📈 **Moderate Analytics**: {seo_block_rate:.1f}% of SEO tools blocked - some insights limited")
-        else:
-            insights.append(f"📊 **Full Analytics**: Only {seo_block_rate:.1f}% of SEO tools blocked - comprehensive insights available")
-    
-    # Social Media analysis
-    social_stats = category_stats[category_stats['Category'] == 'Social Media']
-    if not social_stats.empty:
-        social_block_rate = social_stats.iloc[0]['block_rate']
-        
-        if social_block_rate > 50:
-            insights.append(f"📱 **Social Privacy**: {social_block_rate:.1f}% of social platforms blocked - limited social sharing")
-        else:
-            insights.append(f"📱 **Social Friendly**: Only {social_block_rate:.1f}% of social platforms blocked - good for sharing")
-    
-    # Robots.txt quality insights
-    if robots_content:
-        lines = [line.strip() for line in robots_content.split('\n') if line.strip()]
-        
-        # Check for sitemap - only show if actually missing
-        has_sitemap = any(line.lower().startswith('sitemap:') for line in lines)
-        if not has_sitemap:
-            insights.append("💡 **Missing Sitemap**: Add 'Sitemap: https://yoursite.com/sitemap.xml' to help crawlers find your content")
-        
-        # Check for meaningful wildcard usage - only show if actually using wildcards effectively
-        has_meaningful_wildcards = False
-        for line in lines:
-            if line.lower().startswith('disallow:') and '*' in line:
-                has_meaningful_wildcards = True
-                break
-            elif line.lower().startswith('user-agent:') and '*' in line:
-                has_meaningful_wildcards = True
-                break
-        
-        if has_meaningful_wildcards:
-            insights.append("🎯 **Using Wildcards**: Good use of universal rules for efficient crawler management")
-        
-        # Check for very basic robots.txt
-        meaningful_lines = [line for line in lines if line.lower().startswith(('user-agent:', 'disallow:', 'allow:', 'crawl-delay:', 'sitemap:'))]
-        if len(meaningful_lines) < 3:
-            insights.append("⚠️ **Simple robots.txt**: Consider adding more specific rules for better crawler control")
-    else:
-        insights.append("💡 **No robots.txt**: Creating a robots.txt file gives you control over crawler access")
-    
-    return insights
-
 def create_category_anchor(category_name):
     """Create URL-safe anchor from category name"""
     return category_name.lower().replace(' ', '-').replace('&', 'and')
 
+# Per-category tables scroll internally beyond this height (in pixels)
+CATEGORY_TABLE_MAX_HEIGHT = 400
+
+CATEGORY_TABLE_COLUMNS = {
+    'Platform': st.column_config.TextColumn("Platform", width="medium"),
+    'User Agent': st.column_config.TextColumn("User Agent", width="medium"),
+    'Access Status': st.column_config.TextColumn("Access", width="small"),
+    'Crawl Delay': st.column_config.TextColumn("Crawl Delay", width="small")
+}
+
+def filter_results(df, text, access):
+    """Filter crawler results by platform/user agent text and access status"""
+    if text:
+        text = text.strip().lower()
+        df = df[
+            df['Platform'].str.lower().str.contains(text, regex=False)
+            | df['User Agent'].str.lower().str.contains(text, regex=False)
+        ]
+    if access == "Allowed":
+        df = df[df['Can Access'] == True]
+    elif access == "Blocked":
+        df = df[df['Can Access'] == False]
+    return df
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def cached_access_matrix(robots_content, paths, registry_version, _document=None):
+    """Crawler x path matrix and its heatmap data, reused across reruns and sessions"""
+    matrix = check_access_matrix(robots_content, '', paths, document=_document)
+    return matrix.to_dataframe(), matrix.heatmap_frame()
+
+def matrix_heatmap(heatmap_df, paths, categories):
+    """Category x path heatmap of block rates, green when everything is allowed"""
+    return alt.Chart(heatmap_df).mark_rect().encode(
+        x=alt.X('Path:N', sort=paths, title=None, axis=alt.Axis(labelAngle=-30)),
+        y=alt.Y('Category:N', sort=categories, title=None),
+        color=alt.Color(
+            field='Block Rate %',
+            type='quantitative',
+            scale=alt.Scale(domain=[0, 100], scheme='redyellowgreen', reverse=True)
+        ),
+        tooltip=['Category', 'Path', 'Allowed', 'Total', alt.Tooltip(field='Block Rate %', type='quantitative')]
+    ).properties(height=28 * len(categories))
+
 # Main interface
 st.subheader("🌐 Website URL")
 
@@ -969,222 +308,415 @@ if url_input != st.session_state.get('url_input', ''):
     st.session_state['url_input'] = url_input
 
 # Analyze button (analyzes all categories by default)
-if st.button("🔍 Analyze Access Status", type="primary"):
+analyze_col, refetch_col = st.columns([1, 4])
+with analyze_col:
+    analyze_clicked = st.button("🔍 Analyze Access Status", type="primary")
+with refetch_col:
+    refetch_clicked = st.button(
+        "🔄 Re-fetch",
+        help="Download robots.txt again instead of using the cached copy (cached for up to 24 hours)"
+    )
+if analyze_clicked or refetch_clicked:
     if url_input:
-        with st.spinner("CrawlScope is analyzing robots.txt file..."):
-            # Normalize URL
-            normalized_url = normalize_url(url_input.strip())
-            
-            # Get robots.txt content
-            robots_url, robots_content = get_robots_txt_content(normalized_url)
-            
-            if robots_content:
-                st.success(f"✅ Successfully fetched robots.txt from: {robots_url}")
-                
-                # Check crawler access using robust parser
-                results = check_crawler_access(robots_content, normalized_url, CRAWLERS)
-                
-                # Create DataFrame
-                df = pd.DataFrame(results)
-                
-                # Display summary metrics
-                st.subheader("📊 CrawlScope Analysis Results")
+        # Remember what was analyzed so the results survive reruns
+        st.session_state['analysis_url'] = normalize_url(url_input.strip())
+        # Only this run bypasses the caches; later reruns reuse the fresh result
+        st.session_state['analysis_force'] = refetch_clicked
+    else:
+        st.warning("⚠️ Please enter a website URL")
+
+# Render the last analysis on every rerun; the cached layers make this free
+if st.session_state.get('analysis_url'):
+    normalized_url = st.session_state['analysis_url']
+    
+    # Get robots.txt content, crawler results, category stats and insights,
+    # computed once and shared with other sessions
+    with st.spinner("CrawlScope is analyzing robots.txt file..."):
+        analysis = analyze_url(normalized_url, force=st.session_state.pop('analysis_force', False))
+    fetch, results, category_stats = analysis.fetch, analysis.results, analysis.category_stats
+    
+    if fetch.outcome != FETCH_UNREACHABLE:
+        if fetch.outcome == FETCH_SUCCESS:
+            st.success(f"✅ Successfully fetched robots.txt from: {fetch.robots_url}")
+        else:
+            # RFC 9309: an unavailable robots.txt means crawlers may access everything
+            status = f"HTTP {fetch.status_code}" if fetch.status_code else fetch.error
+            st.warning(f"⚠️ No robots.txt found at {fetch.robots_url} ({status}). Under RFC 9309 all crawlers are allowed.")
+        if fetch.variant != url_variants(normalized_url)[0][0]:
+            st.info(f"ℹ️ The URL as entered was unreachable, so CrawlScope used the **{fetch.variant}** variant instead.")
+        if fetch.redirects:
+            st.caption("Redirect chain: " + " → ".join(fetch.redirects))
+        if fetch.stale:
+            st.warning(f"⚠️ {fetch.robots_url} could not be reached ({fetch.error}), so the last cached copy is shown.")
+        elif fetch.from_cache:
+            st.caption("Served from the local robots.txt cache")
+        if fetch.truncated:
+            st.caption("robots.txt is larger than 500 KiB; only the first 500 KiB were parsed (RFC 9309)")
+        robots_content = fetch.effective_content
+        
+        # Create DataFrame; statuses are formatted here, not stored with the results
+        df = results.to_dataframe()
+        
+        # Display summary metrics
+        st.subheader("📊 CrawlScope Analysis Results")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        total_crawlers = len(results)
+        allowed_crawlers = results.allowed
+        blocked_crawlers = total_crawlers - allowed_crawlers
+        
+        with col1:
+            st.metric("Total Crawlers", total_crawlers)
+        with col2:
+            st.metric("✅ Allowed", allowed_crawlers)
+        with col3:
+            st.metric("❌ Blocked", blocked_crawlers)
+        with col4:
+            st.metric("Block Rate", f"{(blocked_crawlers/total_crawlers)*100:.1f}%")
+        
+        # Quick Navigation using Streamlit columns instead of HTML
+        st.markdown("---")
+        st.subheader("🔍 Quick Navigation")
+        st.markdown("**Main Sections**")
+        
+        # Main section buttons
+        col1, col2, col3, col4, col5, col6 = st.columns(6)
+        with col1:
+            st.markdown('[📈 Category Analysis](#category-analysis)', unsafe_allow_html=True)
+        with col2:
+            st.markdown('[📋 Complete Analysis](#complete-analysis)', unsafe_allow_html=True)
+        with col3:
+            st.markdown('[🧭 Path Matrix](#path-matrix)', unsafe_allow_html=True)
+        with col4:
+            st.markdown('[📄 robots.txt Content](#robots-content)', unsafe_allow_html=True)
+        with col5:
+            st.markdown('[💡 Key Insights](#key-insights)', unsafe_allow_html=True)
+        with col6:
+            st.markdown('[🗺️ Sitemap Audit](#sitemap-audit)', unsafe_allow_html=True)
+        
+        st.markdown("**Individual Categories**")
+        
+        # Category buttons in grid
+        categories = list(get_crawler_index().categories)
+        rows = [categories[i:i+3] for i in range(0, len(categories), 3)]
+        
+        for row in rows:
+            cols = st.columns(len(row))
+            for i, category in enumerate(row):
+                with cols[i]:
+                    anchor = create_category_anchor(category)
+                    st.markdown(f'[{category}](#{anchor})', unsafe_allow_html=True)
+        
+        st.markdown("---")
+        
+        # ANCHOR: Category Analysis
+        st.markdown('<div id="category-analysis" class="section-anchor"></div>', unsafe_allow_html=True)
+        st.subheader("📈 Category Analysis")
+        category_analysis = pd.DataFrame.from_dict(category_stats, orient='index')
+        category_analysis.index.name = 'Category'
+        
+        st.dataframe(category_analysis, use_container_width=True)
+        
+        # Filters apply to every category table below
+        filter_col1, filter_col2 = st.columns([2, 1])
+        with filter_col1:
+            crawler_filter = st.text_input(
+                "Filter crawlers",
+                placeholder="Platform or user agent, e.g. GPTBot",
+                key="crawler_filter"
+            )
+        with filter_col2:
+            access_filter = st.radio(
+                "Show",
+                ["All", "Allowed", "Blocked"],
+                horizontal=True,
+                key="crawler_access_filter"
+            )
+        filtered_df = filter_results(df, crawler_filter, access_filter)
+        
+        # Display results by category with ANCHORS
+        for category in categories:
+            if category in category_stats:
+                # ANCHOR: Individual category sections
+                st.markdown(f'<div id="{create_category_anchor(category)}" class="section-anchor"></div>', unsafe_allow_html=True)
+                st.subheader(f"📋 {category}")
                 
-                col1, col2, col3, col4 = st.columns(4)
-                total_crawlers = len(results)
-                allowed_crawlers = (df['Can Access'] == True).sum()
-                blocked_crawlers = total_crawlers - allowed_crawlers
+                # Show category summary
+                cat_total = category_stats[category]['Total']
+                cat_allowed = category_stats[category]['Allowed']
+                cat_blocked = category_stats[category]['Blocked']
                 
+                col1, col2, col3 = st.columns(3)
                 with col1:
-                    st.metric("Total Crawlers", total_crawlers)
+                    st.metric("Total", cat_total)
                 with col2:
-                    st.metric("✅ Allowed", allowed_crawlers)
+                    st.metric("Allowed", cat_allowed, delta=f"{(cat_allowed/cat_total)*100:.1f}%")
                 with col3:
-                    st.metric("❌ Blocked", blocked_crawlers)
-                with col4:
-                    st.metric("Block Rate", f"{(blocked_crawlers/total_crawlers)*100:.1f}%")
+                    st.metric("Blocked", cat_blocked, delta=f"{(cat_blocked/cat_total)*100:.1f}%")
                 
-                # Quick Navigation using Streamlit columns instead of HTML
-                st.markdown("---")
-                st.subheader("🔍 Quick Navigation")
-                st.markdown("**Main Sections**")
-                
-                # Main section buttons
-                col1, col2, col3, col4 = st.columns(4)
+                # One virtualized table per category: the browser only draws visible rows
+                visible_df = filtered_df[filtered_df['Category'] == category]
+                if visible_df.empty:
+                    st.caption("No crawlers in this category match the filter")
+                else:
+                    st.dataframe(
+                        visible_df[['Platform', 'User Agent', 'Access Status', 'Crawl Delay']],
+                        hide_index=True,
+                        use_container_width=True,
+                        height=min(CATEGORY_TABLE_MAX_HEIGHT, 38 + 35 * len(visible_df)),
+                        column_config=CATEGORY_TABLE_COLUMNS
+                    )
+        
+        # ANCHOR: Complete Analysis Table
+        st.markdown('<div id="complete-analysis" class="section-anchor"></div>', unsafe_allow_html=True)
+        st.subheader("📋 Complete Analysis Table")
+        display_df = df[['Category', 'Platform', 'User Agent', 'Access Status', 'Crawl Delay']]
+        st.dataframe(display_df, use_container_width=True)
+        
+        # ANCHOR: Path Access Matrix
+        st.markdown('<div id="path-matrix" class="section-anchor"></div>', unsafe_allow_html=True)
+        st.subheader("🧭 Path Access Matrix")
+        matrix_input = st.text_area(
+            "Paths to check (one per line)",
+            value="\n".join(DEFAULT_MATRIX_PATHS),
+            help="Every crawler is checked against each path; full URLs are reduced to their path",
+            key="matrix_paths"
+        )
+        matrix_paths = normalize_paths(matrix_input.splitlines())
+        if matrix_paths:
+            # Each distinct rule group is evaluated once per path, then shared by its crawlers
+            matrix_df, heatmap_df = cached_access_matrix(
+                robots_content, tuple(matrix_paths), get_crawler_index().version, analysis.document
+            )
+            st.caption("Share of each category blocked per path")
+            st.altair_chart(matrix_heatmap(heatmap_df, matrix_paths, categories), use_container_width=True)
+            st.dataframe(matrix_df, hide_index=True, use_container_width=True, height=CATEGORY_TABLE_MAX_HEIGHT)
+            st.download_button(
+                label="📥 Download Path Matrix as CSV",
+                data=matrix_df.to_csv(index=False),
+                file_name=f"crawlscope_matrix_{urlparse(normalized_url).netloc}.csv",
+                mime="text/csv",
+                key="matrix_download"
+            )
+        else:
+            st.caption("Enter at least one path to build the matrix")
+        
+        # ANCHOR: View robots.txt Content
+        st.markdown('<div id="robots-content" class="section-anchor"></div>', unsafe_allow_html=True)
+        with st.expander("📄 View robots.txt Content"):
+            st.text(robots_content)
+        
+        # Download option
+        csv = df.to_csv(index=False)
+        st.download_button(
+            label="📥 Download CrawlScope Results as CSV",
+            data=csv,
+            file_name=f"crawlscope_analysis_{urlparse(normalized_url).netloc}.csv",
+            mime="text/csv"
+        )
+        
+        # ANCHOR: Key Insights
+        st.markdown('<div id="key-insights" class="section-anchor"></div>', unsafe_allow_html=True)
+        st.subheader("💡 Key Insights")
+        insights = analysis.insights
+        
+        for insight in insights:
+            st.info(insight)
+        
+        # ANCHOR: Sitemap Audit
+        st.markdown('<div id="sitemap-audit" class="section-anchor"></div>', unsafe_allow_html=True)
+        st.subheader("🗺️ Sitemap Audit")
+        sitemaps = analysis.document.sitemaps
+        if not sitemaps:
+            st.caption("robots.txt declares no sitemaps")
+        else:
+            st.caption(f"robots.txt declares {len(sitemaps)} sitemap(s). The audit follows sitemap indexes, including .xml.gz files, and checks every listed URL against the rules above.")
+            # Fetching every sitemap can take a while, so it only runs on request
+            if st.button("🗺️ Audit Sitemap URLs", key="sitemap_audit_button"):
+                with st.spinner("Following sitemaps and checking every URL..."):
+                    sitemap_audit = audit_sitemaps(
+                        fetch.redirects[-1] if fetch.redirects else fetch.robots_url,
+                        robots_content,
+                        sitemaps
+                    )
+                st.session_state['sitemap_audit'] = (fetch.robots_url, sitemap_audit)
+            
+            # Keep the audit across reruns, but only for the site it was run on
+            stored_audit = st.session_state.get('sitemap_audit')
+            if stored_audit and stored_audit[0] == fetch.robots_url:
+                sitemap_audit = stored_audit[1]
+                col1, col2, col3 = st.columns(3)
                 with col1:
-                    st.markdown('[📈 Category Analysis](#category-analysis)', unsafe_allow_html=True)
+                    st.metric("Sitemaps", len(sitemap_audit.sitemaps))
                 with col2:
-                    st.markdown('[📋 Complete Analysis](#complete-analysis)', unsafe_allow_html=True)
+                    st.metric("URLs Checked", sitemap_audit.urls)
                 with col3:
-                    st.markdown('[📄 robots.txt Content](#robots-content)', unsafe_allow_html=True)
-                with col4:
-                    st.markdown('[💡 Key Insights](#key-insights)', unsafe_allow_html=True)
-                
-                st.markdown("**Individual Categories**")
-                
-                # Category buttons in grid
-                categories = list(CRAWLERS.keys())
-                rows = [categories[i:i+3] for i in range(0, len(categories), 3)]
-                
-                for row in rows:
-                    cols = st.columns(len(row))
-                    for i, category in enumerate(row):
-                        with cols[i]:
-                            anchor = create_category_anchor(category)
-                            st.markdown(f'[{category}](#{anchor})', unsafe_allow_html=True)
-                
-                st.markdown("---")
-                
-                # ANCHOR: Category Analysis
-                st.markdown('<div id="category-analysis" class="section-anchor"></div>', unsafe_allow_html=True)
-                st.subheader("📈 Category Analysis")
-                category_analysis = df.groupby('Category').agg({
-                    'Can Access': ['count', 'sum']
-                }).round(2)
-                
-                category_analysis.columns = ['Total', 'Allowed']
-                category_analysis['Blocked'] = category_analysis['Total'] - category_analysis['Allowed']
-                category_analysis['Block Rate %'] = ((category_analysis['Blocked'] / category_analysis['Total']) * 100).round(1)
-                
-                st.dataframe(category_analysis, use_container_width=True)
+                    st.metric("❌ Blocked URLs", sitemap_audit.blocked_urls)
                 
-                # Display results by category with ANCHORS
-                for category in CRAWLERS.keys():
-                    if category in df['Category'].values:
-                        # ANCHOR: Individual category sections
-                        st.markdown(f'<div id="{create_category_anchor(category)}" class="section-anchor"></div>', unsafe_allow_html=True)
-                        st.subheader(f"📋 {category}")
-                        category_df = df[df['Category'] == category]
-                        
-                        # Show category summary
-                        cat_total = len(category_df)
-                        cat_allowed = (category_df['Can Access'] == True).sum()
-                        cat_blocked = cat_total - cat_allowed
-                        
-                        col1, col2, col3 = st.columns(3)
-                        with col1:
-                            st.metric("Total", cat_total)
-                        with col2:
-                            st.metric("Allowed", cat_allowed, delta=f"{(cat_allowed/cat_total)*100:.1f}%")
-                        with col3:
-                            st.metric("Blocked", cat_blocked, delta=f"{(cat_blocked/cat_total)*100:.1f}%")
-                        
-                        # Create columns for better layout
-                        for idx, row in category_df.iterrows():
-                            col1, col2, col3 = st.columns([3, 2, 1])
-                            with col1:
-                                st.write(f"**{row['Platform']}**")
-                            with col2:
-                                st.write(row['Access Status'])
-                            with col3:
-                                st.write(row['Crawl Delay'])
-                
-                # ANCHOR: Complete Analysis Table
-                st.markdown('<div id="complete-analysis" class="section-anchor"></div>', unsafe_allow_html=True)
-                st.subheader("📋 Complete Analysis Table")
-                display_df = df[['Category', 'Platform', 'User Agent', 'Access Status', 'Crawl Delay']]
-                st.dataframe(display_df, use_container_width=True)
-                
-                # ANCHOR: View robots.txt Content
-                st.markdown('<div id="robots-content" class="section-anchor"></div>', unsafe_allow_html=True)
-                with st.expander("📄 View robots.txt Content"):
-                    st.text(robots_content)
-                
-                # Download option
-                csv = df.to_csv(index=False)
-                st.download_button(
-                    label="📥 Download CrawlScope Results as CSV",
-                    data=csv,
-                    file_name=f"crawlscope_analysis_{urlparse(normalized_url).netloc}.csv",
-                    mime="text/csv"
-                )
-                
-                # ANCHOR: Key Insights
-                st.markdown('<div id="key-insights" class="section-anchor"></div>', unsafe_allow_html=True)
-                st.subheader("💡 Key Insights")
-                insights = generate_insights(df, robots_content)
-                
-                for insight in insights:
+                for insight in sitemap_insights(sitemap_audit):
                     st.info(insight)
-                    
-            else:
-                st.error("❌ Could not fetch robots.txt file. The website might not have one or it's inaccessible.")
-
-                st.markdown("---")
-                st.markdown("### 📄 Try Alternative URL Formats")
-                st.warning("**Copy any URL below and paste it into the main URL field above, then click 'Analyze Access Status' again:**")
+                
+                st.dataframe(pd.DataFrame(sitemap_audit.sitemaps), hide_index=True, use_container_width=True)
+                if sitemap_audit.blocked_samples:
+                    blocked_df = pd.DataFrame(
+                        [
+                            {'Sitemap': sitemap_url, 'URL': url, 'Blocked For': ', '.join(user_agents)}
+                            for sitemap_url, url, user_agents in sitemap_audit.blocked_samples
+                        ]
+                    )
+                    st.markdown(f"**Blocked sitemap URLs** (first {len(blocked_df)})")
+                    st.dataframe(blocked_df, hide_index=True, use_container_width=True, height=CATEGORY_TABLE_MAX_HEIGHT)
+                    st.download_button(
+                        label="📥 Download Blocked Sitemap URLs as CSV",
+                        data=blocked_df.to_csv(index=False),
+                        file_name=f"crawlscope_sitemap_blocked_{urlparse(normalized_url).netloc}.csv",
+                        mime="text/csv",
+                        key="sitemap_download"
+                    )
+            
+    else:
+        st.error("❌ Could not fetch robots.txt file. The website might not have one or it's inaccessible.")
+        if fetch.error:
+            st.caption(f"Error: {fetch.error}")
+        elif fetch.status_code:
+            st.caption(f"The server answered HTTP {fetch.status_code}. Under RFC 9309 crawlers must treat the site as fully disallowed until robots.txt is reachable again.")
+
+        st.markdown("---")
+        st.markdown("### 📄 Try Alternative URL Formats")
+        # Variants still pending at the fetch deadline were never settled, so only
+        # claim they all failed when they actually did
+        tried_variants = fetch.tried_variants
+        if len(tried_variants) == len(url_variants(normalized_url)) - 1:
+            st.caption("CrawlScope already tried the www and protocol variants below automatically without success.")
+        elif tried_variants:
+            st.caption(f"CrawlScope tried {', '.join(tried_variants)} without success; the other variants did not answer in time.")
+        else:
+            st.caption("The www and protocol variants below did not answer in time, so they may still work.")
+        st.warning("**Copy any URL below and paste it into the main URL field above, then click 'Analyze Access Status' again:**")
 
-                # Parse the current URL to generate alternatives
-                parsed_url = urlparse(normalized_url)
-                base_domain = f"{parsed_url.scheme}://{parsed_url.netloc}"
+        # The same alternatives the fetch layer raced
+        (_, base_domain), (www_label, www_url), (protocol_label, protocol_url), _ = url_variants(normalized_url)
 
-                # Create columns for different URL options
-                col1, col2 = st.columns(2)
+        # Create columns for different URL options
+        col1, col2 = st.columns(2)
 
-                with col1:
-                    st.markdown("#### 🏠 Main Domain Only")
-                    main_domain_url = base_domain
-                    st.code(main_domain_url, language="text")
-                    st.caption("Copy this URL ☝️ (base domain without any paths)")
+        with col1:
+            st.markdown("#### 🏠 Main Domain Only")
+            main_domain_url = base_domain
+            st.code(main_domain_url, language="text")
+            st.caption("Copy this URL ☝️ (base domain without any paths)")
 
-                    st.markdown("#### 🌐 WWW Version")
-                    current_netloc = parsed_url.netloc
-                    if current_netloc.startswith('www.'):
-                        # Remove www
-                        new_netloc = current_netloc[4:]
-                        www_url = f"{parsed_url.scheme}://{new_netloc}"
-                        www_label = "Without WWW"
-                    else:
-                        # Add www
-                        new_netloc = f"www.{current_netloc}"
-                        www_url = f"{parsed_url.scheme}://{new_netloc}"
-                        www_label = "With WWW"
+            st.markdown("#### 🌐 WWW Version")
+            st.code(www_url, language="text")
+            st.caption(f"Copy this URL ☝️ ({www_label})")
 
-                    st.code(www_url, language="text")
-                    st.caption(f"Copy this URL ☝️ ({www_label})")
+        with col2:
+            st.markdown("#### 🔐 Different Protocol")
+            st.code(protocol_url, language="text")
+            st.caption(f"Copy this URL ☝️ ({protocol_label})")
 
-                with col2:
-                    st.markdown("#### 🔐 Different Protocol")
-                    if parsed_url.scheme == "https":
-                        protocol_url = f"http://{parsed_url.netloc}"
-                        protocol_label = "HTTP version"
-                    else:
-                        protocol_url = f"https://{parsed_url.netloc}"
-                        protocol_label = "HTTPS version"
+            st.markdown("#### ✏️ Manual robots.txt URL")
+            st.info("If you have a specific robots.txt URL:")
+            robots_example = f"{base_domain}/robots.txt"
+            st.code(robots_example, language="text")
+            st.caption(" Copy this URL ☝️ (robots.txt path version)")
 
-                    st.code(protocol_url, language="text")
-                    st.caption(f"Copy this URL ☝️ ({protocol_label})")
+        # Clear instructions
+        st.markdown("---")
+        st.markdown("### 🔍 How to use these URLs:")
 
-                    st.markdown("#### ✏️ Manual robots.txt URL")
-                    st.info("If you have a specific robots.txt URL:")
-                    robots_example = f"{base_domain}/robots.txt"
-                    st.code(robots_example, language="text")
-                    st.caption(" Copy this URL ☝️ (robots.txt path version)")
+        instructions_col1, instructions_col2 = st.columns(2)
 
-                # Clear instructions
-                st.markdown("---")
-                st.markdown("### 🔍 How to use these URLs:")
+        with instructions_col1:
+            st.markdown("**Step 1:** Click on any code box above to copy the URL")
+            st.markdown("**Step 2:** Go back to the main URL field at the top")
+            st.markdown("**Step 3:** Clear the field and paste the new URL")
 
-                instructions_col1, instructions_col2 = st.columns(2)
+        with instructions_col2:
+            st.markdown("**Step 4:** Click '🔍 Analyze Access Status' button")
+            st.markdown("**Step 5:** The analysis will run with the new URL")
+            st.markdown("**Tip:** Try different URLs until robots.txt is found")
 
-                with instructions_col1:
-                    st.markdown("**Step 1:** Click on any code box above to copy the URL")
-                    st.markdown("**Step 2:** Go back to the main URL field at the top")
-                    st.markdown("**Step 3:** Clear the field and paste the new URL")
 
-                with instructions_col2:
-                    st.markdown("**Step 4:** Click '🔍 Analyze Access Status' button")
-                    st.markdown("**Step 5:** The analysis will run with the new URL")
-                    st.markdown("**Tip:** Try different URLs until robots.txt is found")
+        st.markdown("---")
+        st.markdown("**💡 Pro Tips:**")
+        st.markdown("- Some sites block robots.txt access for security reasons")
+        st.markdown("- Try different subdomains (e.g., api.domain.com, blog.domain.com)")  
+        st.markdown("- Check if the site uses a CDN that might serve robots.txt differently")
 
+# Bulk domain audit
+st.markdown("---")
+st.subheader("📦 Bulk Domain Audit")
+st.markdown("Audit many websites at once. robots.txt files are fetched concurrently and results appear as each domain completes.")
 
-                st.markdown("---")
-                st.markdown("**💡 Pro Tips:**")
-                st.markdown("- Some sites block robots.txt access for security reasons")
-                st.markdown("- Try different subdomains (e.g., api.domain.com, blog.domain.com)")  
-                st.markdown("- Check if the site uses a CDN that might serve robots.txt differently")
+bulk_input = st.text_area(
+    "Domains (one per line):",
+    placeholder="example.com\nexample.org",
+    key="bulk_domains_input"
+)
+bulk_file = st.file_uploader("Or upload a domain list (.txt or .csv, one domain per line):", type=["txt", "csv"])
+
+col1, col2 = st.columns(2)
+with col1:
+    bulk_concurrency = st.number_input("Concurrent fetches", min_value=1, max_value=256, value=BULK_MAX_CONCURRENCY)
+with col2:
+    bulk_per_host = st.number_input("Concurrent fetches per host", min_value=1, max_value=16, value=BULK_PER_HOST_CONCURRENCY)
+bulk_probe_variants = st.checkbox("Try www/protocol variants when a fetch fails", value=False)
+
+if st.button("🚀 Run Bulk Audit"):
+    bulk_domains = [line.strip() for line in bulk_input.splitlines() if line.strip()]
+    if bulk_file is not None:
+        bulk_domains.extend(
+            line.split(',')[0].strip()
+            for line in bulk_file.getvalue().decode('utf-8', errors='replace').splitlines()
+            if line.strip()
+        )
+    
+    if bulk_domains:
+        progress = st.progress(0.0)
+        table = st.empty()
+        bulk_rows = []
+        last_render = [0.0]
+        
+        def show_bulk_row(row):
+            bulk_rows.append(row)
+            # Redraw at most a few times per second so large runs stay responsive
+            now = time.monotonic()
+            if now - last_render[0] > 0.5 or len(bulk_rows) == len(bulk_domains):
+                last_render[0] = now
+                progress.progress(len(bulk_rows) / len(bulk_domains), text=f"{len(bulk_rows)}/{len(bulk_domains)} domains audited")
+                table.dataframe(pd.DataFrame(bulk_rows), use_container_width=True)
+        
+        run_bulk_audit(
+            bulk_domains,
+            on_result=show_bulk_row,
+            max_concurrency=int(bulk_concurrency),
+            per_host_concurrency=int(bulk_per_host),
+            probe_variants=bulk_probe_variants
+        )
+        # Keep the rows so the download rerun doesn't throw them away
+        st.session_state['bulk_rows'] = bulk_rows
+        st.session_state['bulk_store_stats'] = get_result_store().stats()
+        progress.empty()
+        table.empty()
     else:
-        st.warning("⚠️ Please enter a website URL")
+        st.warning("⚠️ Please enter at least one domain")
+
+if st.session_state.get('bulk_rows'):
+    bulk_df = pd.DataFrame(st.session_state['bulk_rows'])
+    st.dataframe(bulk_df, use_container_width=True)
+    store_stats = st.session_state['bulk_store_stats']
+    st.caption(
+        f"Result store hit rate: {store_stats['hit_rate']*100:.1f}% "
+        f"({store_stats['memory_hits']} memory + {store_stats['disk_hits']} disk hits, {store_stats['misses']} misses). "
+        "Identical robots.txt files are analyzed once."
+    )
+    st.download_button(
+        label="📥 Download Bulk Audit Results as CSV",
+        data=bulk_df.to_csv(index=False),
+        file_name="crawlscope_bulk_audit.csv",
+        mime="text/csv"
+    )
 
 # ENHANCED Footer with light/dark mode support
 st.markdown("---")
@@ -0,0 +1,93 @@
+"""Throughput of the bulk audit against a local robots.txt server
+
+Serves robots.txt for thousands of distinct hosts (127.x.y.z loopback
+addresses, which Linux routes to a server listening on all interfaces) from
+a child process, so the server doesn't compete with the audit for the GIL.
+Every fourth host gets a file of its own, the rest share a few templates,
+and one in twenty answers 404. The robots cache is off, so every domain is
+really fetched. Reports domains per minute; the target is thousands per
+minute on one box.
+
+    python benchmarks/bench_bulk.py [--domains 5000] [--concurrency 64]
+"""
+import argparse
+import http.server
+import multiprocessing
+import os
+import sys
+import time
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawlscope.bulk import BULK_MAX_CONCURRENCY, run_bulk_audit
+from crawlscope.cache import ResultStore
+
+TEMPLATES = [
+    "User-agent: *\nDisallow: /wp-admin/\nAllow: /wp-admin/admin-ajax.php\n",
+    "User-agent: *\nDisallow: /cart\nDisallow: /checkout/\n\nUser-agent: GPTBot\nDisallow: /\n",
+    "User-agent: *\nDisallow:\n",
+    "User-agent: CCBot\nDisallow: /\n\nUser-agent: *\nDisallow: /search\n",
+]
+
+
+def robots_for(host):
+    """The robots.txt a host serves, or None for a 404"""
+    number = zlib.crc32(host.encode())
+    if number % 20 == 0:
+        return None
+    body = TEMPLATES[number % len(TEMPLATES)]
+    if number % 4 == 0:
+        body += f"Disallow: /private-{host.replace('.', '-')}/\n"
+    return body.encode()
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = robots_for(self.headers.get('Host', '').split(':')[0])
+        self.send_response(200 if body is not None else 404)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', str(len(body or b'')))
+        self.end_headers()
+        self.wfile.write(body or b'')
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port_queue):
+    server = http.server.ThreadingHTTPServer(('', 0), Handler)
+    server.request_queue_size = 1024
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--domains', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=BULK_MAX_CONCURRENCY)
+    args = parser.parse_args()
+
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(port_queue,), daemon=True)
+    server.start()
+    port = port_queue.get()
+    domains = [f"http://127.{1 + i // 62500}.{i // 250 % 250}.{1 + i % 250}:{port}" for i in range(args.domains)]
+
+    start = time.perf_counter()
+    rows = run_bulk_audit(domains, max_concurrency=args.concurrency, cache=False, store=ResultStore())
+    elapsed = time.perf_counter() - start
+    server.terminate()
+
+    statuses = {}
+    for row in rows:
+        statuses[row['Status']] = statuses.get(row['Status'], 0) + 1
+    print(f"{len(rows):,} domains, concurrency {args.concurrency}")
+    print("statuses: " + ', '.join(f"{status} {count}" for status, count in sorted(statuses.items())))
+    print(f"{elapsed:.1f}s, {len(rows) / elapsed * 60:,.0f} domains/minute")
+    errors = len(rows) - sum(count for status, count in statuses.items() if status.startswith(('✅', '🚫')))
+    sys.exit(1 if errors or len(rows) != args.domains else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""Throughput and memory of offline corpus analysis on a standard synthetic WARC
+
+Writes a gzipped WARC of robots.txt responses in the layout of public crawl
+archives (request, response and metadata records, one gzip member each) from
+a fixed seed. Most files are unique variations of common templates, so the
+per-worker result memo only helps as much as it would on real data. Analyzes
+it inline and with a process pool, and reports records per second and the
+peak heap of the inline run. Heap means anonymous memory; the mapped archive
+shows up in plain RSS too, but as page cache the kernel can drop.
+
+    python benchmarks/bench_corpus.py [--records 20000] [--workers N]
+"""
+import argparse
+import gzip
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawlscope.corpus import analyze_corpus
+
+AGENTS = ['*', 'Googlebot', 'Bingbot', 'GPTBot', 'CCBot', 'ClaudeBot', 'Google-Extended', 'PerplexityBot', 'Bytespider']
+PATHS = ['/admin/', '/cart', '/checkout/', '/search', '/wp-admin/', '/private/', '/*?sort=', '/*.pdf$', '/tmp/']
+
+
+def robots_body(rng):
+    """A robots.txt with a few groups, drawn from common real-world patterns"""
+    lines = []
+    for agent in rng.sample(AGENTS, rng.randint(1, 5)):
+        lines.append(f"User-agent: {agent}")
+        if agent in ('GPTBot', 'CCBot', 'ClaudeBot', 'Google-Extended', 'Bytespider') and rng.random() < 0.6:
+            lines.append("Disallow: /")
+        else:
+            for path in rng.sample(PATHS, rng.randint(0, 6)):
+                lines.append(f"Disallow: {path}")
+            if rng.random() < 0.3:
+                lines.append("Allow: /wp-admin/admin-ajax.php")
+        lines.append("")
+    lines.append(f"Sitemap: https://site{rng.randrange(10**6)}.example/sitemap.xml")
+    return '\n'.join(lines).encode()
+
+
+def warc_record(record_type, uri, block):
+    header = (
+        f"WARC/1.0\r\nWARC-Type: {record_type}\r\nWARC-Target-URI: {uri}\r\n"
+        f"Content-Length: {len(block)}\r\n\r\n"
+    ).encode()
+    return gzip.compress(header + block + b'\r\n\r\n')
+
+
+def write_warc(path, count, seed=9309):
+    rng = random.Random(seed)
+    with open(path, 'wb') as warc:
+        for n in range(count):
+            uri = f"https://site{n}.example/robots.txt"
+            warc.write(warc_record('request', uri, b'GET /robots.txt HTTP/1.1\r\nHost: example\r\n\r\n'))
+            status = rng.choices([200, 404, 301, 503], [80, 12, 6, 2])[0]
+            body = robots_body(rng) if status == 200 else b''
+            response = f"HTTP/1.1 {status} X\r\nContent-Type: text/plain\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+            warc.write(warc_record('response', uri, response + body))
+            warc.write(warc_record('metadata', uri, b'fetchTimeMs: 42\r\n'))
+
+
+def anonymous_rss():
+    """Resident anonymous memory in KiB (Linux), or None"""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('RssAnon:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=20000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        warc = os.path.join(directory, 'robots.warc.gz')
+        write_warc(warc, args.records)
+
+        print(f"{args.records} robots.txt fetches, {os.path.getsize(warc) / 2**20:.1f} MiB gzipped WARC")
+        print(f"{'workers':>7} {'seconds':>8} {'records/s':>10}")
+        baseline = anonymous_rss()
+        peak = [baseline or 0]
+        running = True
+
+        def sample():
+            while running:
+                peak[0] = max(peak[0], anonymous_rss() or 0)
+                time.sleep(0.01)
+
+        if baseline is not None:
+            threading.Thread(target=sample, daemon=True).start()
+        for workers in sorted({1, args.workers}):
+            # Small ranges so even a single archive is spread over the pool
+            report = analyze_corpus([warc], workers=workers, range_bytes=2**20)
+            running = False
+            print(f"{workers:>7} {report.seconds:>8.2f} {report.rows_per_second:>10,.0f}")
+        print('statuses:', ', '.join(f"{status} {count}" for status, count in report.statuses.items()))
+        if baseline is not None:
+            print(f"peak heap {peak[0] / 1024:.0f} MiB ({(peak[0] - baseline) / 1024:.0f} MiB above the baseline)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""Peak memory of robots.txt fetches against hostile servers
+
+Serves oversized and compressed bodies from a local HTTP server and reports
+the peak traced memory of fetch_robots_txt for each. Every case should stay
+within a few MiB regardless of how much the server sends.
+
+    python benchmarks/bench_fetch_memory.py [--size-mib 200]
+"""
+import argparse
+import http.server
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Every case must hit the network, not the on-disk robots.txt cache
+os.environ['CRAWLSCOPE_CACHE_PATH'] = ''
+
+from crawlscope.fetch import ROBOTS_MAX_BYTES, create_http_session, fetch_robots_txt
+
+LINE = b'User-agent: *\nDisallow: /private/area\n'
+
+# Peak memory allowed per fetch before the benchmark reports a failure
+PEAK_BUDGET_BYTES = 8 * 2**20
+
+
+def compressed(size, wbits):
+    """A body of `size` bytes of rules, compressed with the given zlib wbits"""
+    compressor = zlib.compressobj(9, zlib.DEFLATED, wbits)
+    block = LINE * (2**20 // len(LINE))
+    chunks = [compressor.compress(block) for _ in range(size // len(block))]
+    chunks.append(compressor.flush())
+    return b''.join(chunks)
+
+
+def serve(cases):
+    """Start a local server; the X-Case request header selects the case"""
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            status, headers, body = cases[self.headers['X-Case']]
+            self.send_response(status)
+            for name, value in headers:
+                self.send_header(name, value)
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            try:
+                if callable(body):
+                    body(self.wfile)
+                else:
+                    self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                # The client stops reading at the size cap
+                pass
+            self.close_connection = True
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    # Connections reset by the client at the size cap are expected
+    server.handle_error = lambda request, client_address: None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size-mib', type=int, default=200, help='decoded size of each hostile body')
+    args = parser.parse_args()
+    size = args.size_mib * 2**20
+
+    def endless(stream):
+        block = LINE * 1000
+        for _ in range(size // len(block)):
+            stream.write(block)
+
+    cases = {
+        'identity': (200, [], endless),
+        'gzip-bomb': (200, [('Content-Encoding', 'gzip')], compressed(size, 16 + zlib.MAX_WBITS)),
+        'deflate-bomb': (200, [('Content-Encoding', 'deflate')], compressed(size, zlib.MAX_WBITS)),
+        'raw-deflate-bomb': (200, [('Content-Encoding', 'deflate')], compressed(size, -zlib.MAX_WBITS)),
+    }
+    server = serve(cases)
+    session = create_http_session(retries=0)
+
+    failures = 0
+    print(f"{'case':<18} {'outcome':<12} {'parsed KiB':>10} {'truncated':>9} {'peak KiB':>9} {'seconds':>8}")
+    for name in cases:
+        session.headers['X-Case'] = name
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = fetch_robots_txt(f"http://127.0.0.1:{server.server_address[1]}", session)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        content = result.content or ''
+        print(f"{name:<18} {result.outcome:<12} {len(content) / 1024:>10.0f} {result.truncated!s:>9} "
+              f"{peak / 1024:>9.0f} {elapsed:>8.2f}")
+        if peak > PEAK_BUDGET_BYTES or len(content) > ROBOTS_MAX_BYTES:
+            failures += 1
+
+    server.shutdown()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
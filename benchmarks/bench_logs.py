@@ -0,0 +1,90 @@
+"""Throughput of the access-log analyzer on a standard synthetic combined log
+
+Writes an nginx combined-format log (a browser-heavy mix of user agents with
+registry crawlers and unknown bots, generated from a fixed seed) and scans it
+against an e-commerce style robots.txt, inline and with a process pool.
+Reports megabytes and lines per second.
+
+    python benchmarks/bench_logs.py [--lines 2000000] [--workers N]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawlscope.logs import analyze_logs
+
+ROBOTS = """User-agent: *
+Disallow: /cart
+Disallow: /checkout/
+Disallow: /search
+Disallow: /*?sort=
+Disallow: /*.pdf$
+
+User-agent: GPTBot
+Disallow: /
+
+User-agent: CCBot
+Disallow: /
+"""
+
+USER_AGENTS = [
+    (60, 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/{v}.0.0.0 Safari/537.36'),
+    (15, 'Mozilla/5.0 (iPhone; CPU iPhone OS 17_{v} like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1'),
+    (8, 'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)'),
+    (4, 'Mozilla/5.0 (compatible; bingbot/2.0; +http://www.bing.com/bingbot.htm)'),
+    (4, 'Mozilla/5.0 AppleWebKit/537.36 (KHTML, like Gecko; compatible; GPTBot/1.{v}; +https://openai.com/gptbot)'),
+    (3, 'CCBot/2.0 (https://commoncrawl.org/faq/)'),
+    (3, 'Mozilla/5.0 (compatible; AhrefsBot/7.0; +http://ahrefs.com/robot/)'),
+    (3, 'python-requests/2.{v}.0'),
+]
+
+
+def write_log(path, count, seed=9309):
+    """Write `count` combined-format lines"""
+    rng = random.Random(seed)
+    weights = [weight for weight, _ in USER_AGENTS]
+    agents = [agent for _, agent in USER_AGENTS]
+    paths = [
+        lambda: f"/products/{rng.randrange(10**6)}",
+        lambda: f"/category/shoes?page={rng.randrange(50)}&sort={rng.choice(['price', 'new'])}",
+        lambda: f"/blog/post-{rng.randrange(10**4)}",
+        lambda: f"/search?q=item{rng.randrange(10**5)}",
+        lambda: f"/cart?add={rng.randrange(10**6)}",
+        lambda: f"/media/manual-{rng.randrange(10**4)}.pdf",
+        lambda: "/robots.txt",
+    ]
+    with open(path, 'w', encoding='utf-8') as log:
+        for i in range(count):
+            agent = rng.choices(agents, weights)[0].format(v=rng.randrange(100, 130))
+            log.write(
+                f'10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)} - - '
+                f'[18/Oct/2026:{i // 3600 % 24:02}:{i // 60 % 60:02}:{i % 60:02} +0000] '
+                f'"GET {rng.choice(paths)()} HTTP/1.1" {rng.choice([200, 200, 200, 304, 404])} '
+                f'{rng.randrange(200, 90000)} "https://shop.example.com/" "{agent}"\n'
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, default=2000000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        log = os.path.join(directory, 'access.log')
+        write_log(log, args.lines)
+
+        print(f"{args.lines} lines, {os.path.getsize(log) / 2**20:.1f} MiB")
+        print(f"{'workers':>7} {'seconds':>8} {'MiB/s':>8} {'lines/s':>12}")
+        for workers in sorted({1, args.workers}):
+            report = analyze_logs([log], ROBOTS, workers=workers)
+            print(f"{workers:>7} {report.seconds:>8.2f} {report.throughput:>8.1f} {report.lines / report.seconds:>12,.0f}")
+        print(f"crawler hits {report.bot_hits}, disallowed {report.violations}")
+
+
+if __name__ == '__main__':
+    main()
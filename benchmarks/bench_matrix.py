@@ -0,0 +1,57 @@
+"""Crawler x path access matrix versus a nested can_fetch loop
+
+Evaluates every registered crawler against a growing list of paths, once with
+check_access_matrix (each distinct rule group decided once per path) and once
+with the equivalent per-crawler can_fetch calls.
+
+    python benchmarks/bench_matrix.py [--paths 50] [--runs 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawlscope.crawlers import get_crawler_index
+from crawlscope.matrix import check_access_matrix
+from crawlscope.robots import RobustRobotsParser
+
+ROBOTS = "\n".join(
+    ["User-agent: *", "Disallow: /private/", "Disallow: /*.pdf$", "Allow: /private/press/"]
+    + [f"User-agent: {bot}\nDisallow: /" for bot in ('GPTBot', 'CCBot', 'ClaudeBot', 'Bytespider')]
+    + ["User-agent: Googlebot", "Disallow: /search", "Allow: /search/about"]
+)
+
+
+def best_ms(func, runs):
+    """Fastest of several runs, in milliseconds"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--paths', type=int, default=50)
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    index = get_crawler_index()
+    robots_parser = RobustRobotsParser(ROBOTS, '')
+    print(f"{len(index)} crawlers")
+    print(f"{'paths':>6} {'matrix ms':>10} {'nested ms':>10} {'speedup':>8}")
+    for count in sorted({1, 10, args.paths}):
+        paths = [f"/section-{i}/page.pdf" if i % 3 == 0 else f"/private/item-{i}" for i in range(count)]
+        matrix = best_ms(lambda: check_access_matrix(ROBOTS, '', paths, parser=robots_parser), args.runs)
+        nested = best_ms(lambda: [
+            [robots_parser.can_fetch(user_agent, path) for path in paths] for user_agent in index.user_agents
+        ], args.runs)
+        print(f"{count:>6} {matrix:>10.2f} {nested:>10.2f} {nested / matrix:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
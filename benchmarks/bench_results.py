@@ -0,0 +1,57 @@
+"""Memory benchmark for crawler access results
+
+Builds results for many distinct robots.txt files and compares the retained
+memory of the columnar AccessResults with the equivalent list of formatted
+row dicts (the old representation, produced here with records()).
+
+    python benchmarks/bench_results.py [--domains 2000]
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawlscope.analysis import check_crawler_access
+from crawlscope.crawlers import CRAWLERS
+
+
+def synthetic_robots(i):
+    """A distinct robots.txt per domain, with crawl delays so no column is empty"""
+    return (
+        f"User-agent: *\nDisallow: /private-{i}\nCrawl-delay: {i % 7 + 1}\n"
+        f"User-agent: GPTBot\nDisallow: /\n"
+        f"User-agent: Bingbot\nDisallow: {'/' if i % 2 else '/tmp'}\n"
+    )
+
+
+def retained_bytes(build, count):
+    """Bytes still allocated after building count results"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [build(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--domains', type=int, default=2000)
+    args = parser.parse_args()
+
+    crawlers = sum(len(group) for group in CRAWLERS.values())
+    columnar = retained_bytes(lambda i: check_crawler_access(synthetic_robots(i), '', CRAWLERS), args.domains)
+    rows = retained_bytes(lambda i: list(check_crawler_access(synthetic_robots(i), '', CRAWLERS).records()), args.domains)
+
+    print(f"{args.domains} domains x {crawlers} crawlers")
+    print(f"{'representation':<16} {'total MiB':>10} {'bytes/domain':>13}")
+    for label, size in (('row dicts', rows), ('AccessResults', columnar)):
+        print(f"{label:<16} {size / 2**20:>10.1f} {size / args.domains:>13.0f}")
+    print(f"reduction: {rows / columnar:.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Throughput and memory of the sitemap audit on a large sitemap index
+
+Serves a sitemap index with many 50,000-URL shards from a local HTTP server,
+every other shard gzipped (.xml.gz), generating each body on the fly. The
+audit should process every URL while peak memory stays flat in the number
+of shards.
+
+    python benchmarks/bench_sitemaps.py [--shards 40]
+"""
+import argparse
+import http.server
+import os
+import resource
+import sys
+import threading
+import time
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawlscope.fetch import create_http_session
+from crawlscope.sitemaps import SITEMAP_MAX_URLS, audit_sitemaps
+
+NAMESPACE = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+ROBOTS = """User-agent: *
+Disallow: /cart
+Disallow: /*?sort=
+
+User-agent: Googlebot
+Disallow: /private/
+"""
+
+
+def shard_pieces(base, shard):
+    """A urlset of SITEMAP_MAX_URLS entries, a few of them blocked, in ~64 KiB pieces"""
+    yield f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset {NAMESPACE}>\n'.encode()
+    entries = []
+    for i in range(SITEMAP_MAX_URLS):
+        path = '/cart/item' if i % 1000 == 0 else f"/products/{shard}/{i}"
+        entries.append(f"<url><loc>{base}{path}</loc><lastmod>2024-01-01</lastmod></url>\n")
+        if len(entries) == 1000:
+            yield ''.join(entries).encode()
+            entries = []
+    yield (''.join(entries) + '</urlset>\n').encode()
+
+
+def serve(shards):
+    """Start a local server for /index.xml and its shards"""
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            base = f"http://127.0.0.1:{self.server.server_address[1]}"
+            self.send_response(200)
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            if self.path == '/index.xml':
+                locs = ''.join(
+                    f"<sitemap><loc>{base}/shard-{i}.xml{'.gz' if i % 2 else ''}</loc></sitemap>" for i in range(shards)
+                )
+                self.wfile.write(f'<sitemapindex {NAMESPACE}>{locs}</sitemapindex>'.encode())
+            else:
+                shard = int(self.path.split('-')[1].split('.')[0])
+                compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if self.path.endswith('.gz') else None
+                for piece in shard_pieces(base, shard):
+                    self.wfile.write(compressor.compress(piece) if compressor else piece)
+                if compressor:
+                    self.wfile.write(compressor.flush())
+            self.close_connection = True
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--shards', type=int, default=40)
+    args = parser.parse_args()
+
+    server = serve(args.shards)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    audit = audit_sitemaps(f"{base}/robots.txt", ROBOTS, [f"{base}/index.xml"], session=create_http_session(retries=0))
+    elapsed = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    server.shutdown()
+
+    errors = [row for row in audit.sitemaps if row['Error']]
+    print(f"{len(audit.sitemaps)} sitemaps, {audit.urls:,} URLs, {audit.blocked_urls:,} blocked, {len(errors)} errors")
+    print(f"{elapsed:.1f}s, {audit.urls / elapsed:,.0f} URLs/s")
+    # ru_maxrss is in KiB on Linux
+    print(f"peak RSS {rss_after / 1024:.0f} MiB ({(rss_after - rss_before) / 1024:.0f} MiB above the baseline)")
+    sys.exit(1 if errors or audit.urls != args.shards * SITEMAP_MAX_URLS else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Cold-start budget check for the headless analysis path
+
+Imports each entry point in a fresh interpreter under ``-X importtime``, takes
+the best cumulative import time over several runs and checks it against a
+budget. Offline entry points must also never load the HTTP stack, asyncio or
+the UI libraries; only an actual fetch or bulk run may pull those in.
+
+    python benchmarks/bench_startup.py [--runs 7] [--scale 1.0]
+
+Exits non-zero when a budget is exceeded or a forbidden module is loaded.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budgets in milliseconds for the module's own cumulative import time
+# (interpreter startup and site-packages hooks are not counted)
+IMPORT_BUDGETS_MS = {
+    'crawlscope': 2,
+    'crawlscope.robots': 5,
+    'crawlscope.analysis': 40,
+    'crawlscope.cli': 50,
+}
+
+# Heavy modules the offline path has no business loading
+FORBIDDEN_MODULES = ['requests', 'urllib3', 'asyncio', 'pandas', 'streamlit']
+
+# What each entry point does beyond importing, to catch loads triggered at call time
+OFFLINE_SNIPPETS = {
+    'crawlscope': "import crawlscope; crawlscope.RobustRobotsParser",
+    'crawlscope.robots': (
+        "from crawlscope.robots import RobustRobotsParser; "
+        "RobustRobotsParser('User-agent: *\\nDisallow: /private', '').can_fetch('*', '/private')"
+    ),
+    'crawlscope.analysis': (
+        "from crawlscope.analysis import check_crawler_access; "
+        "from crawlscope.crawlers import CRAWLERS; "
+        "check_crawler_access('User-agent: *\\nDisallow: /', '', CRAWLERS)"
+    ),
+    'crawlscope.cli': "from crawlscope.cli import build_parser; build_parser().parse_args(['analyze', 'example.com'])",
+}
+
+
+def import_time_us(module, env):
+    """Cumulative import time of a module in a fresh interpreter, in microseconds"""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        capture_output=True, text=True, env=env, cwd=REPO_ROOT, check=True
+    )
+    for line in completed.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1])
+    raise RuntimeError(f"no importtime entry for {module}")
+
+
+def loaded_forbidden(snippet, env):
+    """Run a snippet in a fresh interpreter and report forbidden modules it loaded"""
+    check = (
+        f"{snippet}\n"
+        "import sys\n"
+        f"print(' '.join(m for m in {FORBIDDEN_MODULES!r} if m in sys.modules))"
+    )
+    completed = subprocess.run(
+        [sys.executable, '-c', check],
+        capture_output=True, text=True, env=env, cwd=REPO_ROOT, check=True
+    )
+    return completed.stdout.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=7)
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='multiply every budget, e.g. on slow CI machines')
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    failures = []
+    print(f"{'entry point':<22} {'best ms':>9} {'budget ms':>10}  forbidden")
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        best = min(import_time_us(module, env) for _ in range(args.runs)) / 1000
+        budget *= args.scale
+        forbidden = loaded_forbidden(OFFLINE_SNIPPETS[module], env)
+        print(f"{module:<22} {best:>9.1f} {budget:>10.1f}  {', '.join(forbidden) or '-'}")
+        if best > budget:
+            failures.append(f"{module}: {best:.1f} ms exceeds the {budget:.1f} ms budget")
+        if forbidden:
+            failures.append(f"{module}: loaded {', '.join(forbidden)}")
+
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
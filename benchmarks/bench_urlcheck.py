@@ -0,0 +1,89 @@
+"""Throughput of the URL-list checker on a standard synthetic crawl export
+
+Writes a gzipped CSV of site URLs (product, category, blog, search, cart and
+asset pages with tracking parameters, generated from a fixed seed) and checks
+it against an e-commerce style robots.txt for the default user agents, inline
+and with a process pool. Reports URLs per second.
+
+    python benchmarks/bench_urlcheck.py [--urls 1000000] [--workers N]
+"""
+import argparse
+import csv
+import gzip
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawlscope.urlcheck import check_urls, iter_urls
+
+ROBOTS = """User-agent: *
+Disallow: /cart
+Disallow: /checkout/
+Disallow: /account/
+Disallow: /search
+Disallow: /*?sort=
+Disallow: /*&sort=
+Disallow: /*?sessionid=
+Disallow: /*.pdf$
+Disallow: /wp-admin/
+Allow: /wp-admin/admin-ajax.php
+Allow: /search/help
+
+User-agent: GPTBot
+Disallow: /
+
+User-agent: CCBot
+Disallow: /
+
+User-agent: ClaudeBot
+Disallow: /blog/
+Allow: /blog/press/
+
+Sitemap: https://shop.example.com/sitemap.xml
+"""
+
+
+def write_corpus(path, count, seed=9309):
+    """Write `count` URLs as a gzipped crawl export with an Address column"""
+    rng = random.Random(seed)
+    templates = [
+        lambda: f"/products/{rng.randrange(10**6)}",
+        lambda: f"/category/{rng.choice(['shoes', 'bags', 'hats', 'coats'])}?page={rng.randrange(50)}",
+        lambda: f"/category/{rng.choice(['shoes', 'bags'])}?color=red&sort={rng.choice(['price', 'new'])}",
+        lambda: f"/blog/{rng.choice(['news', 'press', 'guides'])}/post-{rng.randrange(10**4)}",
+        lambda: f"/search?q=item{rng.randrange(10**5)}",
+        lambda: f"/cart?add={rng.randrange(10**6)}",
+        lambda: f"/media/manual-{rng.randrange(10**4)}.pdf",
+        lambda: f"/products/{rng.randrange(10**6)}?utm_source=mail&sessionid={rng.randrange(10**9)}",
+    ]
+    with gzip.open(path, 'wt', encoding='utf-8', newline='') as corpus:
+        writer = csv.writer(corpus)
+        writer.writerow(['Address', 'Status Code'])
+        for _ in range(count):
+            writer.writerow([f"https://shop.example.com{rng.choice(templates)()}", 200])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--urls', type=int, default=1000000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = os.path.join(directory, 'crawl.csv.gz')
+        write_corpus(corpus, args.urls)
+
+        print(f"{args.urls} URLs, {os.path.getsize(corpus) / 2**20:.1f} MiB gzipped")
+        print(f"{'workers':>7} {'seconds':>8} {'URLs/s':>10}")
+        for workers in sorted({1, args.workers}):
+            with open(os.devnull, 'w', newline='') as output:
+                summary = check_urls(iter_urls(corpus), ROBOTS, output, workers=workers)
+            print(f"{workers:>7} {summary['Seconds']:>8.2f} {summary['URLs/s']:>10,}")
+        print('blocked:', ', '.join(f"{agent} {count}" for agent, count in summary['Blocked'].items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Stress benchmark for the robots.txt wildcard matcher
+
+Times adversarial patterns such as '/*a*a*a*a*a*a*a*b' against paths of
+increasing length. The matcher should stay flat (roughly linear in the path
+length) where a backtracking regex translation blows up polynomially.
+
+    python benchmarks/bench_wildcard.py [--compare-re]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawlscope.matching import compile_pattern
+
+ADVERSARIAL_PATTERNS = [
+    '/*a*a*a*a*a*a*a*b',
+    '/*a*a*a*a*a*a*a*b$',
+    '/*' + '*'.join(['aa'] * 16) + '*b',
+    '/' + '*' * 64 + 'b$',
+]
+
+PATH_LENGTHS = [16, 64, 256, 1024, 4096]
+
+# Backtracking regex cost explodes quickly, so only compare on short paths
+REGEX_PATH_LENGTHS = [8, 12, 16, 20]
+
+
+def regex_matcher(pattern):
+    """The old regex translation, kept here as the baseline"""
+    regex_pattern = pattern.replace('*', '.*')
+    return re.compile(regex_pattern).match
+
+
+def time_matcher(matcher, path, repeat):
+    """Return the best per-call latency in microseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        matcher(path)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--compare-re', action='store_true',
+                        help='also time the backtracking regex translation on short paths')
+    args = parser.parse_args()
+    
+    print(f"{'pattern':<40} {'path len':>9} {'matcher us':>12}")
+    for pattern in ADVERSARIAL_PATTERNS:
+        matcher = compile_pattern(pattern)
+        label = pattern if len(pattern) <= 38 else pattern[:35] + '...'
+        for length in PATH_LENGTHS:
+            # A long run of 'a' with no final 'b' forces every placement to be tried
+            path = '/' + 'a' * length
+            print(f"{label:<40} {length:>9} {time_matcher(matcher, path, args.repeat):>12.1f}")
+    
+    if args.compare_re:
+        print()
+        print(f"{'pattern':<40} {'path len':>9} {'matcher us':>12} {'regex us':>12}")
+        pattern = ADVERSARIAL_PATTERNS[0]
+        matcher = compile_pattern(pattern)
+        baseline = regex_matcher(pattern)
+        for length in REGEX_PATH_LENGTHS:
+            path = '/' + 'a' * length
+            print(f"{pattern:<40} {length:>9} "
+                  f"{time_matcher(matcher, path, args.repeat):>12.1f} "
+                  f"{time_matcher(baseline, path, 1):>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Headless building blocks for CrawlScope
+
+Everything the Streamlit app does apart from rendering lives here, so it can be
+imported from batch jobs, tests and the ``python -m crawlscope`` CLI without
+starting Streamlit.
+
+Submodules are imported on first attribute access, so ``import crawlscope``
+stays cheap and e.g. parsing a local robots.txt never loads the HTTP stack.
+"""
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'AccessMatrix': 'matrix',
+    'AccessResults': 'results',
+    'Analysis': 'analysis',
+    'CRAWLERS': 'crawlers',
+    'CorpusReport': 'corpus',
+    'CRAWLERS_VERSION': 'crawlers',
+    'CrawlerIndex': 'crawlers',
+    'FETCH_SUCCESS': 'fetch',
+    'FETCH_UNAVAILABLE': 'fetch',
+    'FETCH_UNREACHABLE': 'fetch',
+    'FetchResult': 'fetch',
+    'LogReport': 'logs',
+    'ResultStore': 'cache',
+    'RobotsDocument': 'robots',
+    'RobotsCache': 'fetch',
+    'RobustRobotsParser': 'robots',
+    'SingleFlightCache': 'cache',
+    'SitemapAudit': 'sitemaps',
+    'UrlChecker': 'urlcheck',
+    'analyze_corpus': 'corpus',
+    'analyze_logs': 'logs',
+    'analyze_url': 'analysis',
+    'audit_domain': 'bulk',
+    'audit_sitemaps': 'sitemaps',
+    'bulk_audit': 'bulk',
+    'check_access_matrix': 'matrix',
+    'check_crawler_access': 'analysis',
+    'check_urls': 'urlcheck',
+    'fetch_robots_txt': 'fetch',
+    'fetch_robots_txt_with_fallbacks': 'fetch',
+    'generate_insights': 'analysis',
+    'get_crawler_index': 'crawlers',
+    'iter_bulk_audit': 'bulk',
+    'get_result_store': 'cache',
+    'get_robots_txt_content': 'fetch',
+    'normalize_robots_content': 'robots',
+    'normalize_url': 'fetch',
+    'robots_content_key': 'analysis',
+    'run_bulk_audit': 'bulk',
+    'sitemap_insights': 'sitemaps',
+    'stored_crawler_access': 'analysis',
+    'summarize_results': 'analysis',
+    'url_variants': 'fetch'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,217 @@
+"""Crawler access evaluation, result memoization and insights"""
+import hashlib
+from dataclasses import dataclass
+from urllib.parse import urlparse
+
+from .cache import SingleFlightCache, get_result_store
+from .crawlers import as_crawler_index, get_crawler_index
+from .fetch import FetchResult, fetch_robots_txt_with_fallbacks
+from .results import AccessResults
+from .robots import RobotsDocument, RobustRobotsParser, normalize_robots_content
+
+
+def check_crawler_access(robots_content, base_url, crawlers_dict, parser=None):
+    """Check access status for all crawlers using robust parser"""
+    index = as_crawler_index(crawlers_dict)
+    results = AccessResults(index)
+    if parser is None:
+        parser = RobustRobotsParser(robots_content, base_url)
+    
+    # Most crawlers share a rule group (usually '*'), so evaluate each
+    # distinct group once and hand the result to every crawler in it.
+    # Registry tokens are normalized once per process, not per analysis
+    group_keys, columns = parser.group_columns(index.tokens)
+    group_results = []
+    errors = {}
+    for column, group_key in enumerate(group_keys):
+        try:
+            group_results.append(parser.evaluate_group(group_key, "/"))
+        except Exception as e:
+            group_results.append((False, None))
+            errors[column] = str(e)
+    
+    # Results start out blocked with no delay, so only the rest need setting
+    set_access = results.set
+    for i, column in enumerate(columns):
+        can_access, crawl_delay = group_results[column]
+        if can_access or crawl_delay is not None:
+            set_access(i, can_access, crawl_delay)
+    if errors:
+        for i, column in enumerate(columns):
+            if column in errors:
+                results.set_error(i, errors[column])
+    return results
+
+
+def robots_content_key(robots_content, registry_version=None):
+    """Content address for the access results of a robots.txt file"""
+    if registry_version is None:
+        registry_version = get_crawler_index().version
+    digest = hashlib.sha256(normalize_robots_content(robots_content).encode('utf-8'))
+    digest.update(registry_version.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def stored_crawler_access(robots_content, base_url, store=None, document=None):
+    """check_crawler_access over the crawler registry, memoized by robots.txt content"""
+    if store is None:
+        store = get_result_store()
+    index = get_crawler_index()
+    
+    def compute():
+        parser = RobustRobotsParser(robots_content, base_url, document=document)
+        return check_crawler_access(robots_content, base_url, index, parser)
+    
+    return store.get_or_compute(robots_content_key(robots_content, index.version), compute)
+
+
+def summarize_results(results):
+    """Total/allowed/blocked counts and block rate for AccessResults"""
+    allowed = results.allowed
+    return {
+        'Total': len(results),
+        'Allowed': allowed,
+        'Blocked': len(results) - allowed,
+        'Block Rate %': round((len(results) - allowed) / len(results) * 100, 1) if results else 0.0
+    }
+
+
+def generate_insights(results, document, category_stats=None):
+    """Generate accurate insights based on the analysis results"""
+    insights = []
+    
+    if not len(results):
+        return ["No data available for analysis"]
+    if isinstance(document, str):
+        document = RobotsDocument(document)
+    if category_stats is None:
+        category_stats = results.category_stats()
+    
+    total_crawlers = len(results)
+    allowed_crawlers = results.allowed
+    blocked_crawlers = total_crawlers - allowed_crawlers
+    block_rate = (blocked_crawlers / total_crawlers) * 100
+    
+    # Overall access insights
+    if block_rate > 70:
+        insights.append(f"🔒 **High Security Mode**: {block_rate:.1f}% of crawlers are blocked - excellent for privacy protection")
+    elif block_rate > 40:
+        insights.append(f"⚖️ **Balanced Access**: {block_rate:.1f}% of crawlers are blocked - moderate protection")
+    elif block_rate > 10:
+        insights.append(f"🌍 **Open Policy**: {block_rate:.1f}% of crawlers are blocked - prioritizing visibility")
+    else:
+        insights.append(f"🚪 **Fully Open**: Only {block_rate:.1f}% of crawlers are blocked - maximum accessibility")
+    
+    # AI Crawlers analysis
+    ai_stats = category_stats.get('AI Crawlers')
+    if ai_stats:
+        ai_block_rate = ai_stats['Block Rate %']
+        ai_total = ai_stats['Total']
+        ai_blocked = ai_stats['Blocked']
+        
+        if ai_block_rate > 80:
+            insights.append(f"🤖 **AI Privacy Strong**: {ai_blocked}/{ai_total} AI crawlers blocked ({ai_block_rate:.1f}%) - protecting content from training")
+        elif ai_block_rate > 50:
+            insights.append(f"🤖 **AI Privacy Moderate**: {ai_blocked}/{ai_total} AI crawlers blocked ({ai_block_rate:.1f}%) - balanced AI access")
+        else:
+            insights.append(f"🤖 **AI Training Allowed**: Only {ai_blocked}/{ai_total} AI crawlers blocked ({ai_block_rate:.1f}%) - content available for training")
+    
+    # Search Engines analysis
+    search_stats = category_stats.get('Search Engines')
+    if search_stats:
+        search_block_rate = search_stats['Block Rate %']
+        
+        if search_block_rate > 30:
+            insights.append(f"⚠️ **SEO Warning**: {search_block_rate:.1f}% of search engines blocked - may impact search visibility")
+        elif search_block_rate > 10:
+            insights.append(f"🔍 **SEO Caution**: {search_block_rate:.1f}% of search engines blocked - monitor search impact")
+        else:
+            insights.append(f"✅ **SEO Friendly**: Only {search_block_rate:.1f}% of search engines blocked - excellent for visibility")
+    
+    # SEO & Analytics analysis
+    seo_stats = category_stats.get('SEO & Analytics')
+    if seo_stats:
+        seo_block_rate = seo_stats['Block Rate %']
+        
+        if seo_block_rate > 60:
+            insights.append(f"📊 **Limited Analytics**: {seo_block_rate:.1f}% of SEO tools blocked - reduced insights available")
+        elif seo_block_rate > 30:
+            insights.append(f"📈 **Moderate Analytics**: {seo_block_rate:.1f}% of SEO tools blocked - some insights limited")
+        else:
+            insights.append(f"📊 **Full Analytics**: Only {seo_block_rate:.1f}% of SEO tools blocked - comprehensive insights available")
+    
+    # Social Media analysis
+    social_stats = category_stats.get('Social Media')
+    if social_stats:
+        social_block_rate = social_stats['Block Rate %']
+        
+        if social_block_rate > 50:
+            insights.append(f"📱 **Social Privacy**: {social_block_rate:.1f}% of social platforms blocked - limited social sharing")
+        else:
+            insights.append(f"📱 **Social Friendly**: Only {social_block_rate:.1f}% of social platforms blocked - good for sharing")
+    
+    # Robots.txt quality insights, read off the already tokenized document
+    if document.size:
+        # Check for sitemap - only show if actually missing
+        if not document.counts.get('sitemap'):
+            insights.append("💡 **Missing Sitemap**: Add 'Sitemap: https://yoursite.com/sitemap.xml' to help crawlers find your content")
+        
+        # Check for meaningful wildcard usage - only show if actually using wildcards effectively
+        if document.has_wildcards:
+            insights.append("🎯 **Using Wildcards**: Good use of universal rules for efficient crawler management")
+        
+        # Check for very basic robots.txt
+        if document.directive_count() < 3:
+            insights.append("⚠️ **Simple robots.txt**: Consider adding more specific rules for better crawler control")
+    else:
+        insights.append("💡 **No robots.txt**: Creating a robots.txt file gives you control over crawler access")
+    
+    return insights
+
+
+# Analyses are shared process-wide (e.g. by every Streamlit session) and
+# keyed by robots.txt URL
+ANALYSIS_CACHE_TTL = 10 * 60
+ANALYSIS_CACHE_ENTRIES = 256
+
+_analysis_cache = SingleFlightCache(ANALYSIS_CACHE_ENTRIES, ANALYSIS_CACHE_TTL)
+
+
+def get_analysis_cache():
+    """Analysis cache shared by every caller in this process"""
+    return _analysis_cache
+
+
+@dataclass
+class Analysis:
+    """Everything shown for one site, derived from a single tokenization of its robots.txt"""
+    fetch: FetchResult
+    results: AccessResults
+    document: RobotsDocument
+    category_stats: dict
+    insights: list
+
+
+def analyze_url(normalized_url, force=False):
+    """Fetch and evaluate a site's robots.txt, sharing in-flight work across sessions
+    
+    With force, robots.txt is re-downloaded and re-evaluated instead of being
+    served from the analysis cache or the robots cache.
+    """
+    parsed_url = urlparse(normalized_url)
+    robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
+    
+    def compute():
+        # Falls back to www/protocol variants if the URL is unreachable
+        fetch = fetch_robots_txt_with_fallbacks(normalized_url, force=force)
+        robots_content = fetch.effective_content
+        # Tokenized once; the parser (on a result store miss) and the insights share it
+        document = RobotsDocument(robots_content)
+        # Byte-identical files seen before skip parsing and evaluation entirely
+        results = stored_crawler_access(robots_content, normalized_url, document=document)
+        category_stats = results.category_stats()
+        insights = generate_insights(results, document, category_stats)
+        return Analysis(fetch, results, document, category_stats, insights)
+    
+    # A registry change (custom crawler files) must not serve results for the old one
+    return get_analysis_cache().get_or_compute((robots_url, get_crawler_index().version), compute, refresh=force)
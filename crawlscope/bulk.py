@@ -0,0 +1,160 @@
+"""Concurrent robots.txt audits for many domains"""
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from .analysis import stored_crawler_access, summarize_results
+from .cache import get_result_store
+from .fetch import (
+    FETCH_SUCCESS,
+    FETCH_UNAVAILABLE,
+    fetch_robots_txt,
+    fetch_robots_txt_with_fallbacks,
+    get_http_session,
+    get_robots_cache,
+    normalize_url
+)
+
+# Bulk audit limits: total in-flight fetches and in-flight fetches per host
+BULK_MAX_CONCURRENCY = 64
+BULK_PER_HOST_CONCURRENCY = 2
+
+
+def audit_domain(domain, session=None, cache=None, probe_variants=False, store=None, include_results=False):
+    """Fetch and analyze one domain's robots.txt, returning a summary row"""
+    normalized_url = normalize_url(domain.strip())
+    row = {
+        'Domain': urlparse(normalized_url).netloc,
+        'robots.txt URL': None,
+        'Status': None,
+        'Total': 0,
+        'Allowed': 0,
+        'Blocked': 0,
+        'Block Rate %': None,
+        'Outcome': None,
+        'HTTP Status': None,
+        'Variant': None,
+        'Error': None
+    }
+    
+    if probe_variants:
+        fetch = fetch_robots_txt_with_fallbacks(normalized_url, session=session, cache=cache)
+    else:
+        fetch = fetch_robots_txt(normalized_url, session, cache)
+    row['robots.txt URL'] = fetch.robots_url
+    row['Variant'] = fetch.variant
+    row['Outcome'] = fetch.outcome
+    row['HTTP Status'] = fetch.status_code
+    row['Error'] = fetch.error
+    if fetch.outcome == FETCH_SUCCESS:
+        row['Status'] = '✅ Analyzed'
+    elif fetch.outcome == FETCH_UNAVAILABLE:
+        row['Status'] = '🚫 No robots.txt (all allowed)'
+    else:
+        row['Status'] = '⚠️ Unreachable (all disallowed)'
+    
+    # Missing and unreachable files are evaluated with their RFC 9309 fallbacks
+    results = stored_crawler_access(fetch.effective_content, normalized_url, store)
+    row.update(summarize_results(results))
+    if include_results:
+        row['Results'] = results
+    return row
+
+
+async def bulk_audit(domains, max_concurrency=BULK_MAX_CONCURRENCY, per_host_concurrency=BULK_PER_HOST_CONCURRENCY, probe_variants=False, include_results=False, cache=None, store=None):
+    """Audit many domains concurrently, yielding summary rows as they complete
+    
+    ``cache`` and ``store`` default to the shared robots cache and result
+    store; cache=False fetches every robots.txt afresh.
+    """
+    import asyncio
+    
+    loop = asyncio.get_running_loop()
+    # Resolve the pooled session and caches up front so worker threads all share them
+    session = get_http_session()
+    if cache is None:
+        cache = get_robots_cache()
+    if store is None:
+        store = get_result_store()
+    executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="crawlscope-bulk")
+    # Results are handed over through a bounded queue so slow consumers apply backpressure
+    completed = asyncio.Queue(maxsize=max_concurrency)
+    # Host -> [semaphore, tasks holding or waiting for it]; dropped once unused,
+    # so a run over millions of hosts doesn't keep one per host
+    host_limits = {}
+    pending = iter(domains)
+    
+    async def worker():
+        # Each worker is one global concurrency slot; they share the domain iterator
+        for domain in pending:
+            domain = domain.strip()
+            if not domain:
+                continue
+            try:
+                host = urlparse(normalize_url(domain)).netloc.lower()
+            except ValueError as e:
+                await completed.put({'Domain': domain, 'Status': '⚠️ Error', 'Error': str(e)})
+                continue
+            host_limit = host_limits.get(host)
+            if host_limit is None:
+                host_limit = host_limits[host] = [asyncio.Semaphore(per_host_concurrency), 0]
+            host_limit[1] += 1
+            try:
+                async with host_limit[0]:
+                    try:
+                        row = await loop.run_in_executor(
+                            executor, audit_domain, domain, session, cache, probe_variants, store, include_results
+                        )
+                    except Exception as e:
+                        row = {'Domain': host, 'Status': '⚠️ Error', 'Error': str(e)}
+            finally:
+                host_limit[1] -= 1
+                if not host_limit[1]:
+                    del host_limits[host]
+            await completed.put(row)
+    
+    async def finish():
+        await asyncio.gather(*workers)
+        await completed.put(None)
+    
+    workers = [asyncio.create_task(worker()) for _ in range(max_concurrency)]
+    closer = asyncio.create_task(finish())
+    try:
+        while True:
+            row = await completed.get()
+            if row is None:
+                break
+            yield row
+    finally:
+        for task in workers:
+            task.cancel()
+        closer.cancel()
+        await asyncio.gather(*workers, closer, return_exceptions=True)
+        executor.shutdown(wait=False)
+
+
+def iter_bulk_audit(domains, **options):
+    """Drive bulk_audit from synchronous code, yielding rows as they complete"""
+    # asyncio is imported here rather than at module level to keep CLI startup fast
+    import asyncio
+    
+    loop = asyncio.new_event_loop()
+    rows = bulk_audit(domains, **options)
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(rows.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(rows.aclose())
+        loop.close()
+
+
+def run_bulk_audit(domains, on_result=None, **options):
+    """Run bulk_audit from synchronous code, calling on_result as rows arrive"""
+    rows = []
+    for row in iter_bulk_audit(domains, **options):
+        rows.append(row)
+        if on_result:
+            on_result(row)
+    return rows
@@ -0,0 +1,189 @@
+"""Process-wide caches shared by interactive and bulk analyses"""
+import atexit
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from .results import AccessResults
+
+
+class SingleFlightCache:
+    """Thread-safe LRU where concurrent requests for a key share one computation"""
+    
+    def __init__(self, max_entries=256, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._in_flight = {}
+    
+    def get_or_compute(self, key, compute, refresh=False):
+        """Return the cached value for key, computing it at most once at a time
+        
+        With refresh, a cached value is ignored and replaced by a new computation.
+        """
+        with self._lock:
+            entry = None if refresh else self._entries.get(key)
+            if entry is not None:
+                created, value = entry
+                if self.ttl is None or time.monotonic() - created < self.ttl:
+                    self._entries.move_to_end(key)
+                    return value
+                del self._entries[key]
+            
+            # Later callers wait on the first caller's computation
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+        
+        if not leader:
+            return future.result()
+        
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+        
+        with self._lock:
+            del self._in_flight[key]
+            self._entries[key] = (time.monotonic(), value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        future.set_result(value)
+        return value
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Content-addressed result store (set CRAWLSCOPE_RESULT_STORE_PATH to an empty string for memory only)
+RESULT_STORE_PATH = os.environ.get(
+    'CRAWLSCOPE_RESULT_STORE_PATH',
+    os.path.join(os.path.expanduser('~'), '.cache', 'crawlscope', 'results.sqlite3')
+)
+RESULT_STORE_ENTRIES = 1024
+RESULT_STORE_DISK_ENTRIES = 100000
+
+
+class ResultStore:
+    """LRU of crawler access results keyed by content hash, with an optional disk tier"""
+    
+    def __init__(self, max_entries=RESULT_STORE_ENTRIES, path=None, max_disk_entries=RESULT_STORE_DISK_ENTRIES):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._conn = None
+        
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS access_results ('
+                'key TEXT PRIMARY KEY, results BLOB NOT NULL, last_used REAL NOT NULL)'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS access_results_last_used ON access_results (last_used)')
+    
+    def get(self, key):
+        """Return stored results for a content key, or None"""
+        with self._lock:
+            results = self._entries.get(key)
+            if results is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return results
+            
+            if self._conn is not None:
+                row = self._conn.execute('SELECT results FROM access_results WHERE key = ?', (key,)).fetchone()
+                if row is not None:
+                    self._conn.execute('UPDATE access_results SET last_used = ? WHERE key = ?', (time.time(), key))
+                    results = AccessResults.from_bytes(zlib.decompress(row[0]))
+                    self._remember(key, results)
+                    self.disk_hits += 1
+                    return results
+            
+            self.misses += 1
+            return None
+    
+    def put(self, key, results):
+        """Store results in memory and, when enabled, on disk"""
+        with self._lock:
+            self._remember(key, results)
+            if self._conn is not None:
+                blob = zlib.compress(results.to_bytes())
+                self._conn.execute('INSERT OR REPLACE INTO access_results VALUES (?, ?, ?)', (key, blob, time.time()))
+                self._evict_disk()
+    
+    def get_or_compute(self, key, compute):
+        """Return stored results for key, computing and storing them on a miss"""
+        results = self.get(key)
+        if results is None:
+            results = compute()
+            self.put(key, results)
+        return results
+    
+    def _remember(self, key, results):
+        self._entries[key] = results
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def _evict_disk(self):
+        """Keep the disk tier under max_disk_entries, dropping least recently used rows"""
+        count = self._conn.execute('SELECT COUNT(*) FROM access_results').fetchone()[0]
+        if count > self.max_disk_entries:
+            self._conn.execute(
+                'DELETE FROM access_results WHERE key IN (SELECT key FROM access_results ORDER BY last_used LIMIT ?)',
+                (count - self.max_disk_entries,)
+            )
+    
+    def stats(self):
+        """Hit and miss counters, plus the overall hit rate"""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'lookups': lookups,
+                'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+            }
+    
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_result_store = None
+_result_store_lock = threading.Lock()
+
+
+def get_result_store():
+    """Shared result store; falls back to memory only if the disk tier can't be opened"""
+    global _result_store
+    with _result_store_lock:
+        if _result_store is None:
+            try:
+                _result_store = ResultStore(path=RESULT_STORE_PATH or None)
+            except (sqlite3.Error, OSError):
+                _result_store = ResultStore()
+            atexit.register(_result_store.close)
+        return _result_store
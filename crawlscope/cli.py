@@ -0,0 +1,420 @@
+"""Command line interface: ``python -m crawlscope``"""
+import argparse
+import csv
+import gzip
+import json
+import os
+import sys
+
+from .analysis import stored_crawler_access, summarize_results
+from .bulk import BULK_MAX_CONCURRENCY, BULK_PER_HOST_CONCURRENCY, iter_bulk_audit
+from .corpus import CORPUS_FIELDS, analyze_corpus
+from .crawlers import get_crawler_index
+from .fetch import fetch_robots_txt, normalize_url
+from .logs import analyze_logs
+from .matrix import DEFAULT_MATRIX_PATHS, check_access_matrix, normalize_paths
+from .robots import RobotsDocument
+from .sitemaps import DEFAULT_SITEMAP_USER_AGENTS, SITEMAP_MAX_FILES, SITEMAP_MAX_WORKERS, audit_sitemaps, sitemap_insights
+from .urlcheck import DEFAULT_URLCHECK_USER_AGENTS, URLCHECK_BATCH_SIZE, check_urls, iter_urls
+
+SUMMARY_FIELDS = [
+    'Source', 'Domain', 'robots.txt URL', 'Status', 'Total', 'Allowed', 'Blocked',
+    'Block Rate %', 'Outcome', 'HTTP Status', 'Variant', 'Error'
+]
+CRAWLER_FIELDS = ['Source', 'Category', 'Platform', 'User Agent', 'Access Status', 'Crawl Delay', 'Can Access']
+MATRIX_FIELDS = ['Source', 'Category', 'Platform', 'User Agent']
+CORPUS_CRAWLER_FIELDS = ['Category', 'Platform', 'User Agent', 'Files', 'Blocked', 'Block Rate %']
+LOG_FIELDS = [
+    'Category', 'Platform', 'User Agent', 'Hits', 'Disallowed Hits', 'Violation Rate %', 'Sample Disallowed Paths'
+]
+
+
+def read_lines(path):
+    """Yield non-empty, non-comment lines from a file ('-' for stdin)"""
+    stream = sys.stdin if path == '-' else open(path, encoding='utf-8', errors='replace')
+    try:
+        for line in stream:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def read_domains(path):
+    """Yield domains from a list or CSV export, where the domain is the first column"""
+    for line in read_lines(path):
+        domain = line.split(',')[0].strip()
+        if domain:
+            yield domain
+
+
+def open_output(path):
+    """Open an output text stream: stdout for '-', gzip-compressed for '.gz' names"""
+    if path == '-':
+        return sys.stdout
+    if path.endswith('.gz'):
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def read_robots_file(path):
+    """Read a local robots.txt as UTF-8, dropping a byte order mark like fetched files"""
+    with open(path, encoding='utf-8-sig', errors='replace') as robots_file:
+        return robots_file.read()
+
+
+def write_rows(rows, fields, output_format, stream):
+    """Write rows as CSV, JSON Lines or a JSON array, streaming where possible"""
+    if output_format == 'json':
+        json.dump(list(rows), stream, indent=2, default=str)
+        stream.write('\n')
+        return
+
+    if output_format == 'jsonl':
+        for row in rows:
+            stream.write(json.dumps(row, default=str) + '\n')
+            stream.flush()
+        return
+
+    writer = csv.DictWriter(stream, fieldnames=fields, extrasaction='ignore', restval='')
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        stream.flush()
+
+
+def analyze_robots_files(paths, include_results):
+    """Analyze local robots.txt files without any network access"""
+    for path in paths:
+        robots_content = read_robots_file(path)
+        results = stored_crawler_access(robots_content, '')
+        row = {'Source': path, 'Status': 'Local file'}
+        row.update(summarize_results(results))
+        if include_results:
+            row['Results'] = results
+        yield row
+
+
+def analyze_domains(domains, args):
+    """Audit domains concurrently, yielding rows as they complete"""
+    for row in iter_bulk_audit(
+        domains,
+        max_concurrency=args.concurrency,
+        per_host_concurrency=args.per_host,
+        probe_variants=args.probe_variants,
+        include_results=args.per_crawler
+    ):
+        row['Source'] = row['Domain']
+        yield row
+
+
+def per_crawler_rows(rows):
+    """Flatten summary rows that carry their crawler results"""
+    for row in rows:
+        results = row.get('Results')
+        if results is None:
+            continue
+        for result in results.records():
+            yield dict(result, Source=row['Source'])
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='crawlscope',
+        description='Analyze which crawlers robots.txt files allow or block.'
+    )
+    subcommands = parser.add_subparsers(dest='command', required=True)
+
+    analyze = subcommands.add_parser('analyze', help='analyze domains or local robots.txt files')
+    analyze.add_argument('domains', nargs='*', help='domains or URLs to analyze')
+    analyze.add_argument('-i', '--input', action='append', default=[],
+                         help="file with one domain per line ('-' for stdin); may be repeated")
+    analyze.add_argument('--robots-file', action='append', default=[],
+                         help='local robots.txt file to analyze offline; may be repeated')
+    analyze.add_argument('-f', '--format', choices=['csv', 'json', 'jsonl'], default='csv')
+    analyze.add_argument('-o', '--output', default='-',
+                         help="output file ('-' for stdout); a .gz name is gzip-compressed")
+    analyze.add_argument('--per-crawler', action='store_true',
+                         help='emit one row per crawler instead of one summary row per source')
+    analyze.add_argument('--concurrency', type=int, default=BULK_MAX_CONCURRENCY)
+    analyze.add_argument('--per-host', type=int, default=BULK_PER_HOST_CONCURRENCY)
+    analyze.add_argument('--probe-variants', action='store_true',
+                         help='try www/protocol variants when a fetch fails')
+
+    matrix = subcommands.add_parser('matrix', help='evaluate every crawler against a set of paths')
+    matrix.add_argument('domains', nargs='*', help='domains or URLs to evaluate')
+    matrix.add_argument('--robots-file', action='append', default=[],
+                        help='local robots.txt file to evaluate offline; may be repeated')
+    matrix.add_argument('-p', '--path', action='append', default=[],
+                        help=f"path or URL to check; may be repeated (default: {' '.join(DEFAULT_MATRIX_PATHS)})")
+    matrix.add_argument('--paths-file', help="file with one path per line ('-' for stdin)")
+    matrix.add_argument('-f', '--format', choices=['csv', 'json', 'jsonl'], default='csv')
+    matrix.add_argument('-o', '--output', default='-',
+                        help="output file ('-' for stdout); a .gz name is gzip-compressed")
+
+    check = subcommands.add_parser('check-urls', help='check a large URL list against one robots.txt')
+    check.add_argument('urls_file', help="text or CSV file of URLs, optionally gzipped ('-' for stdin)")
+    source = check.add_mutually_exclusive_group(required=True)
+    source.add_argument('--robots-file', help='local robots.txt file to check against')
+    source.add_argument('--domain', help='domain or URL whose robots.txt to fetch')
+    check.add_argument('-u', '--user-agent', action='append', default=[],
+                       help=f"user agent token to check; may be repeated (default: {' '.join(DEFAULT_URLCHECK_USER_AGENTS)})")
+    check.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes (1 checks inline)')
+    check.add_argument('--batch-size', type=int, default=URLCHECK_BATCH_SIZE)
+    check.add_argument('-f', '--format', choices=['csv', 'jsonl'], default='csv')
+    check.add_argument('-o', '--output', default='-',
+                       help="output file ('-' for stdout); a .gz name is gzip-compressed")
+
+    sitemaps = subcommands.add_parser('sitemaps', help="check every URL in a site's sitemaps against its robots.txt")
+    sitemaps.add_argument('domain', help='domain or URL whose robots.txt and sitemaps to audit')
+    sitemaps.add_argument('-u', '--user-agent', action='append', default=[],
+                          help=f"user agent token to check; may be repeated (default: {' '.join(DEFAULT_SITEMAP_USER_AGENTS)})")
+    sitemaps.add_argument('--blocked-only', action='store_true', help='only write URLs blocked for some user agent')
+    sitemaps.add_argument('--workers', type=int, default=SITEMAP_MAX_WORKERS, help='sitemaps fetched concurrently')
+    sitemaps.add_argument('--max-sitemaps', type=int, default=SITEMAP_MAX_FILES)
+    sitemaps.add_argument('-f', '--format', choices=['csv', 'jsonl'], default='csv')
+    sitemaps.add_argument('-o', '--output', default='-',
+                          help="output file ('-' for stdout); a .gz name is gzip-compressed")
+
+    logs = subcommands.add_parser('logs', help='find crawler traffic and robots.txt violations in access logs')
+    logs.add_argument('logs', nargs='+', help='nginx/Apache combined-format log files, optionally gzipped')
+    source = logs.add_mutually_exclusive_group()
+    source.add_argument('--robots-file', help='local robots.txt file to check requests against')
+    source.add_argument('--domain', help='domain or URL whose robots.txt to check requests against')
+    logs.add_argument('--violators-only', action='store_true',
+                      help='only write crawlers that fetched disallowed URLs')
+    logs.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes (1 scans inline)')
+    logs.add_argument('-f', '--format', choices=['csv', 'json', 'jsonl'], default='csv')
+    logs.add_argument('-o', '--output', default='-',
+                      help="output file ('-' for stdout); a .gz name is gzip-compressed")
+
+    corpus = subcommands.add_parser('corpus', help='analyze an offline corpus of robots.txt files or WARC archives')
+    corpus.add_argument('paths', nargs='+', help='robots.txt files, directories of them, or .warc/.warc.gz archives')
+    corpus.add_argument('--crawler-columns', action='store_true',
+                        help='add a True/False access column per registry user agent')
+    corpus.add_argument('--crawler-summary', help='write per-crawler block rates across the corpus to this CSV file')
+    corpus.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes (1 analyzes inline)')
+    corpus.add_argument('-f', '--format', choices=['csv', 'jsonl'], default='csv')
+    corpus.add_argument('-o', '--output', default='-',
+                        help="output file ('-' for stdout); a .gz name is gzip-compressed")
+    return parser
+
+
+def run_analyze(args):
+    domains = list(args.domains)
+    for path in args.input:
+        domains.extend(read_domains(path))
+    if not domains and not args.robots_file:
+        raise SystemExit('crawlscope analyze: give at least one domain, --input file or --robots-file')
+
+    def rows():
+        yield from analyze_robots_files(args.robots_file, args.per_crawler)
+        if domains:
+            yield from analyze_domains((normalize_url(domain) for domain in domains), args)
+
+    output = open_output(args.output)
+    try:
+        if args.per_crawler:
+            write_rows(per_crawler_rows(rows()), CRAWLER_FIELDS, args.format, output)
+        else:
+            write_rows(rows(), SUMMARY_FIELDS, args.format, output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+def matrix_rows(sources, paths):
+    """Yield one row per source and crawler with a True/False column per path"""
+    for source, robots_content in sources:
+        for row in check_access_matrix(robots_content, '', paths).records():
+            yield dict(row, Source=source)
+
+
+def run_matrix(args):
+    if not args.domains and not args.robots_file:
+        raise SystemExit('crawlscope matrix: give at least one domain or --robots-file')
+    paths = list(args.path)
+    if args.paths_file:
+        paths.extend(read_lines(args.paths_file))
+    paths = normalize_paths(paths or DEFAULT_MATRIX_PATHS)
+
+    def sources():
+        for path in args.robots_file:
+            yield path, read_robots_file(path)
+        for domain in args.domains:
+            # Failed fetches evaluate the RFC 9309 fallback (allow or disallow all)
+            yield domain, fetch_robots_txt(normalize_url(domain)).effective_content
+
+    output = open_output(args.output)
+    try:
+        write_rows(matrix_rows(sources(), paths), MATRIX_FIELDS + paths, args.format, output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+def run_check_urls(args):
+    if args.robots_file:
+        robots_content = read_robots_file(args.robots_file)
+    else:
+        robots_content = fetch_robots_txt(normalize_url(args.domain)).effective_content
+
+    output = open_output(args.output)
+    try:
+        summary = check_urls(
+            iter_urls(args.urls_file),
+            robots_content,
+            output,
+            user_agents=args.user_agent,
+            output_format=args.format,
+            workers=args.workers,
+            batch_size=args.batch_size
+        )
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    # The summary goes to stderr so stdout stays a clean verdict stream
+    print(f"Checked {summary['URLs']} URLs in {summary['Seconds']}s ({summary['URLs/s']} URLs/s)", file=sys.stderr)
+    for user_agent, blocked in summary['Blocked'].items():
+        print(f"  {user_agent}: {blocked} blocked", file=sys.stderr)
+
+
+def run_sitemaps(args):
+    fetch = fetch_robots_txt(normalize_url(args.domain))
+    document = RobotsDocument(fetch.effective_content)
+    if not document.sitemaps:
+        raise SystemExit(f"crawlscope sitemaps: {fetch.robots_url} declares no sitemaps")
+    user_agents = args.user_agent or DEFAULT_SITEMAP_USER_AGENTS
+
+    output = open_output(args.output)
+    writer = csv.writer(output)
+    if args.format == 'csv':
+        writer.writerow(['Sitemap', 'URL', *user_agents])
+
+    def on_url(sitemap_url, url, verdicts):
+        if args.blocked_only and all(verdicts):
+            return
+        if args.format == 'jsonl':
+            row = {'Sitemap': sitemap_url, 'URL': url}
+            row.update(zip(user_agents, verdicts))
+            output.write(json.dumps(row) + '\n')
+        else:
+            writer.writerow([sitemap_url, url, *verdicts])
+
+    try:
+        audit = audit_sitemaps(
+            # Sitemap URLs are checked against the host that actually served robots.txt
+            fetch.redirects[-1] if fetch.redirects else fetch.robots_url,
+            fetch.effective_content,
+            document.sitemaps,
+            user_agents=user_agents,
+            max_workers=args.workers,
+            max_files=args.max_sitemaps,
+            on_url=on_url
+        )
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    # The summary goes to stderr so stdout stays a clean verdict stream
+    for row in sorted(audit.sitemaps, key=lambda row: row['Sitemap']):
+        status = row['Error'] or ('sitemap index' if row['Type'] == 'index' else f"{row['URLs']} URLs, {row['Blocked']} blocked")
+        print(f"{row['Sitemap']}: {status}", file=sys.stderr)
+    for insight in sitemap_insights(audit):
+        print(insight.replace('**', ''), file=sys.stderr)
+
+
+def run_logs(args):
+    robots_content = None
+    if args.robots_file:
+        robots_content = read_robots_file(args.robots_file)
+    elif args.domain:
+        robots_content = fetch_robots_txt(normalize_url(args.domain)).effective_content
+
+    report = analyze_logs(args.logs, robots_content, workers=args.workers)
+    rows = report.violators() if args.violators_only else report.records()
+    output = open_output(args.output)
+    try:
+        write_rows(rows, LOG_FIELDS, args.format, output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    # The summary goes to stderr so stdout stays a clean report
+    print(f"Scanned {report.lines} lines ({report.size / 2**20:.1f} MiB) in {report.seconds:.2f}s "
+          f"({report.throughput or 0:.0f} MiB/s)", file=sys.stderr)
+    if report.unparsed:
+        print(f"  {report.unparsed} lines were not in combined log format", file=sys.stderr)
+    print(f"  {report.bot_hits} crawler hits", file=sys.stderr)
+    if robots_content is not None:
+        print(f"  {report.violations} hits on URLs disallowed by robots.txt", file=sys.stderr)
+
+
+def run_corpus(args):
+    # Crawlers with the same user agent share a token and so a verdict; keep the first
+    columns = {}
+    if args.crawler_columns:
+        for i, user_agent in enumerate(get_crawler_index().user_agents):
+            columns.setdefault(user_agent, i)
+
+    output = open_output(args.output)
+    writer = csv.DictWriter(output, fieldnames=CORPUS_FIELDS + list(columns), extrasaction='ignore', restval='')
+    if args.format == 'csv':
+        writer.writeheader()
+
+    def on_row(row, results):
+        if results is not None:
+            for user_agent, i in columns.items():
+                row[user_agent] = results.can_access(i)
+        if args.format == 'jsonl':
+            output.write(json.dumps(row) + '\n')
+        else:
+            writer.writerow(row)
+
+    try:
+        report = analyze_corpus(args.paths, on_row, include_results=bool(columns), workers=args.workers)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    if args.crawler_summary:
+        with open(args.crawler_summary, 'w', encoding='utf-8', newline='') as summary:
+            write_rows(report.records(), CORPUS_CRAWLER_FIELDS, 'csv', summary)
+
+    # The summary goes to stderr so stdout stays a clean row stream
+    print(f"Analyzed {report.rows} robots.txt records in {report.seconds:.2f}s "
+          f"({report.rows_per_second or 0:.0f} records/s)", file=sys.stderr)
+    for status, count in report.statuses.items():
+        print(f"  {status}: {count}", file=sys.stderr)
+    # Crawlers no file blocks are left out rather than listed at 0%
+    most_blocked = sorted((row for row in report.records() if row['Blocked'] > 0), key=lambda row: -row['Blocked'])[:10]
+    if most_blocked:
+        print('Most blocked crawlers:', file=sys.stderr)
+        for row in most_blocked:
+            print(f"  {row['User Agent']}: {row['Block Rate %']}%", file=sys.stderr)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        if args.command == 'analyze':
+            run_analyze(args)
+        elif args.command == 'matrix':
+            run_matrix(args)
+        elif args.command == 'check-urls':
+            run_check_urls(args)
+        elif args.command == 'sitemaps':
+            run_sitemaps(args)
+        elif args.command == 'logs':
+            run_logs(args)
+        elif args.command == 'corpus':
+            run_corpus(args)
+    except BrokenPipeError:
+        # Output piped into e.g. `head`; stop quietly
+        sys.stderr.close()
+
+
+if __name__ == '__main__':
+    main()
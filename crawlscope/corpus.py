@@ -0,0 +1,565 @@
+"""Offline analysis of robots.txt corpora: directories of files and WARC archives
+
+Every robots.txt in the corpus is evaluated for the whole crawler registry, as
+the bulk audit does for live domains, and reported as one summary row in input
+order. WARC archives (plain or gzipped) are memory-mapped and split into byte
+ranges: plain ones at record boundaries, gzipped ones anywhere, with each task
+starting at the first gzip member in its range that holds a record.
+Directories are split into batches of paths, and a process pool works through
+them with only a few tasks in flight, so neither the corpus nor its results
+are ever held in memory as a whole. Gzipped records are parsed straight out of
+the decompressor, so members of any size stream through in bounded memory.
+"""
+import mmap
+import os
+import time
+import zlib
+from array import array
+from collections import deque
+
+from .analysis import stored_crawler_access, summarize_results
+from .cache import ResultStore
+from .crawlers import get_crawler_index
+from .fetch import (
+    FETCH_CHUNK_SIZE,
+    FETCH_SUCCESS,
+    FETCH_UNAVAILABLE,
+    ROBOTS_MAX_BYTES,
+    FetchResult,
+    classify_status,
+    is_zlib_header
+)
+from .results import AccessResults
+
+# Archives larger than this are split into ranges of about this size
+CORPUS_RANGE_BYTES = 32 * 2**20
+# Loose robots.txt files per task, and tasks queued per worker
+CORPUS_BATCH_FILES = 256
+CORPUS_PENDING_PER_WORKER = 2
+# Results memoized per worker; corpora repeat the same few files a lot
+CORPUS_RESULT_CACHE_ENTRIES = 4096
+WARC_MAX_HEADER_BYTES = 64 * 1024
+# Bytes of a record block kept: HTTP headers plus the part of the body that is parsed
+WARC_MAX_BLOCK_BYTES = WARC_MAX_HEADER_BYTES + ROBOTS_MAX_BYTES
+
+CORPUS_FIELDS = [
+    'Source', 'URL', 'Status', 'Total', 'Allowed', 'Blocked', 'Block Rate %', 'Outcome', 'HTTP Status', 'Error'
+]
+
+
+def is_warc(path):
+    return (path[:-3] if path.endswith('.gz') else path).endswith('.warc')
+
+
+def _parse_headers(data):
+    """Lowercased name -> value for a WARC or HTTP header block, skipping its first line"""
+    headers = {}
+    for line in data.split(b'\n')[1:]:
+        name, separator, value = line.partition(b':')
+        if separator:
+            headers[name.strip().lower().decode('latin-1')] = value.strip().decode('latin-1')
+    return headers
+
+
+def iter_warc_records(data, start, end):
+    """Yield (offset, WARC headers, block start, block length) for records in data[start:end]
+    
+    ``data`` may be an mmap or bytes. Raises ValueError at a malformed record.
+    """
+    position = start
+    while position < end:
+        # Records end with two CRLFs; be lenient about extra blank lines
+        while position < end and data[position:position + 1] in (b'\r', b'\n'):
+            position += 1
+        if position >= end:
+            break
+        header_end = data.find(b'\r\n\r\n', position, min(end, position + WARC_MAX_HEADER_BYTES))
+        if header_end < 0 or data[position:position + 5] != b'WARC/':
+            raise ValueError(f"Invalid WARC record at offset {position}")
+        headers = _parse_headers(data[position:header_end])
+        try:
+            length = int(headers['content-length'])
+        except (KeyError, ValueError):
+            raise ValueError(f"WARC record at offset {position} has no valid Content-Length") from None
+        yield position, headers, header_end + 4, length
+        position = header_end + 4 + length
+
+
+class GzipStream:
+    """Inflated bytes of consecutive gzip members in data, from an offset on
+    
+    ``buffer`` holds inflated bytes not consumed yet; fill() adds at most
+    FETCH_CHUNK_SIZE at a time, so a member is never inflated whole.
+    """
+    
+    def __init__(self, data, position):
+        self.data = data
+        # Next compressed byte to feed, and the offset of the member being inflated
+        self.position = position
+        self.member = position
+        self.decompressor = None
+        self.buffer = bytearray()
+    
+    def member_end(self):
+        """Offset of the next member once the current one is fully inflated, else None"""
+        decompressor = self.decompressor
+        if decompressor is not None:
+            if not decompressor.eof:
+                return None
+            # Input fed past the end of the member belongs to the next one
+            self.position -= len(decompressor.unused_data)
+            self.decompressor = None
+        return self.position
+    
+    def fill(self):
+        """Inflate another piece into the buffer; False once the data runs out"""
+        if self.member_end() is not None:
+            if self.position >= len(self.data):
+                return False
+            if self.data[self.position:self.position + 2] != b'\x1f\x8b':
+                raise ValueError(f"Invalid gzip member at offset {self.position}")
+            self.member = self.position
+            self.decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        decompressor = self.decompressor
+        try:
+            if decompressor.unconsumed_tail:
+                piece = decompressor.decompress(decompressor.unconsumed_tail, FETCH_CHUNK_SIZE)
+            else:
+                chunk = self.data[self.position:self.position + FETCH_CHUNK_SIZE]
+                if not chunk:
+                    raise ValueError(f"Truncated gzip member at offset {self.member}")
+                self.position += len(chunk)
+                piece = decompressor.decompress(chunk, FETCH_CHUNK_SIZE)
+        except zlib.error as e:
+            raise ValueError(f"Invalid gzip member at offset {self.member}: {e}") from None
+        self.buffer += piece
+        return True
+
+
+def begins_record(data, position):
+    """Whether a gzip member starts at position and inflates to the start of a WARC record"""
+    try:
+        head = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(data[position:position + FETCH_CHUNK_SIZE], 5)
+    except zlib.error:
+        return False
+    return head == b'WARC/'
+
+
+def find_record_member(data, start, end):
+    """Offset of the first gzip member starting in data[start:end] that begins a WARC record, or None"""
+    position = start
+    while True:
+        # A member starting just before end still belongs to this range
+        position = data.find(b'\x1f\x8b\x08', position, end + 2)
+        if position < 0 or position >= end:
+            return None
+        if begins_record(data, position):
+            return position
+        position += 1
+
+
+def iter_gzip_warc_records(data, start, end):
+    """Yield (member offset, WARC headers, block) for records in the gzip members starting in data[start:end]
+    
+    Records are parsed as they are inflated. Blocks are cut to
+    WARC_MAX_BLOCK_BYTES and the rest is inflated and dropped, so neither a
+    multi-gigabyte member nor a single-member archive is held in memory. A
+    range stops at the first member at or past ``end`` that begins with a
+    record, and a range other than the first starts at the first such member
+    in it (see find_record_member), so consecutive ranges meet exactly, even
+    where records span members. Raises ValueError at malformed data.
+    """
+    if start:
+        start = find_record_member(data, start, end)
+        if start is None:
+            return
+    stream = GzipStream(data, start)
+    buffer = stream.buffer
+    while True:
+        # Records end with two CRLFs; be lenient about extra blank lines
+        while True:
+            while buffer[:1] in (b'\r', b'\n'):
+                del buffer[:1]
+            if buffer:
+                break
+            boundary = stream.member_end()
+            if boundary is not None and boundary >= end and begins_record(data, boundary):
+                return
+            if not stream.fill():
+                return
+        
+        offset = stream.member
+        header_end = buffer.find(b'\r\n\r\n')
+        while header_end < 0 and len(buffer) < WARC_MAX_HEADER_BYTES and stream.fill():
+            header_end = buffer.find(b'\r\n\r\n')
+        if not 0 <= header_end < WARC_MAX_HEADER_BYTES or buffer[:5] != b'WARC/':
+            raise ValueError(f"Invalid WARC record in gzip member at offset {offset}")
+        headers = _parse_headers(bytes(buffer[:header_end]))
+        try:
+            length = int(headers['content-length'])
+        except (KeyError, ValueError):
+            raise ValueError(f"WARC record in gzip member at offset {offset} has no valid Content-Length") from None
+        del buffer[:header_end + 4]
+        
+        kept = min(length, WARC_MAX_BLOCK_BYTES)
+        while len(buffer) < kept and stream.fill():
+            pass
+        block = bytes(buffer[:kept])
+        # Drop the rest of the block as it is inflated
+        remaining = length
+        while True:
+            dropped = min(remaining, len(buffer))
+            del buffer[:dropped]
+            remaining -= dropped
+            if not remaining:
+                break
+            if not stream.fill():
+                raise ValueError(f"Truncated WARC record in gzip member at offset {offset}")
+        yield offset, headers, block
+
+
+def _dechunk(body):
+    """Undo chunked transfer coding, keeping whatever complete chunks there are"""
+    pieces = []
+    position = 0
+    while True:
+        line_end = body.find(b'\r\n', position)
+        if line_end < 0:
+            break
+        try:
+            size = int(body[position:line_end].split(b';')[0], 16)
+        except ValueError:
+            break
+        if size == 0:
+            break
+        pieces.append(body[line_end + 2:line_end + 2 + size])
+        position = line_end + 2 + size + 2
+    return b''.join(pieces)
+
+
+def _inflate(body, encoding):
+    """Decode a gzip/deflate Content-Encoding, keeping one byte past ROBOTS_MAX_BYTES to show truncation"""
+    if encoding == 'deflate':
+        wbits = zlib.MAX_WBITS if is_zlib_header(body) else -zlib.MAX_WBITS
+    else:
+        wbits = 16 + zlib.MAX_WBITS
+    try:
+        return zlib.decompressobj(wbits).decompress(body, ROBOTS_MAX_BYTES + 1)
+    except zlib.error as e:
+        raise ValueError(f"Invalid {encoding} body: {e}") from None
+
+
+def warc_robots_body(headers, block):
+    """(HTTP status, robots.txt bytes) of a response or resource record, or None for other records"""
+    record_type = headers.get('warc-type')
+    if record_type == 'resource':
+        return 200, block
+    if record_type != 'response':
+        return None
+    
+    separator = b'\r\n\r\n'
+    http_end = block.find(separator)
+    if http_end < 0:
+        separator = b'\n\n'
+        http_end = block.find(separator)
+    status_line = block[:block.find(b'\n')].split()
+    if http_end < 0 or len(status_line) < 2 or not status_line[1].isdigit():
+        raise ValueError('Invalid HTTP response')
+    http_headers = _parse_headers(block[:http_end])
+    body = block[http_end + len(separator):]
+    
+    # Archives store the body as sent unless the writer decoded it (and renamed the headers)
+    if 'chunked' in http_headers.get('transfer-encoding', '').lower():
+        body = _dechunk(body)
+    encoding = http_headers.get('content-encoding', '').strip().lower()
+    if encoding in ('gzip', 'x-gzip', 'deflate'):
+        body = _inflate(body, encoding)
+    return int(status_line[1]), body
+
+
+# Per-process state, set up once by the pool initializer
+_worker_store = None
+_worker_include_results = False
+
+
+def _init_worker(include_results):
+    global _worker_store, _worker_include_results
+    _worker_store = ResultStore(CORPUS_RESULT_CACHE_ENTRIES)
+    _worker_include_results = include_results
+
+
+class _TaskResult:
+    """Rows of one task plus its blocked counts per crawler"""
+    
+    def __init__(self):
+        self.rows = []
+        self.results = [] if _worker_include_results else None
+        # Access bitset -> rows with that verdict; different files often agree
+        self.patterns = {}
+    
+    def add(self, source, url, status_code, body, status=None, truncated=False):
+        """Evaluate one robots.txt body; status overrides the label of a 2xx row
+        
+        ``truncated`` marks a body that was already cut short upstream.
+        """
+        row = dict.fromkeys(CORPUS_FIELDS)
+        row.update({'Source': source, 'URL': url, 'HTTP Status': status_code if status is None else None})
+        results = None
+        outcome = None
+        try:
+            if 300 <= status_code < 400:
+                row['Status'] = '↪️ Redirect (not followed)'
+            else:
+                outcome = classify_status(status_code)
+                content, truncated = robots_text(body, truncated)
+                fetch = FetchResult(url, outcome, content=content, status_code=status_code, truncated=truncated)
+                results = stored_crawler_access(fetch.effective_content, '', _worker_store)
+                row.update(summarize_results(results))
+                if outcome == FETCH_SUCCESS:
+                    row['Status'] = status or '✅ Analyzed'
+                elif outcome == FETCH_UNAVAILABLE:
+                    row['Status'] = '🚫 No robots.txt (all allowed)'
+                else:
+                    row['Status'] = '⚠️ Unreachable (all disallowed)'
+            row['Outcome'] = outcome
+        except Exception as e:
+            self.add_error(source, str(e), url)
+            return
+        self.rows.append(row)
+        if results is not None:
+            bits = bytes(results.bits)
+            self.patterns[bits] = self.patterns.get(bits, 0) + 1
+        if self.results is not None:
+            self.results.append(results.to_bytes() if results is not None else None)
+    
+    def add_error(self, source, error, url=None):
+        row = dict.fromkeys(CORPUS_FIELDS)
+        row.update({'Source': source, 'URL': url, 'Status': '⚠️ Error', 'Error': error})
+        self.rows.append(row)
+        if self.results is not None:
+            self.results.append(None)
+    
+    def finish(self):
+        """(rows, blocked counts, serialized results) to send back to the parent"""
+        blocked = array('Q', [0]) * len(get_crawler_index())
+        for bits, count in self.patterns.items():
+            for i in range(len(blocked)):
+                if not bits[i >> 3] >> (i & 7) & 1:
+                    blocked[i] += count
+        return self.rows, blocked, self.results
+
+
+def robots_text(body, truncated=False):
+    """robots.txt text of at most ROBOTS_MAX_BYTES from a body that may run longer
+    
+    A body that was cut off loses its partial last line, as in
+    read_robots_body, rather than parsing half a rule. Returns (text, truncated).
+    """
+    truncated = truncated or len(body) > ROBOTS_MAX_BYTES
+    body = body[:ROBOTS_MAX_BYTES]
+    if truncated:
+        body = body[:body.rfind(b'\n') + 1]
+    return body.decode('utf-8-sig', 'replace'), truncated
+
+
+def _scan_files(paths):
+    result = _TaskResult()
+    for path in paths:
+        try:
+            with open(path, 'rb') as robots_file:
+                # One byte more shows whether the file runs past the limit
+                body = robots_file.read(ROBOTS_MAX_BYTES + 1)
+        except OSError as e:
+            result.add_error(path, str(e))
+            continue
+        result.add(path, None, 200, body, 'Local file')
+    return result.finish()
+
+
+def _iter_blocks(data, start, end, gzipped):
+    """(WARC headers, block cut to WARC_MAX_BLOCK_BYTES, whether it was cut) for the records of a range"""
+    if gzipped:
+        for _, headers, block in iter_gzip_warc_records(data, start, end):
+            yield headers, block, len(block) < int(headers['content-length'])
+    else:
+        for _, headers, block_start, length in iter_warc_records(data, start, end):
+            yield headers, data[block_start:block_start + min(length, WARC_MAX_BLOCK_BYTES)], length > WARC_MAX_BLOCK_BYTES
+
+
+def _scan_warc(path, start, end, gzipped):
+    result = _TaskResult()
+    try:
+        with open(path, 'rb') as warc_file, mmap.mmap(warc_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for headers, block, cut in _iter_blocks(data, start, end, gzipped):
+                url = headers.get('warc-target-uri')
+                try:
+                    record = warc_robots_body(headers, block)
+                except ValueError as e:
+                    result.add_error(path, str(e), url)
+                    continue
+                if record is not None:
+                    result.add(path, url, *record, truncated=cut)
+    except (OSError, ValueError) as e:
+        # A malformed archive ends its range; the records before it are kept
+        result.add_error(path, str(e))
+    return result.finish()
+
+
+def _run_task(task):
+    if task[0] == 'files':
+        return _scan_files(task[1])
+    return _scan_warc(*task[1:])
+
+
+def warc_tasks(path, range_bytes=CORPUS_RANGE_BYTES):
+    """Split a WARC file into ('warc', path, start, end, gzipped) tasks
+    
+    Plain archives are cut at record boundaries found from the record headers.
+    Gzipped ones are cut every ``range_bytes`` without inflating anything here;
+    each task finds its own first record member (see iter_gzip_warc_records).
+    An archive that is one big member still works, as one task.
+    """
+    size = os.path.getsize(path)
+    if not size:
+        return
+    with open(path, 'rb') as warc_file:
+        gzipped = warc_file.read(2) == b'\x1f\x8b'
+        if gzipped:
+            for start in range(0, size, range_bytes):
+                yield 'warc', path, start, min(start + range_bytes, size), gzipped
+            return
+        if size <= range_bytes:
+            yield 'warc', path, 0, size, gzipped
+            return
+        with mmap.mmap(warc_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            start = 0
+            try:
+                for offset, _, _, _ in iter_warc_records(data, 0, size):
+                    if offset - start >= range_bytes:
+                        yield 'warc', path, start, offset, gzipped
+                        start = offset
+            except ValueError:
+                # The task that reaches the malformed record reports it
+                pass
+    yield 'warc', path, start, size, gzipped
+
+
+def corpus_tasks(paths, range_bytes=CORPUS_RANGE_BYTES, batch_files=CORPUS_BATCH_FILES):
+    """Tasks for robots.txt files, directories (walked recursively) and WARC files, in input order"""
+    batch = []
+    
+    def files(path):
+        if os.path.isdir(path):
+            for directory, subdirectories, names in os.walk(path):
+                subdirectories.sort()
+                for name in sorted(names):
+                    yield os.path.join(directory, name)
+        else:
+            yield path
+    
+    for path in paths:
+        for file_path in files(path):
+            if is_warc(file_path):
+                if batch:
+                    yield 'files', batch
+                    batch = []
+                yield from warc_tasks(file_path, range_bytes)
+                continue
+            batch.append(file_path)
+            if len(batch) >= batch_files:
+                yield 'files', batch
+                batch = []
+    if batch:
+        yield 'files', batch
+
+
+class CorpusReport:
+    """Totals over a corpus: rows per status and how often each crawler is blocked"""
+    
+    __slots__ = ('index', 'rows', 'evaluated', 'statuses', 'blocked', 'seconds')
+    
+    def __init__(self, index):
+        self.index = index
+        self.rows = 0
+        # Rows with crawler results (everything but errors and redirects)
+        self.evaluated = 0
+        self.statuses = {}
+        self.blocked = array('Q', [0]) * len(index)
+        self.seconds = 0.0
+    
+    def add(self, rows, blocked):
+        self.rows += len(rows)
+        for row in rows:
+            self.statuses[row['Status']] = self.statuses.get(row['Status'], 0) + 1
+            if row['Total'] is not None:
+                self.evaluated += 1
+        for i, count in enumerate(blocked):
+            self.blocked[i] += count
+    
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else None
+    
+    def records(self):
+        """Yield one row per crawler: in how many of the evaluated files it is blocked"""
+        index = self.index
+        for i in range(len(index)):
+            yield {
+                'Category': index.category(i),
+                'Platform': index.platforms[i],
+                'User Agent': index.user_agents[i],
+                'Files': self.evaluated,
+                'Blocked': self.blocked[i],
+                'Block Rate %': round(self.blocked[i] / self.evaluated * 100, 1) if self.evaluated else 0.0
+            }
+    
+    __iter__ = records
+    
+    def to_dataframe(self):
+        import pandas as pd
+        
+        return pd.DataFrame(list(self.records()))
+
+
+def analyze_corpus(paths, on_row=None, include_results=False, workers=None,
+                   range_bytes=CORPUS_RANGE_BYTES, batch_files=CORPUS_BATCH_FILES):
+    """Evaluate every robots.txt in local files, directories and WARC archives
+    
+    ``on_row(row, results)`` is called for every summary row in input order;
+    ``results`` is the row's AccessResults with include_results, else None.
+    Work is spread over ``workers`` processes (default: one per CPU); 1 runs
+    in this process.
+    """
+    index = get_crawler_index()
+    workers = workers or os.cpu_count() or 1
+    report = CorpusReport(index)
+    start = time.perf_counter()
+    
+    def deliver(task_result):
+        rows, blocked, results = task_result
+        report.add(rows, blocked)
+        if on_row is not None:
+            for i, row in enumerate(rows):
+                data = results[i] if results is not None else None
+                on_row(row, AccessResults.from_bytes(data, index) if data is not None else None)
+    
+    tasks = corpus_tasks(paths, range_bytes, batch_files)
+    if workers == 1:
+        _init_worker(include_results)
+        for task in tasks:
+            deliver(_run_task(task))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(include_results,)) as pool:
+            pending = deque()
+            for task in tasks:
+                pending.append(pool.submit(_run_task, task))
+                # Bound the tasks in flight; deliver the oldest first to keep input order
+                if len(pending) >= workers * CORPUS_PENDING_PER_WORKER:
+                    deliver(pending.popleft().result())
+            while pending:
+                deliver(pending.popleft().result())
+    
+    report.seconds = time.perf_counter() - start
+    return report
@@ -0,0 +1,153 @@
+"""Registry of known crawlers and their robots.txt user agent tokens
+
+The built-in registry lives in data/crawlers.json. Operators can layer their
+own crawlers on top, without code changes, by pointing CRAWLSCOPE_CRAWLERS_PATH
+at one or more JSON files (separated by os.pathsep) in the same format:
+
+    {"format": 1, "crawlers": {"Category": {"Platform": "User-agent token"}}}
+
+Custom entries add new categories and crawlers, or replace the token of an
+existing (category, platform) pair.
+"""
+import hashlib
+import json
+import os
+import threading
+from array import array
+
+from .robots import normalize_user_agent
+
+REGISTRY_FORMAT = 1
+REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'crawlers.json')
+CUSTOM_CRAWLERS_PATHS = [
+    path for path in os.environ.get('CRAWLSCOPE_CRAWLERS_PATH', '').split(os.pathsep) if path
+]
+
+
+def load_registry_file(path):
+    """Read and validate a registry file, returning its category -> {platform: token} dict"""
+    with open(path, encoding='utf-8') as registry_file:
+        document = json.load(registry_file)
+    if not isinstance(document, dict) or document.get('format') != REGISTRY_FORMAT:
+        raise ValueError(f"{path}: expected a crawler registry with \"format\": {REGISTRY_FORMAT}")
+    crawlers = document.get('crawlers')
+    if not isinstance(crawlers, dict):
+        raise ValueError(f"{path}: \"crawlers\" must map categories to crawlers")
+    for category, entries in crawlers.items():
+        if not isinstance(entries, dict) or not all(isinstance(token, str) and token for token in entries.values()):
+            raise ValueError(f"{path}: category {category!r} must map platform names to user agent tokens")
+    return crawlers
+
+
+def registry_hash(crawlers_dict, parent_version=''):
+    """Fingerprint of a registry layer, chained onto the layer below it"""
+    # Results are positional, so order matters and keys are not sorted
+    digest = hashlib.sha256(parent_version.encode('utf-8'))
+    digest.update(json.dumps(crawlers_dict).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+class CrawlerIndex:
+    """Frozen, column-oriented view of a crawler registry
+    
+    Crawler i has a dense integer ID i, a category code into ``categories``,
+    a platform name, its user agent token and the token pre-normalized for
+    matching. ``version`` fingerprints the registry for use in cache keys.
+    """
+    
+    __slots__ = ('categories', 'category_codes', 'platforms', 'user_agents', 'tokens', 'ids', 'version')
+    
+    def __init__(self, crawlers_dict, version=None, base=None):
+        # Extending a base index copies its columns and only processes the new layer
+        categories = list(base.categories) if base else []
+        category_codes = array('H', base.category_codes) if base else array('H')
+        platforms = list(base.platforms) if base else []
+        user_agents = list(base.user_agents) if base else []
+        tokens = list(base.tokens) if base else []
+        ids = dict(base.ids) if base else {}
+        codes = {category: code for code, category in enumerate(categories)}
+        
+        for category, crawlers in crawlers_dict.items():
+            code = codes.setdefault(category, len(categories))
+            if code == len(categories):
+                categories.append(category)
+            for platform, user_agent in crawlers.items():
+                crawler_id = ids.setdefault((category, platform), len(platforms))
+                if crawler_id == len(platforms):
+                    category_codes.append(code)
+                    platforms.append(platform)
+                    user_agents.append(user_agent)
+                    tokens.append(normalize_user_agent(user_agent))
+                else:
+                    user_agents[crawler_id] = user_agent
+                    tokens[crawler_id] = normalize_user_agent(user_agent)
+        
+        self.categories = tuple(categories)
+        self.category_codes = category_codes
+        self.platforms = tuple(platforms)
+        self.user_agents = tuple(user_agents)
+        self.tokens = tuple(tokens)
+        self.ids = ids
+        self.version = version or registry_hash(crawlers_dict, base.version if base else '')
+    
+    def __len__(self):
+        return len(self.user_agents)
+    
+    def category(self, i):
+        return self.categories[self.category_codes[i]]
+    
+    def as_dict(self):
+        """The registry as a category -> {platform: token} dict"""
+        crawlers = {category: {} for category in self.categories}
+        for i, platform in enumerate(self.platforms):
+            crawlers[self.category(i)][platform] = self.user_agents[i]
+        return crawlers
+
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+_base_index = None
+_crawler_index = None
+_custom_signature = None
+_crawler_index_lock = threading.Lock()
+
+
+def get_crawler_index():
+    """Shared index of the built-in registry plus any custom crawler files
+    
+    The built-in layer is built once per process. When a custom file changes,
+    only the custom layers are re-applied on top of it.
+    """
+    global _base_index, _crawler_index, _custom_signature
+    signature = tuple(_file_signature(path) for path in CUSTOM_CRAWLERS_PATHS)
+    with _crawler_index_lock:
+        if _base_index is None:
+            _base_index = CrawlerIndex(load_registry_file(REGISTRY_PATH))
+        if _crawler_index is None or signature != _custom_signature:
+            index = _base_index
+            for path in CUSTOM_CRAWLERS_PATHS:
+                index = CrawlerIndex(load_registry_file(path), base=index)
+            _crawler_index = index
+            _custom_signature = signature
+        return _crawler_index
+
+
+def as_crawler_index(crawlers):
+    """Accept a CrawlerIndex or a crawler dict; the registry dict maps to the shared index"""
+    if isinstance(crawlers, CrawlerIndex):
+        return crawlers
+    if crawlers is None or crawlers is CRAWLERS:
+        return get_crawler_index()
+    return CrawlerIndex(crawlers)
+
+
+# Snapshot of the registry when this module was imported; long-running
+# processes should use get_crawler_index() to pick up custom file changes
+CRAWLERS = get_crawler_index().as_dict()
+
+# Results depend only on the robots.txt content and the crawler list, so the
+# registry fingerprint is part of every result key
+CRAWLERS_VERSION = get_crawler_index().version
@@ -0,0 +1,601 @@
+"""robots.txt fetching with pooled connections, caching and RFC 9309 outcomes"""
+import atexit
+import codecs
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from functools import lru_cache
+from urllib.parse import urljoin, urlparse
+
+# requests/urllib3 are imported on first use: they dominate import time and
+# offline analysis (local files, cached results) never needs them
+
+
+def normalize_url(url):
+    """Normalize URL by adding protocol if missing"""
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    return url
+
+
+# robots.txt fetch settings
+FETCH_CONNECT_TIMEOUT = 5
+FETCH_READ_TIMEOUT = 10
+FETCH_RETRIES = 2
+FETCH_BACKOFF_FACTOR = 0.5
+FETCH_RETRY_STATUSES = (429, 500, 502, 503, 504)
+FETCH_MAX_RETRY_AFTER = 30
+FETCH_POOL_SIZE = 64
+
+
+@lru_cache(maxsize=None)
+def _capped_retry_class():
+    """Build the Retry subclass once urllib3 is actually needed"""
+    from urllib3.util.retry import Retry
+    
+    class _CappedRetry(Retry):
+        """Retry policy that honours Retry-After but never sleeps for too long"""
+        
+        def get_retry_after(self, response):
+            retry_after = super().get_retry_after(response)
+            if retry_after is None:
+                return None
+            return min(retry_after, FETCH_MAX_RETRY_AFTER)
+    
+    return _CappedRetry
+
+
+def create_http_session(retries=FETCH_RETRIES, backoff_factor=FETCH_BACKOFF_FACTOR, pool_size=FETCH_POOL_SIZE):
+    """Create a pooled requests session with retry and exponential backoff"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    retry = _capped_retry_class()(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=FETCH_RETRY_STATUSES,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.max_redirects = FETCH_MAX_REDIRECTS
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+_http_sessions = {}
+_http_session_lock = threading.Lock()
+
+
+def get_http_session(retries=FETCH_RETRIES):
+    """Shared session reused across analyses and bulk runs in this process"""
+    with _http_session_lock:
+        session = _http_sessions.get(retries)
+        if session is None:
+            session = _http_sessions[retries] = create_http_session(retries)
+            atexit.register(session.close)
+        return session
+
+
+# Fetch outcomes, following RFC 9309 section 2.3.1
+FETCH_SUCCESS = 'success'          # 2xx: parse the file
+FETCH_UNAVAILABLE = 'unavailable'  # 4xx or too many redirects: everything is allowed
+FETCH_UNREACHABLE = 'unreachable'  # 5xx, 429 or network error: everything is disallowed
+
+# RFC 9309 requires following at least five redirects
+FETCH_MAX_REDIRECTS = 5
+
+DISALLOW_ALL_ROBOTS = "User-agent: *\nDisallow: /\n"
+
+# RFC 9309 section 2.5: parse at least the first 500 KiB; anything beyond is dropped
+ROBOTS_MAX_BYTES = 500 * 1024
+# Bytes read off the wire before giving up, so compressed streams that
+# inflate to nothing still end
+ROBOTS_MAX_WIRE_BYTES = 2 * ROBOTS_MAX_BYTES
+FETCH_CHUNK_SIZE = 16 * 1024
+# Only advertise encodings that read_robots_body can inflate with a size bound
+FETCH_ACCEPT_ENCODING = 'gzip, deflate'
+
+
+def _response_charset(response):
+    """Charset from the Content-Type header, defaulting to UTF-8 as RFC 9309 requires"""
+    for param in response.headers.get('Content-Type', '').split(';')[1:]:
+        key, _, value = param.partition('=')
+        if key.strip().lower() == 'charset':
+            try:
+                charset = codecs.lookup(value.strip().strip('"\'')).name
+            except LookupError:
+                break
+            # utf-8-sig also drops a leading byte order mark
+            return 'utf-8-sig' if charset == 'utf-8' else charset
+    return 'utf-8-sig'
+
+
+def is_zlib_header(data):
+    """Check for a zlib wrapper; some servers send raw deflate for 'deflate'"""
+    return len(data) >= 2 and data[0] & 0x0F == 8 and (data[0] << 8 | data[1]) % 31 == 0
+
+
+def inflate_pieces(decompressor, data, piece_size=FETCH_CHUNK_SIZE):
+    """Inflate data in pieces of at most piece_size bytes, so one chunk can't balloon"""
+    while data:
+        piece = decompressor.decompress(data, piece_size)
+        data = decompressor.unconsumed_tail
+        yield piece
+
+
+class BoundedBody:
+    """A streamed response body as decoded bytes chunks, cut off after max_bytes
+    
+    Compressed bodies are inflated with a bounded output size, so a
+    decompression bomb can't grow past max_bytes either. Reading also stops
+    after max_wire_bytes on the wire, so compressed streams that inflate to
+    nothing still end. ``truncated`` is set once the body was cut off.
+    """
+    
+    def __init__(self, response, max_bytes, max_wire_bytes):
+        self.encoding = response.headers.get('Content-Encoding', '').strip().lower()
+        if self.encoding not in ('', 'identity', 'gzip', 'x-gzip', 'deflate'):
+            raise ValueError(f"Unsupported Content-Encoding: {self.encoding}")
+        self.response = response
+        self.max_bytes = max_bytes
+        self.max_wire_bytes = max_wire_bytes
+        self.truncated = False
+    
+    def __iter__(self):
+        encoding = self.encoding
+        max_bytes = self.max_bytes
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if encoding in ('gzip', 'x-gzip') else None
+        size = 0
+        wire_bytes = 0
+        for data in self.response.raw.stream(FETCH_CHUNK_SIZE, decode_content=False):
+            wire_bytes += len(data)
+            if encoding == 'deflate' and decompressor is None:
+                decompressor = zlib.decompressobj(zlib.MAX_WBITS if is_zlib_header(data) else -zlib.MAX_WBITS)
+            for chunk in (data,) if decompressor is None else inflate_pieces(decompressor, data):
+                if size + len(chunk) > max_bytes:
+                    chunk = chunk[:max_bytes - size]
+                    self.truncated = True
+                size += len(chunk)
+                yield chunk
+                if self.truncated:
+                    return
+            if wire_bytes >= self.max_wire_bytes:
+                self.truncated = True
+                return
+
+
+def read_robots_body(response, max_bytes=ROBOTS_MAX_BYTES):
+    """Stream a response body into text, keeping at most max_bytes of decoded content
+    
+    Returns (text, truncated). A truncated body loses its partial last line
+    rather than parsing half a rule.
+    """
+    body = BoundedBody(response, max_bytes, ROBOTS_MAX_WIRE_BYTES)
+    decoder = codecs.getincrementaldecoder(_response_charset(response))(errors='replace')
+    pieces = [decoder.decode(chunk) for chunk in body]
+    pieces.append(decoder.decode(b'', final=True))
+    
+    text = ''.join(pieces)
+    if body.truncated:
+        text = text[:text.rfind('\n') + 1]
+    return text, body.truncated
+
+
+def get_following_redirects(session, url, headers, timeout=None):
+    """GET url as a stream, following up to FETCH_MAX_REDIRECTS redirects by hand
+    
+    Requests go straight through the session's adapter: Session.send reads
+    every redirect body into memory, even with allow_redirects=False. Here
+    they are closed unread. Returns the final response and the redirect chain.
+    ``timeout`` is a (connect, read) pair, by default the fetch timeouts.
+    """
+    import requests
+    
+    if timeout is None:
+        timeout = (FETCH_CONNECT_TIMEOUT, FETCH_READ_TIMEOUT)
+    chain = []
+    while True:
+        request = session.prepare_request(requests.Request('GET', url, headers=headers))
+        settings = session.merge_environment_settings(request.url, {}, True, None, None)
+        response = session.get_adapter(request.url).send(
+            request,
+            timeout=timeout,
+            **settings
+        )
+        if not response.is_redirect:
+            break
+        response.close()
+        if len(chain) == FETCH_MAX_REDIRECTS:
+            raise requests.TooManyRedirects(f"Exceeded {FETCH_MAX_REDIRECTS} redirects.")
+        chain.append(response.url)
+        url = urljoin(response.url, session.get_redirect_target(response))
+    # Full redirect chain, ending at the URL that actually answered
+    if chain:
+        chain.append(response.url)
+    return response, chain
+
+
+@dataclass
+class FetchResult:
+    """Outcome of fetching a robots.txt file"""
+    robots_url: str
+    outcome: str
+    content: str = None
+    status_code: int = None
+    error: str = None
+    redirects: list = field(default_factory=list)
+    from_cache: bool = False
+    variant: str = None
+    truncated: bool = False
+    # A cached copy served because the server could not be reached to revalidate it
+    stale: bool = False
+    # Labels of the www/protocol variants that were fetched, and failed, before
+    # this unreachable result was returned
+    tried_variants: list = field(default_factory=list)
+    
+    @property
+    def effective_content(self):
+        """robots.txt content to evaluate, applying RFC 9309 fallbacks"""
+        if self.outcome == FETCH_SUCCESS:
+            return self.content or ''
+        if self.outcome == FETCH_UNAVAILABLE:
+            return ''
+        return DISALLOW_ALL_ROBOTS
+
+
+def classify_status(status_code):
+    """Map an HTTP status code to a fetch outcome"""
+    if 200 <= status_code < 300:
+        return FETCH_SUCCESS
+    if 400 <= status_code < 500 and status_code != 429:
+        return FETCH_UNAVAILABLE
+    return FETCH_UNREACHABLE
+
+
+# On-disk robots.txt cache (set CRAWLSCOPE_CACHE_PATH to an empty string to disable)
+ROBOTS_CACHE_PATH = os.environ.get(
+    'CRAWLSCOPE_CACHE_PATH',
+    os.path.join(os.path.expanduser('~'), '.cache', 'crawlscope', 'robots.sqlite3')
+)
+# How long each outcome is trusted; RFC 9309 lets clients cache robots.txt
+# for up to 24 hours, and dead hosts are retried sooner than missing files
+ROBOTS_CACHE_TTLS = {
+    FETCH_SUCCESS: 24 * 60 * 60,
+    FETCH_UNAVAILABLE: 24 * 60 * 60,
+    FETCH_UNREACHABLE: 30 * 60
+}
+ROBOTS_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Eviction frees space down to this share of max_bytes, so a full cache is
+# not rescanned on every put
+ROBOTS_CACHE_EVICT_TO = 0.9
+
+
+class RobotsCache:
+    """SQLite-backed cache of robots.txt fetch outcomes and their validators"""
+    
+    def __init__(self, path=ROBOTS_CACHE_PATH, ttls=None, max_bytes=ROBOTS_CACHE_MAX_BYTES):
+        self.path = path
+        self.ttls = dict(ROBOTS_CACHE_TTLS, **(ttls or {}))
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS robots_fetches ('
+            'url TEXT PRIMARY KEY, outcome TEXT NOT NULL, status_code INTEGER, body TEXT, '
+            'etag TEXT, last_modified TEXT, error TEXT, redirects TEXT, '
+            'fetched_at REAL NOT NULL, last_used REAL NOT NULL, size INTEGER NOT NULL, '
+            'truncated INTEGER NOT NULL DEFAULT 0)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS robots_fetches_last_used ON robots_fetches (last_used)')
+        # Running total of body sizes, so put() doesn't scan the table
+        self._size = self._total_size()
+    
+    def get(self, url):
+        """Return the cached entry for a robots.txt URL, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT outcome, status_code, body, etag, last_modified, error, redirects, fetched_at, truncated '
+                'FROM robots_fetches WHERE url = ?', (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE robots_fetches SET last_used = ? WHERE url = ?', (time.time(), url))
+        return {
+            'outcome': row[0],
+            'status_code': row[1],
+            'body': row[2],
+            'etag': row[3],
+            'last_modified': row[4],
+            'error': row[5],
+            'redirects': json.loads(row[6]) if row[6] else [],
+            'fetched_at': row[7],
+            'truncated': bool(row[8])
+        }
+    
+    def is_fresh(self, entry):
+        """Check whether an entry can be served without refetching"""
+        return time.time() - entry['fetched_at'] < self.ttls.get(entry['outcome'], 0)
+    
+    def put(self, result, etag=None, last_modified=None):
+        """Store a fetch outcome, with validators for successful fetches"""
+        now = time.time()
+        body = result.content if result.outcome == FETCH_SUCCESS else None
+        size = len(body.encode('utf-8')) if body else 0
+        with self._lock:
+            replaced = self._conn.execute('SELECT size FROM robots_fetches WHERE url = ?', (result.robots_url,)).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO robots_fetches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    result.robots_url, result.outcome, result.status_code, body,
+                    etag, last_modified, result.error, json.dumps(result.redirects),
+                    now, now, size, result.truncated
+                )
+            )
+            self._size += size - (replaced[0] if replaced else 0)
+            if self._size > self.max_bytes:
+                self._evict()
+    
+    def touch(self, url):
+        """Mark an entry as revalidated (the server answered 304 Not Modified)"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute('UPDATE robots_fetches SET fetched_at = ?, last_used = ? WHERE url = ?', (now, now, url))
+    
+    def _total_size(self):
+        return self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM robots_fetches').fetchone()[0]
+    
+    def _evict(self):
+        """Drop least recently used entries once the cache outgrows max_bytes"""
+        # Recount first: other processes may share the file
+        total = self._size = self._total_size()
+        if total <= self.max_bytes:
+            return
+        
+        target = self.max_bytes * ROBOTS_CACHE_EVICT_TO
+        evicted = []
+        for url, size in self._conn.execute('SELECT url, size FROM robots_fetches ORDER BY last_used'):
+            evicted.append((url,))
+            total -= size
+            if total <= target:
+                break
+        self._conn.executemany('DELETE FROM robots_fetches WHERE url = ?', evicted)
+        self._size = total
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_robots_cache = None
+_robots_cache_opened = False
+_robots_cache_lock = threading.Lock()
+
+
+def get_robots_cache():
+    """Shared on-disk cache, or None when disabled or unavailable"""
+    global _robots_cache, _robots_cache_opened
+    with _robots_cache_lock:
+        if not _robots_cache_opened:
+            _robots_cache_opened = True
+            if ROBOTS_CACHE_PATH:
+                try:
+                    _robots_cache = RobotsCache()
+                    atexit.register(_robots_cache.close)
+                except (sqlite3.Error, OSError):
+                    _robots_cache = None
+        return _robots_cache
+
+
+def fetch_robots_txt(url, session=None, cache=None, force=False, timeout=None):
+    """Fetch robots.txt for a URL and classify the outcome
+    
+    With force, the cache is not consulted (the result still replaces the cached
+    entry), so the file is re-downloaded unconditionally. ``timeout`` is passed
+    to get_following_redirects.
+    """
+    import requests
+    
+    parsed_url = urlparse(url)
+    robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
+    if session is None:
+        session = get_http_session()
+    if cache is None:
+        cache = get_robots_cache()
+    
+    # Serve fresh cache entries (including known failures) without touching the network
+    entry = cache.get(robots_url) if cache and not force else None
+    if entry and cache.is_fresh(entry):
+        return FetchResult(
+            robots_url,
+            entry['outcome'],
+            content=entry['body'],
+            status_code=entry['status_code'],
+            error=entry['error'],
+            redirects=entry['redirects'],
+            from_cache=True,
+            truncated=entry['truncated']
+        )
+    
+    # Revalidate stale successful entries with the stored validators
+    headers = {'Accept-Encoding': FETCH_ACCEPT_ENCODING}
+    if entry and entry['outcome'] == FETCH_SUCCESS:
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+    
+    revalidating = len(headers) > 1
+    
+    etag = last_modified = None
+    try:
+        # Streamed, so memory per fetch stays bounded whatever the server sends
+        response, redirects = get_following_redirects(session, robots_url, headers, timeout)
+        try:
+            if response.status_code == 304 and revalidating:
+                cache.touch(robots_url)
+                return FetchResult(
+                    robots_url,
+                    FETCH_SUCCESS,
+                    content=entry['body'],
+                    status_code=entry['status_code'],
+                    redirects=entry['redirects'],
+                    from_cache=True,
+                    truncated=entry['truncated']
+                )
+            
+            outcome = classify_status(response.status_code)
+            content = None
+            truncated = False
+            if outcome == FETCH_SUCCESS:
+                content, truncated = read_robots_body(response)
+            result = FetchResult(
+                robots_url,
+                outcome,
+                content=content,
+                status_code=response.status_code,
+                redirects=redirects,
+                truncated=truncated
+            )
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+        finally:
+            response.close()
+    except requests.TooManyRedirects as e:
+        result = FetchResult(robots_url, FETCH_UNAVAILABLE, error=str(e))
+    except Exception as e:
+        result = FetchResult(robots_url, FETCH_UNREACHABLE, error=str(e))
+    
+    # RFC 9309 section 2.4: keep using the cached file while the server is unreachable,
+    # and keep it in the cache rather than replacing it with the failure
+    if result.outcome == FETCH_UNREACHABLE and entry and entry['outcome'] == FETCH_SUCCESS:
+        return FetchResult(
+            robots_url,
+            FETCH_SUCCESS,
+            content=entry['body'],
+            status_code=entry['status_code'],
+            error=result.error or f"HTTP {result.status_code}",
+            redirects=entry['redirects'],
+            from_cache=True,
+            truncated=entry['truncated'],
+            stale=True
+        )
+    
+    if cache:
+        cache.put(result, etag, last_modified)
+    return result
+
+
+# Variants are raced once the original URL proved unreachable: each gets one
+# attempt with these (connect, read) timeouts, and all of them share one
+# deadline. The pool is shared by every caller, so concurrent audits can't
+# multiply the number of variant fetches in flight.
+FETCH_VARIANT_TIMEOUT = (3, 5)
+FETCH_VARIANT_DEADLINE = 8
+FETCH_VARIANT_WORKERS = 32
+
+_variant_executor = None
+
+
+def _get_variant_executor():
+    global _variant_executor
+    with _http_session_lock:
+        if _variant_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            
+            _variant_executor = ThreadPoolExecutor(FETCH_VARIANT_WORKERS, thread_name_prefix='crawlscope-variant')
+        return _variant_executor
+
+
+def url_variants(url):
+    """Return (label, base URL) pairs for the URL and its www/protocol alternatives"""
+    parsed_url = urlparse(url)
+    scheme = parsed_url.scheme
+    netloc = parsed_url.netloc
+    
+    if netloc.startswith('www.'):
+        www_netloc, www_label = netloc[4:], "Without WWW"
+    else:
+        www_netloc, www_label = f"www.{netloc}", "With WWW"
+    other_scheme = 'http' if scheme == 'https' else 'https'
+    protocol_label = f"{other_scheme.upper()} version"
+    
+    return [
+        ("Original URL", f"{scheme}://{netloc}"),
+        (www_label, f"{scheme}://{www_netloc}"),
+        (protocol_label, f"{other_scheme}://{netloc}"),
+        (f"{www_label}, {protocol_label}", f"{other_scheme}://{www_netloc}")
+    ]
+
+
+def fetch_robots_txt_with_fallbacks(url, deadline=FETCH_VARIANT_DEADLINE, session=None, cache=None, force=False):
+    """Fetch robots.txt, trying www/protocol variants only if the URL itself is unreachable
+    
+    A 4xx is a definitive "no robots.txt, allow all" for the host, so another
+    host's file never stands in for it. Once the original URL is unreachable,
+    the other variants are fetched concurrently, without retries, and the
+    first success wins. Whatever has not answered ``deadline`` seconds later
+    is abandoned: variants still queued are cancelled, and running ones end
+    within FETCH_VARIANT_TIMEOUT. ``force`` bypasses the robots cache as in
+    fetch_robots_txt.
+    """
+    from concurrent.futures import FIRST_COMPLETED, wait
+    
+    if session is None:
+        session = get_http_session()
+    if cache is None:
+        cache = get_robots_cache()
+    
+    (original_label, _), *variants = url_variants(url)
+    original = fetch_robots_txt(url, session, cache, force)
+    original.variant = original_label
+    if original.outcome != FETCH_UNREACHABLE:
+        return original
+    
+    executor = _get_variant_executor()
+    variant_session = get_http_session(retries=0)
+    pending = {
+        executor.submit(fetch_robots_txt, base_url, variant_session, cache, force, FETCH_VARIANT_TIMEOUT): label
+        for label, base_url in variants
+    }
+    end = time.monotonic() + deadline
+    try:
+        while pending:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                label = pending.pop(future)
+                result = future.result()
+                if result.outcome == FETCH_SUCCESS:
+                    result.variant = label
+                    return result
+                original.tried_variants.append(label)
+    finally:
+        for future in pending:
+            future.cancel()
+    return original
+
+
+def get_robots_txt_content(url, session=None, cache=None):
+    """Fetch robots.txt content from URL (None unless the fetch succeeded)"""
+    result = fetch_robots_txt(url, session, cache)
+    if result.outcome == FETCH_SUCCESS:
+        return result.robots_url, result.content
+    return result.robots_url, None
@@ -0,0 +1,341 @@
+"""Access-log analysis: which registry crawlers actually hit a site, and where
+
+Streams nginx/Apache combined-format logs (plain or gzipped), attributes each
+request to a crawler from the registry by its User-Agent, and checks the
+requested path against the site's robots.txt to flag crawlers that fetch
+disallowed URLs. Plain files are split into byte ranges and gzipped files are
+handed out whole, so several processes scan in parallel without shipping log
+lines between them.
+"""
+import gzip
+import os
+import time
+from array import array
+from collections import deque
+
+from .crawlers import as_crawler_index
+from .robots import RobustRobotsParser, url_match_path
+
+# Plain log files are split into ranges of this size, one task each
+LOG_RANGE_BYTES = 64 * 2**20
+# Bytes read at a time within a range or gzip stream
+LOG_BLOCK_BYTES = 4 * 2**20
+# Distinct User-Agent strings and (group, path) decisions remembered per process
+LOG_UA_CACHE_ENTRIES = 100000
+LOG_DECISION_CACHE_ENTRIES = 100000
+# Disallowed paths kept per crawler as examples
+LOG_SAMPLE_PATHS = 5
+
+
+class TokenAutomaton:
+    """Aho-Corasick automaton that finds the longest registry token in a string
+    
+    All tokens are matched in one pass over the text, however many there are.
+    Ties between tokens of the same length go to the lowest crawler ID.
+    """
+    
+    def __init__(self, tokens):
+        # Node 0 is the root; best[node] is the (length, -crawler_id) of the
+        # longest token ending at that node, following failure links
+        self.goto = [{}]
+        self.fail = [0]
+        self.best = [None]
+        for crawler_id, token in enumerate(tokens):
+            if not token:
+                continue
+            node = 0
+            for char in token:
+                child = self.goto[node].get(char)
+                if child is None:
+                    child = len(self.goto)
+                    self.goto[node][char] = child
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.best.append(None)
+                node = child
+            if self.best[node] is None:
+                self.best[node] = (len(token), -crawler_id)
+        
+        # Breadth-first, so a node's failure target is finished before the node
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[child] = target if target != child else 0
+                inherited = self.best[self.fail[child]]
+                if inherited is not None and (self.best[child] is None or inherited > self.best[child]):
+                    self.best[child] = inherited
+    
+    def longest(self, text):
+        """Crawler ID of the longest token occurring in text, or -1"""
+        goto = self.goto
+        fail = self.fail
+        best = self.best
+        node = 0
+        found = None
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            candidate = best[node]
+            if candidate is not None and (found is None or candidate > found):
+                found = candidate
+        return -found[1] if found is not None else -1
+
+
+class LogScanner:
+    """Classify log lines by crawler and check crawler requests against robots.txt"""
+    
+    def __init__(self, robots_content=None, crawlers=None):
+        self.index = index = as_crawler_index(crawlers)
+        self.automaton = TokenAutomaton(index.tokens)
+        self.ua_cache = {}
+        self.decision_cache = {}
+        # Compiled program per distinct robots.txt group, and each crawler's group
+        self.programs = None
+        if robots_content is not None:
+            parser = RobustRobotsParser(robots_content, '')
+            group_keys, self.columns = parser.group_columns(index.tokens)
+            self.programs = [parser.program(key) for key in group_keys]
+        self.reset()
+    
+    def reset(self):
+        """Start a new set of counts"""
+        self.lines = 0
+        self.unparsed = 0
+        self.size = 0
+        self.hits = array('Q', [0]) * len(self.index)
+        self.disallowed = array('Q', [0]) * len(self.index)
+        self.samples = {}
+    
+    def classify(self, user_agent):
+        """Crawler ID for a raw User-Agent header value, or -1 for non-crawlers"""
+        crawler_id = self.ua_cache.get(user_agent)
+        if crawler_id is None:
+            if len(self.ua_cache) >= LOG_UA_CACHE_ENTRIES:
+                self.ua_cache.clear()
+            crawler_id = self.automaton.longest(user_agent.decode('latin-1').lower())
+            self.ua_cache[user_agent] = crawler_id
+        return crawler_id
+    
+    def is_allowed(self, crawler_id, path):
+        """robots.txt verdict for a crawler fetching a raw request target"""
+        column = self.columns[crawler_id]
+        key = (column, path)
+        allowed = self.decision_cache.get(key)
+        if allowed is None:
+            program = self.programs[column]
+            target = url_match_path(path.decode('utf-8', 'replace'))
+            # RFC 9309: /robots.txt itself is always allowed
+            allowed = program is None or target == '/robots.txt' or program.decide(target) is not False
+            if len(self.decision_cache) >= LOG_DECISION_CACHE_ENTRIES:
+                self.decision_cache.clear()
+            self.decision_cache[key] = allowed
+        return allowed
+    
+    def scan(self, data):
+        """Count a block of complete log lines (bytes)"""
+        self.size += len(data)
+        hits = self.hits
+        classify = self.classify
+        lines = 0
+        unparsed = 0
+        for line in data.split(b'\n'):
+            if not line:
+                continue
+            lines += 1
+            # Combined format ends with "referer" "user agent"; read it from the right
+            ua_end = line.rfind(b'"')
+            ua_start = line.rfind(b'"', 0, ua_end)
+            if ua_start < 0 or line.rfind(b'"', 0, ua_start) < 0:
+                unparsed += 1
+                continue
+            crawler_id = classify(line[ua_start + 1:ua_end])
+            if crawler_id < 0:
+                continue
+            hits[crawler_id] += 1
+            if self.programs is not None:
+                # "METHOD target PROTOCOL" is the first quoted field
+                request_start = line.find(b'"') + 1
+                request = line[request_start:line.find(b'"', request_start)].split(b' ')
+                if len(request) >= 2 and not self.is_allowed(crawler_id, request[1]):
+                    self.disallowed[crawler_id] += 1
+                    paths = self.samples.setdefault(crawler_id, [])
+                    path = request[1].decode('utf-8', 'replace')
+                    if len(paths) < LOG_SAMPLE_PATHS and path not in paths:
+                        paths.append(path)
+        self.lines += lines
+        self.unparsed += unparsed
+    
+    def counts(self):
+        """The current counts as a picklable tuple, for LogReport.add"""
+        return self.lines, self.unparsed, self.size, self.hits, self.disallowed, self.samples
+
+
+class LogReport:
+    """Crawler hits and robots.txt violations across one or more access logs"""
+    
+    __slots__ = ('index', 'lines', 'unparsed', 'size', 'seconds', 'hits', 'disallowed', 'samples')
+    
+    def __init__(self, index):
+        self.index = index
+        self.lines = 0
+        self.unparsed = 0
+        # Uncompressed bytes of log text scanned
+        self.size = 0
+        self.seconds = 0.0
+        self.hits = array('Q', [0]) * len(index)
+        self.disallowed = array('Q', [0]) * len(index)
+        self.samples = {}
+    
+    def add(self, counts):
+        """Merge LogScanner.counts() from one range or file"""
+        lines, unparsed, size, hits, disallowed, samples = counts
+        self.lines += lines
+        self.unparsed += unparsed
+        self.size += size
+        for i, count in enumerate(hits):
+            self.hits[i] += count
+        for i, count in enumerate(disallowed):
+            self.disallowed[i] += count
+        for crawler_id, paths in samples.items():
+            kept = self.samples.setdefault(crawler_id, [])
+            kept.extend(path for path in paths if path not in kept)
+            del kept[LOG_SAMPLE_PATHS:]
+    
+    @property
+    def bot_hits(self):
+        return sum(self.hits)
+    
+    @property
+    def violations(self):
+        return sum(self.disallowed)
+    
+    @property
+    def throughput(self):
+        """Scanned megabytes per second"""
+        return self.size / 2**20 / self.seconds if self.seconds else None
+    
+    def records(self):
+        """Yield one row per crawler seen in the logs, most hits first"""
+        index = self.index
+        for i in sorted((i for i, count in enumerate(self.hits) if count), key=lambda i: -self.hits[i]):
+            yield {
+                'Category': index.category(i),
+                'Platform': index.platforms[i],
+                'User Agent': index.user_agents[i],
+                'Hits': self.hits[i],
+                'Disallowed Hits': self.disallowed[i],
+                'Violation Rate %': round(self.disallowed[i] / self.hits[i] * 100, 1),
+                'Sample Disallowed Paths': ' '.join(self.samples.get(i, []))
+            }
+    
+    __iter__ = records
+    
+    def violators(self):
+        """Rows for crawlers that fetched URLs robots.txt disallows them, worst first"""
+        return sorted((row for row in self.records() if row['Disallowed Hits']), key=lambda row: -row['Disallowed Hits'])
+    
+    def to_dataframe(self):
+        import pandas as pd
+        
+        return pd.DataFrame(list(self.records()))
+
+
+def _is_gzip(path):
+    with open(path, 'rb') as probe:
+        return probe.read(2) == b'\x1f\x8b'
+
+
+def log_ranges(paths, range_bytes=LOG_RANGE_BYTES):
+    """Split log files into (path, start, end) tasks; gzip files are one task each"""
+    for path in paths:
+        if _is_gzip(path):
+            yield path, None, None
+            continue
+        size = os.path.getsize(path)
+        for start in range(0, size, range_bytes):
+            yield path, start, min(start + range_bytes, size)
+
+
+def _iter_line_blocks(stream, end=None):
+    """Yield blocks of complete lines from the stream position up to end
+    
+    A range owns every line that starts before its end, so the line crossing
+    the end is read to completion here and skipped by the next range.
+    """
+    carry = b''
+    position = stream.tell() if end is not None else 0
+    while end is None or position < end:
+        block = stream.read(LOG_BLOCK_BYTES if end is None else min(LOG_BLOCK_BYTES, end - position))
+        if not block:
+            break
+        position += len(block)
+        if end is not None and position >= end and not block.endswith(b'\n'):
+            block += stream.readline()
+        data = carry + block
+        cut = data.rfind(b'\n') + 1
+        carry = data[cut:]
+        if cut:
+            yield data[:cut]
+    if carry:
+        yield carry
+
+
+# Per-process scanner, built once by the pool initializer
+_worker_scanner = None
+
+
+def _init_worker(robots_content, crawlers):
+    global _worker_scanner
+    _worker_scanner = LogScanner(robots_content, crawlers)
+
+
+def _scan_range(path, start, end):
+    scanner = _worker_scanner
+    scanner.reset()
+    if start is None:
+        with gzip.open(path, 'rb') as stream:
+            for block in _iter_line_blocks(stream):
+                scanner.scan(block)
+    else:
+        with open(path, 'rb') as stream:
+            if start:
+                # Skip the line that started in the previous range
+                stream.seek(start - 1)
+                stream.readline()
+            for block in _iter_line_blocks(stream, end):
+                scanner.scan(block)
+    return scanner.counts()
+
+
+def analyze_logs(paths, robots_content=None, crawlers=None, workers=None, range_bytes=LOG_RANGE_BYTES):
+    """Scan access logs for registry crawlers; with robots_content, also count disallowed hits
+    
+    Work is spread over ``workers`` processes (default: one per CPU); 1 scans
+    in this process.
+    """
+    index = as_crawler_index(crawlers)
+    workers = workers or os.cpu_count() or 1
+    report = LogReport(index)
+    tasks = list(log_ranges(paths, range_bytes))
+    start = time.perf_counter()
+    
+    if workers == 1 or len(tasks) == 1:
+        _init_worker(robots_content, index)
+        for task in tasks:
+            report.add(_scan_range(*task))
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(robots_content, index)) as pool:
+            for future in as_completed([pool.submit(_scan_range, *task) for task in tasks]):
+                report.add(future.result())
+    
+    report.seconds = time.perf_counter() - start
+    return report
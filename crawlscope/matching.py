@@ -0,0 +1,161 @@
+"""Wildcard matching engine for robots.txt path patterns
+
+robots.txt patterns only support '*' (any run of characters) and a trailing
+'$' (end of URL). Translating them into backtracking regexes makes patterns
+like '/*a*a*a*a*b' exponential on hostile input, so wildcard patterns are
+matched here with a greedy segment scan that never backtracks: each literal
+segment is located with str.find from where the previous one ended, which
+keeps the worst case at O(len(path) * len(pattern)).
+"""
+
+
+def wildcard_match(path, segments, anchored=False):
+    """Match a path against a pattern already split on '*'"""
+    # The first segment is a literal prefix
+    first = segments[0]
+    if not path.startswith(first):
+        return False
+    pos = len(first)
+    
+    # Leftmost placement of each middle segment is always safe for '*' globs
+    for segment in segments[1:-1]:
+        if not segment:
+            continue
+        index = path.find(segment, pos)
+        if index < 0:
+            return False
+        pos = index + len(segment)
+    
+    last = segments[-1]
+    if anchored:
+        # The last segment must end the path without overlapping earlier ones
+        return len(path) - len(last) >= pos and path.endswith(last)
+    return not last or path.find(last, pos) >= 0
+
+
+def compile_pattern(pattern):
+    """Compile a robots.txt path pattern into a matcher function"""
+    # A trailing '$' anchors the pattern to the end of the URL
+    anchored = pattern.endswith('$')
+    if anchored:
+        pattern = pattern[:-1]
+    
+    # Plain patterns only need a prefix or equality check
+    if '*' not in pattern:
+        if anchored:
+            return pattern.__eq__
+        return lambda path: path.startswith(pattern)
+    
+    segments = pattern.split('*')
+    return lambda path: wildcard_match(path, segments, anchored)
+
+
+# Groups with at least this many rules get a prefix trie instead of a flat scan
+INDEX_MIN_RULES = 64
+
+
+class RuleProgram:
+    """Compiled rules ordered by RFC 9309 precedence, first match decides"""
+    
+    def __init__(self, rules):
+        # The longest pattern wins and Allow wins ties
+        self.rules = sorted(
+            ((len(pattern), allowed, compile_pattern(pattern)) for pattern, allowed in rules),
+            key=lambda rule: (rule[0], rule[1]),
+            reverse=True
+        )
+    
+    def __len__(self):
+        return len(self.rules)
+    
+    def match(self, path):
+        """Return (priority, allowed) for the winning rule, or None"""
+        for priority, allowed, matches in self.rules:
+            if matches(path):
+                return priority, allowed
+        return None
+    
+    def decide(self, path):
+        """Return True/False for the winning rule, or None if nothing matched"""
+        result = self.match(path)
+        return None if result is None else result[1]
+
+
+class PrefixRuleIndex:
+    """Prefix trie for plain rules plus a small program for wildcard rules"""
+    
+    # Trie nodes are dicts keyed by character; these keys can't collide with one
+    _PREFIX = ''
+    _EXACT = None
+    
+    def __init__(self, rules):
+        self.root = {}
+        wildcard_rules = []
+        size = 0
+        
+        for pattern, allowed in rules:
+            anchored = pattern.endswith('$')
+            literal = pattern[:-1] if anchored else pattern
+            if '*' in literal:
+                wildcard_rules.append((pattern, allowed))
+                continue
+            
+            node = self.root
+            for char in literal:
+                node = node.setdefault(char, {})
+            key = self._EXACT if anchored else self._PREFIX
+            existing = node.get(key)
+            # Allow wins when the same pattern is both allowed and disallowed
+            node[key] = allowed if existing is None else (existing or allowed)
+            size += 1
+        
+        self.wildcards = RuleProgram(wildcard_rules)
+        self.size = size + len(self.wildcards)
+    
+    def __len__(self):
+        return self.size
+    
+    def _walk(self, path):
+        """Find the longest plain rule matching the path in one pass"""
+        best = None
+        node = self.root
+        depth = 0
+        while True:
+            allowed = node.get(self._PREFIX)
+            if allowed is not None:
+                best = (depth, allowed)
+            if depth == len(path):
+                # A '$' rule counts its anchor towards the pattern length
+                allowed = node.get(self._EXACT)
+                if allowed is not None:
+                    best = (depth + 1, allowed)
+                return best
+            node = node.get(path[depth])
+            if node is None:
+                return best
+            depth += 1
+    
+    def match(self, path):
+        """Return (priority, allowed) for the winning rule, or None"""
+        best = self._walk(path)
+        wildcard = self.wildcards.match(path) if self.wildcards.rules else None
+        if wildcard is None:
+            return best
+        if best is None:
+            return wildcard
+        # Longer pattern wins and Allow (True) wins ties
+        return max(best, wildcard)
+    
+    def decide(self, path):
+        """Return True/False for the winning rule, or None if nothing matched"""
+        result = self.match(path)
+        return None if result is None else result[1]
+
+
+def compile_rules(rules, index_min_rules=INDEX_MIN_RULES):
+    """Compile (pattern, allowed) pairs into a RuleProgram or PrefixRuleIndex"""
+    # Empty patterns never match anything
+    rules = [(pattern, allowed) for pattern, allowed in rules if pattern]
+    if index_min_rules is not None and len(rules) >= index_min_rules:
+        return PrefixRuleIndex(rules)
+    return RuleProgram(rules)
@@ -0,0 +1,122 @@
+"""Crawler x path access matrices"""
+from array import array
+
+from .crawlers import as_crawler_index
+from .robots import RobustRobotsParser, url_match_path
+
+# Paths the UI and CLI start from when none are given
+DEFAULT_MATRIX_PATHS = ['/', '/products/', '/blog/', '/api/']
+
+
+def normalize_paths(paths):
+    """Turn paths or full URLs into unique robots.txt match targets, keeping order"""
+    normalized = []
+    for path in paths:
+        if not path.strip():
+            continue
+        path = url_match_path(path)
+        if path not in normalized:
+            normalized.append(path)
+    return normalized
+
+
+class AccessMatrix:
+    """Crawler x path access, stored as one decision row per distinct rule group"""
+    
+    __slots__ = ('index', 'paths', 'group_of', 'decisions')
+    
+    def __init__(self, index, paths, group_of, decisions):
+        self.index = index
+        self.paths = paths
+        # Row of decisions that applies to each crawler
+        self.group_of = group_of
+        # One bytes object per distinct rule group, 1 where the path is allowed
+        self.decisions = decisions
+    
+    def __len__(self):
+        return len(self.index)
+    
+    def allowed(self, i, j):
+        return bool(self.decisions[self.group_of[i]][j])
+    
+    def row(self, i):
+        return [bool(decision) for decision in self.decisions[self.group_of[i]]]
+    
+    def category_stats(self):
+        """Per category and path: (allowed, total) counts, aggregated per rule group"""
+        index = self.index
+        # Crawlers of one category usually share a handful of groups, so count
+        # (category, group) pairs first and weight each group's decisions
+        pairs = {}
+        for code, group in zip(index.category_codes, self.group_of):
+            pairs[code, group] = pairs.get((code, group), 0) + 1
+        
+        allowed = {}
+        totals = {}
+        for (code, group), count in pairs.items():
+            path_allowed = allowed.setdefault(code, [0] * len(self.paths))
+            for j, decision in enumerate(self.decisions[group]):
+                path_allowed[j] += decision * count
+            totals[code] = totals.get(code, 0) + count
+        return {
+            category: (allowed[code], totals[code])
+            for code, category in enumerate(index.categories)
+            if code in totals
+        }
+    
+    def records(self):
+        """Yield one row per crawler with a True/False column per path"""
+        index = self.index
+        for i in range(len(index)):
+            row = {
+                'Category': index.category(i),
+                'Platform': index.platforms[i],
+                'User Agent': index.user_agents[i]
+            }
+            row.update(zip(self.paths, self.row(i)))
+            yield row
+    
+    __iter__ = records
+    
+    def to_dataframe(self):
+        """Crawler x path DataFrame of booleans, with the crawler columns first"""
+        import pandas as pd
+        
+        index = self.index
+        frame = pd.DataFrame({
+            'Category': pd.Categorical.from_codes(index.category_codes, index.categories),
+            'Platform': index.platforms,
+            'User Agent': index.user_agents
+        })
+        for j, path in enumerate(self.paths):
+            frame[path] = [bool(self.decisions[group][j]) for group in self.group_of]
+        return frame
+    
+    def heatmap_frame(self):
+        """Long-form Category/Path/Allowed/Total/Block Rate % rows for a heatmap"""
+        import pandas as pd
+        
+        rows = []
+        for category, (allowed, total) in self.category_stats().items():
+            for path, path_allowed in zip(self.paths, allowed):
+                rows.append({
+                    'Category': category,
+                    'Path': path,
+                    'Allowed': path_allowed,
+                    'Total': total,
+                    'Block Rate %': round((total - path_allowed) / total * 100, 1)
+                })
+        return pd.DataFrame(rows)
+
+
+def check_access_matrix(robots_content, base_url, paths, crawlers=None, parser=None, document=None):
+    """Evaluate every crawler against every path, once per distinct rule group"""
+    index = as_crawler_index(crawlers)
+    paths = normalize_paths(paths)
+    if parser is None:
+        parser = RobustRobotsParser(robots_content, base_url, document=document)
+    
+    # Crawlers resolve to a few groups; each group x path pair is decided once
+    group_keys, columns = parser.group_columns(index.tokens)
+    decisions = [bytes(parser.evaluate_group(group_key, path)[0] for path in paths) for group_key in group_keys]
+    return AccessMatrix(index, paths, array('H', columns), decisions)
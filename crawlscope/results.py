@@ -0,0 +1,159 @@
+"""Columnar crawler access results
+
+A result holds one access bit and one crawl delay per crawler, in registry
+order. Category, platform and user agent strings live once in a shared
+CrawlerIndex, and status strings are only produced at display/export time.
+"""
+import json
+import math
+import struct
+from array import array
+
+from .crawlers import get_crawler_index
+
+
+def format_access(can_access):
+    return '✅ Allowed' if can_access else '❌ Blocked'
+
+
+def format_delay(crawl_delay):
+    return f"{crawl_delay}s" if crawl_delay else "None"
+
+
+# Serialized layout: crawler count, has-delays flag, access bitset, optional
+# float64 delays, then JSON-encoded errors. Arrays use native byte order, which
+# is fine for the machine-local result store.
+_HEADER = struct.Struct('<I?')
+
+
+class AccessResults:
+    """Access bitset and crawl delays for every crawler in a CrawlerIndex"""
+    
+    __slots__ = ('index', 'bits', 'delays', 'errors')
+    
+    def __init__(self, index, bits=None, delays=None, errors=None):
+        self.index = index
+        # Bit i is set when crawler i may access the site
+        self.bits = bits if bits is not None else bytearray((len(index) + 7) // 8)
+        # NaN means no crawl delay; None when no crawler has one (the common case)
+        self.delays = delays
+        # Evaluation errors by crawler position (sparse)
+        self.errors = errors
+    
+    def __len__(self):
+        return len(self.index)
+    
+    def set(self, i, can_access, crawl_delay=None):
+        if can_access:
+            self.bits[i >> 3] |= 1 << (i & 7)
+        if crawl_delay is not None:
+            if self.delays is None:
+                self.delays = array('d', [math.nan]) * len(self.index)
+            self.delays[i] = crawl_delay
+    
+    def set_error(self, i, message):
+        if self.errors is None:
+            self.errors = {}
+        self.errors[i] = message
+    
+    def can_access(self, i):
+        return bool(self.bits[i >> 3] >> (i & 7) & 1)
+    
+    def crawl_delay(self, i):
+        if self.delays is None or math.isnan(self.delays[i]):
+            return None
+        return self.delays[i]
+    
+    @property
+    def allowed(self):
+        """Number of crawlers allowed"""
+        return bin(int.from_bytes(self.bits, 'little')).count('1')
+    
+    def category_stats(self):
+        """Total/Allowed/Blocked/Block Rate % per category, in one pass over the bitset"""
+        index = self.index
+        totals = [0] * len(index.categories)
+        allowed = [0] * len(index.categories)
+        for i, code in enumerate(index.category_codes):
+            totals[code] += 1
+            if self.bits[i >> 3] >> (i & 7) & 1:
+                allowed[code] += 1
+        stats = {}
+        for code, category in enumerate(index.categories):
+            if totals[code]:
+                stats[category] = {
+                    'Total': totals[code],
+                    'Allowed': allowed[code],
+                    'Blocked': totals[code] - allowed[code],
+                    'Block Rate %': round((totals[code] - allowed[code]) / totals[code] * 100, 1)
+                }
+        return stats
+    
+    def records(self):
+        """Yield one display row per crawler, formatting statuses on the fly"""
+        index = self.index
+        errors = self.errors or {}
+        for i in range(len(index)):
+            row = {
+                'Category': index.category(i),
+                'Platform': index.platforms[i],
+                'User Agent': index.user_agents[i]
+            }
+            if i in errors:
+                row['Access Status'] = f'⚠️ Error: {errors[i]}'
+                row['Crawl Delay'] = "N/A"
+                row['Can Access'] = False
+            else:
+                can_access = self.can_access(i)
+                row['Access Status'] = format_access(can_access)
+                row['Crawl Delay'] = format_delay(self.crawl_delay(i))
+                row['Can Access'] = can_access
+            yield row
+    
+    __iter__ = records
+    
+    def to_dataframe(self):
+        """Display DataFrame with the same columns as the records"""
+        import pandas as pd
+        
+        if self.errors:
+            return pd.DataFrame(list(self.records()))
+        index = self.index
+        access = [self.can_access(i) for i in range(len(index))]
+        return pd.DataFrame({
+            'Category': pd.Categorical.from_codes(index.category_codes, index.categories),
+            'Platform': index.platforms,
+            'User Agent': index.user_agents,
+            'Access Status': [format_access(can_access) for can_access in access],
+            'Crawl Delay': [format_delay(self.crawl_delay(i)) for i in range(len(index))],
+            'Can Access': access
+        })
+    
+    def to_bytes(self):
+        data = bytearray(_HEADER.pack(len(self.index), self.delays is not None))
+        data += self.bits
+        if self.delays is not None:
+            data += self.delays.tobytes()
+        if self.errors:
+            data += json.dumps(self.errors).encode('utf-8')
+        return bytes(data)
+    
+    @classmethod
+    def from_bytes(cls, data, index=None):
+        if index is None:
+            index = get_crawler_index()
+        count, has_delays = _HEADER.unpack_from(data)
+        if count != len(index):
+            raise ValueError(f"result has {count} crawlers, index has {len(index)}")
+        offset = _HEADER.size
+        bits = bytearray(data[offset:offset + (count + 7) // 8])
+        offset += len(bits)
+        delays = None
+        if has_delays:
+            delays = array('d')
+            delays.frombytes(data[offset:offset + count * delays.itemsize])
+            offset += count * delays.itemsize
+        errors = None
+        if offset < len(data):
+            errors = {int(i): message for i, message in json.loads(data[offset:]).items()}
+        return cls(index, bits, delays, errors)
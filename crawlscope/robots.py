@@ -0,0 +1,210 @@
+"""robots.txt parsing into compiled, per-group rule programs"""
+from .matching import INDEX_MIN_RULES, compile_rules
+
+
+def normalize_user_agent(user_agent):
+    """Normalize user agent for matching"""
+    return user_agent.lower().strip()
+
+
+def url_match_path(url):
+    """The part of a URL that robots.txt rules match: path and query, without the fragment"""
+    url = url.strip()
+    scheme_end = url.find('://')
+    if scheme_end >= 0:
+        # Skip the authority; the path starts at the first '/', '?' or '#' after it
+        start = scheme_end + 3
+        end = len(url)
+        for delimiter in '/?#':
+            index = url.find(delimiter, start)
+            if 0 <= index < end:
+                end = index
+        url = url[end:]
+    fragment = url.find('#')
+    if fragment >= 0:
+        url = url[:fragment]
+    if not url.startswith('/'):
+        url = '/' + url
+    return url
+
+
+# Directives the parser and the insights understand
+ROBOTS_DIRECTIVES = ('user-agent', 'disallow', 'allow', 'crawl-delay', 'sitemap')
+
+
+class RobotsDocument:
+    """robots.txt tokenized in one pass: directives with line numbers, groups, sitemaps and counts"""
+    
+    def __init__(self, robots_content):
+        # Length of the source text; zero means there was no robots.txt content
+        self.size = len(robots_content)
+        # (line number, lowercased field, value) for every "field: value" line
+        self.directives = []
+        # Rule groups by user agent, as the parser consumes them
+        self.groups = {}
+        self.sitemaps = []
+        self.counts = {}
+        # Disallow or User-agent lines using '*'
+        self.has_wildcards = False
+        self._tokenize(robots_content)
+    
+    def _tokenize(self, robots_content):
+        current_user_agents = []
+        
+        # A leading byte order mark would otherwise stick to the first field name
+        for line_number, line in enumerate(robots_content.lstrip('\ufeff').split('\n'), 1):
+            line = line.strip()
+            
+            # Skip empty lines and comments
+            if not line or line.startswith('#'):
+                continue
+            
+            field, colon, value = line.partition(':')
+            if not colon:
+                continue
+            field = field.lower()
+            value = value.strip()
+            self.directives.append((line_number, field, value))
+            self.counts[field] = self.counts.get(field, 0) + 1
+            
+            # Handle User-agent directive
+            if field == 'user-agent':
+                if '*' in value:
+                    self.has_wildcards = True
+                if value:
+                    current_user_agents = [value]
+                    if value not in self.groups:
+                        self.groups[value] = {
+                            'disallows': [],
+                            'allows': [],
+                            'crawl_delay': None,
+                            'line': line_number
+                        }
+            
+            # Handle Disallow directive
+            elif field == 'disallow':
+                if '*' in value:
+                    self.has_wildcards = True
+                for ua in current_user_agents:
+                    self.groups[ua]['disallows'].append(value)
+            
+            # Handle Allow directive
+            elif field == 'allow':
+                for ua in current_user_agents:
+                    self.groups[ua]['allows'].append(value)
+            
+            # Handle Crawl-delay directive
+            elif field == 'crawl-delay' and current_user_agents:
+                try:
+                    delay = float(value)
+                    for ua in current_user_agents:
+                        self.groups[ua]['crawl_delay'] = delay
+                except ValueError:
+                    pass
+            
+            elif field == 'sitemap':
+                self.sitemaps.append(value)
+    
+    def directive_count(self, fields=ROBOTS_DIRECTIVES):
+        """Number of directive lines with one of the given fields"""
+        return sum(self.counts.get(field, 0) for field in fields)
+
+
+class RobustRobotsParser:
+    """Custom robots.txt parser that handles malformed files properly"""
+    
+    def __init__(self, robots_content, base_url, index_min_rules=INDEX_MIN_RULES, document=None):
+        self.robots_content = robots_content
+        self.base_url = base_url
+        # Groups with this many rules get a prefix trie (None disables it)
+        self.index_min_rules = index_min_rules
+        # Reuse a document that was already tokenized for this content
+        self.document = document if document is not None else RobotsDocument(robots_content)
+        self.rules = self._parse_robots()
+    
+    def _parse_robots(self):
+        """Compile the document's rule groups into structured rules"""
+        # Compile each group's rules once so every lookup reuses them
+        rules = {}
+        for user_agent, group in self.document.groups.items():
+            rules[user_agent] = dict(group, program=self._compile_group(group))
+        
+        # Index group keys by normalized user agent so lookups don't scan every group
+        self.agent_index = {}
+        for rule_ua in rules:
+            self.agent_index.setdefault(self._normalize_user_agent(rule_ua), rule_ua)
+        self.default_group = '*' if '*' in rules else None
+        
+        return rules
+    
+    def _normalize_user_agent(self, user_agent):
+        """Normalize user agent for matching"""
+        return normalize_user_agent(user_agent)
+    
+    def _compile_group(self, group):
+        """Compile a group's allow/disallow lines into a reusable rule program"""
+        rules = [(pattern, True) for pattern in group['allows']]
+        rules.extend((pattern, False) for pattern in group['disallows'])
+        return compile_rules(rules, self.index_min_rules)
+    
+    def resolve_group(self, user_agent):
+        """Return the key of the rule group that applies to a user agent, or None"""
+        if not user_agent:
+            return None
+        return self.resolve_token(self._normalize_user_agent(user_agent))
+    
+    def resolve_token(self, token):
+        """resolve_group for a user agent that is already normalized"""
+        if not token:
+            return None
+        return self.agent_index.get(token, self.default_group)
+    
+    def group_columns(self, tokens):
+        """Distinct group keys for normalized user agents, and each one's position among them
+        
+        Returns (group_keys, columns): the keys in first-seen order (None where
+        no group applies) and, for every token, the index of its key. Crawlers
+        mostly share a few groups, so callers decide once per group.
+        """
+        agent_index = self.agent_index
+        default_group = self.default_group
+        positions = {}
+        columns = []
+        for token in tokens:
+            # resolve_token, inlined: this runs once per registry crawler
+            group_key = agent_index.get(token, default_group) if token else None
+            column = positions.get(group_key)
+            if column is None:
+                column = positions[group_key] = len(positions)
+            columns.append(column)
+        return list(positions), columns
+    
+    def program(self, group_key):
+        """Compiled rule program of a group, or None when no group applies (allow all)"""
+        return self.rules[group_key]['program'] if group_key is not None else None
+    
+    def evaluate_group(self, group_key, path="/"):
+        """Return (can_access, crawl_delay) for a rule group and path"""
+        # If no rules found, default to allow
+        if group_key is None:
+            return True, None
+        
+        group = self.rules[group_key]
+        # Longest match wins; if no specific rule matches, allow by default
+        allowed = group['program'].decide(path)
+        return (True if allowed is None else allowed), group['crawl_delay']
+    
+    def can_fetch(self, user_agent, path="/"):
+        """Check if a user agent can fetch the given path"""
+        return self.evaluate_group(self.resolve_group(user_agent), path)[0]
+    
+    def crawl_delay(self, user_agent):
+        """Get crawl delay for a user agent"""
+        return self.evaluate_group(self.resolve_group(user_agent))[1]
+
+
+def normalize_robots_content(robots_content):
+    """Normalize robots.txt content so equivalent files hash identically"""
+    # Blank lines, comment lines, indentation and line endings don't affect parsing
+    lines = (line.strip() for line in robots_content.lstrip('\ufeff').split('\n'))
+    return '\n'.join(line for line in lines if line and not line.startswith('#'))
@@ -0,0 +1,279 @@
+"""Sitemap discovery and a URL-level cross-check against robots.txt
+
+Follows the sitemaps a robots.txt declares, including sitemap indexes and
+gzipped (.xml.gz) files, and checks every listed URL against the robots.txt
+rules. Sitemaps are fetched concurrently and streamed through an incremental
+XML parser that keeps nothing but the current entry's <loc>, so a site with
+hundreds of 50,000-URL shards is processed in bounded memory.
+"""
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from urllib.parse import urljoin, urlparse
+from xml.etree.ElementTree import ParseError, XMLParser
+
+from .fetch import FETCH_ACCEPT_ENCODING, BoundedBody, get_following_redirects, get_http_session, inflate_pieces
+from .urlcheck import UrlChecker
+
+# sitemaps.org limits: 50,000 URLs and 50 MB uncompressed per file
+SITEMAP_MAX_BYTES = 50 * 2**20
+SITEMAP_MAX_URLS = 50000
+# Longest <loc> kept; the protocol caps URLs at 2,048 characters
+SITEMAP_MAX_LOC = 4096
+# Sitemap files fetched per audit, across all indexes
+SITEMAP_MAX_FILES = 1000
+# Indexes may not nest per the protocol; tolerate a little nesting anyway
+SITEMAP_MAX_DEPTH = 3
+SITEMAP_MAX_WORKERS = 8
+# Blocked URLs kept as examples; all of them are only seen through on_url
+SITEMAP_BLOCKED_SAMPLE = 1000
+
+# User agents every listed URL is checked for
+DEFAULT_SITEMAP_USER_AGENTS = ['*', 'Googlebot', 'Bingbot']
+
+
+def _local_name(tag):
+    """Element name without its '{namespace}' prefix"""
+    return tag.rpartition('}')[2]
+
+
+def iter_sitemap_bytes(chunks, max_bytes=SITEMAP_MAX_BYTES):
+    """Inflate a gzipped sitemap body (.xml.gz) on the fly, raising ValueError past max_bytes
+    
+    Transfer encodings are already undone by BoundedBody; this handles files
+    that are themselves gzip, detected by their magic bytes.
+    """
+    decompressor = None
+    first = True
+    size = 0
+    for data in chunks:
+        if first and data:
+            first = False
+            if data.startswith(b'\x1f\x8b'):
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        for chunk in (data,) if decompressor is None else inflate_pieces(decompressor, data):
+            size += len(chunk)
+            if size > max_bytes:
+                raise ValueError(f"Larger than {max_bytes // 2**20} MiB uncompressed; the rest was skipped")
+            yield chunk
+
+
+class _SitemapTarget:
+    """XMLParser target that keeps nothing but the <loc> of the current entry
+    
+    No tree is built, so neither huge text nodes nor millions of entries
+    accumulate; a <loc> longer than SITEMAP_MAX_LOC is cut short.
+    """
+    
+    def __init__(self):
+        # ('url' | 'sitemap', loc) pairs completed since the last drain
+        self.entries = []
+        self.entry = None
+        self.loc = None
+        self.loc_size = 0
+    
+    def start(self, tag, attrib):
+        name = _local_name(tag)
+        if name in ('url', 'sitemap'):
+            self.entry = name
+        elif name == 'loc' and self.entry is not None:
+            self.loc = []
+            self.loc_size = 0
+    
+    def data(self, text):
+        if self.loc is not None and self.loc_size < SITEMAP_MAX_LOC:
+            text = text[:SITEMAP_MAX_LOC - self.loc_size]
+            self.loc.append(text)
+            self.loc_size += len(text)
+    
+    def end(self, tag):
+        name = _local_name(tag)
+        if name == 'loc' and self.loc is not None:
+            loc = ''.join(self.loc).strip()
+            self.loc = None
+            if loc and self.entry is not None:
+                self.entries.append((self.entry, loc))
+        elif name == self.entry:
+            self.entry = None
+    
+    def close(self):
+        pass
+
+
+def iter_sitemap_entries(chunks):
+    """Yield ('url' | 'sitemap', loc) for each entry of a urlset or sitemapindex
+    
+    Raises xml.etree.ElementTree.ParseError for malformed XML.
+    """
+    target = _SitemapTarget()
+    parser = XMLParser(target=target)
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from target.entries
+        target.entries.clear()
+    parser.close()
+    yield from target.entries
+
+
+@dataclass
+class SitemapAudit:
+    """Outcome of following a site's sitemaps and checking their URLs"""
+    user_agents: list
+    # One row per sitemap file: URL, Type, URLs, Blocked, Status, Error
+    sitemaps: list = field(default_factory=list)
+    urls: int = 0
+    # URLs on other hosts, which this robots.txt does not govern
+    off_host: int = 0
+    blocked: dict = field(default_factory=dict)
+    # (sitemap URL, URL, blocked user agents) for the first blocked URLs
+    blocked_samples: list = field(default_factory=list)
+    # Sitemaps left unfetched because of the file count or nesting limits
+    skipped: int = 0
+    
+    @property
+    def blocked_urls(self):
+        """URLs blocked for at least one of the user agents"""
+        return sum(row['Blocked'] for row in self.sitemaps)
+
+
+def _check_sitemap(sitemap_url, checker, host, session, on_url, lock):
+    """Fetch and parse one sitemap; return its summary row, blocked counts, samples and child sitemaps"""
+    row = {'Sitemap': sitemap_url, 'Type': None, 'URLs': 0, 'Off-host': 0, 'Blocked': 0, 'Status': None, 'Error': None}
+    blocked = [0] * len(checker.user_agents)
+    samples = []
+    children = []
+    try:
+        response, _ = get_following_redirects(session, sitemap_url, {'Accept-Encoding': FETCH_ACCEPT_ENCODING})
+    except Exception as e:
+        row['Error'] = str(e)
+        return row, blocked, samples, children
+    body = None
+    try:
+        row['Status'] = response.status_code
+        if response.status_code != 200:
+            row['Error'] = f"HTTP {response.status_code}"
+            return row, blocked, samples, children
+        body = BoundedBody(response, SITEMAP_MAX_BYTES, SITEMAP_MAX_BYTES)
+        for kind, loc in iter_sitemap_entries(iter_sitemap_bytes(body)):
+            if kind == 'sitemap':
+                row['Type'] = 'index'
+                children.append(loc)
+                continue
+            row['Type'] = 'urlset'
+            if row['URLs'] + row['Off-host'] >= SITEMAP_MAX_URLS:
+                row['Error'] = f"More than {SITEMAP_MAX_URLS} URLs; the rest were skipped"
+                break
+            if (urlparse(loc).hostname or '').lower() != host:
+                row['Off-host'] += 1
+                continue
+            verdicts = checker.check(loc)
+            row['URLs'] += 1
+            if not all(verdicts):
+                row['Blocked'] += 1
+                for i, allowed in enumerate(verdicts):
+                    if not allowed:
+                        blocked[i] += 1
+                if len(samples) < SITEMAP_BLOCKED_SAMPLE:
+                    samples.append((sitemap_url, loc, [
+                        user_agent for user_agent, allowed in zip(checker.user_agents, verdicts) if not allowed
+                    ]))
+            if on_url is not None:
+                with lock:
+                    on_url(sitemap_url, loc, verdicts)
+    except ParseError as e:
+        # A body cut off at the size limit ends mid-document
+        if body is not None and body.truncated:
+            row['Error'] = f"Larger than {SITEMAP_MAX_BYTES // 2**20} MiB; the rest was skipped"
+        else:
+            row['Error'] = f"Invalid XML: {e}"
+    except Exception as e:
+        row['Error'] = str(e)
+    finally:
+        response.close()
+    return row, blocked, samples, children
+
+
+def audit_sitemaps(robots_url, robots_content, sitemap_urls, user_agents=None, session=None,
+                   max_workers=SITEMAP_MAX_WORKERS, max_files=SITEMAP_MAX_FILES, on_url=None):
+    """Follow sitemaps and sitemap indexes, checking every listed URL against robots.txt
+    
+    ``sitemap_urls`` are usually RobotsDocument.sitemaps. Only URLs on the
+    robots.txt host are checked. ``on_url(sitemap_url, url, verdicts)`` is
+    called for every checked URL, one call at a time, for streaming exports.
+    """
+    checker = UrlChecker(robots_content, list(user_agents or DEFAULT_SITEMAP_USER_AGENTS))
+    host = (urlparse(robots_url).hostname or '').lower()
+    session = session or get_http_session()
+    audit = SitemapAudit(user_agents=checker.user_agents)
+    blocked = [0] * len(checker.user_agents)
+    lock = threading.Lock()
+    
+    seen = set()
+    queue = deque()
+    for url in sitemap_urls:
+        # Sitemap lines should be absolute, but resolve relative ones leniently
+        url = urljoin(robots_url, url)
+        if url not in seen:
+            seen.add(url)
+            queue.append((url, 0))
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = {}
+        
+        def submit_queued():
+            # Keep at most max_workers fetches queued so indexes don't pile up futures
+            while queue and len(pending) < max_workers:
+                if len(audit.sitemaps) + len(pending) >= max_files:
+                    audit.skipped += len(queue)
+                    queue.clear()
+                    return
+                url, depth = queue.popleft()
+                future = pool.submit(_check_sitemap, url, checker, host, session, on_url, lock)
+                pending[future] = depth
+        
+        submit_queued()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                depth = pending.pop(future)
+                row, sitemap_blocked, samples, children = future.result()
+                audit.sitemaps.append(row)
+                audit.urls += row['URLs']
+                audit.off_host += row['Off-host']
+                for i, count in enumerate(sitemap_blocked):
+                    blocked[i] += count
+                audit.blocked_samples.extend(samples[:SITEMAP_BLOCKED_SAMPLE - len(audit.blocked_samples)])
+                for child in children:
+                    if depth + 1 > SITEMAP_MAX_DEPTH:
+                        audit.skipped += 1
+                    elif child not in seen:
+                        seen.add(child)
+                        queue.append((child, depth + 1))
+            submit_queued()
+    
+    audit.blocked = dict(zip(checker.user_agents, blocked))
+    return audit
+
+
+def sitemap_insights(audit):
+    """Actionable findings from a sitemap audit, in the style of generate_insights"""
+    insights = []
+    if audit.blocked_urls:
+        agents = ', '.join(f"{user_agent} ({count})" for user_agent, count in audit.blocked.items() if count)
+        insights.append(
+            f"🚨 **Sitemap URLs Blocked**: {audit.blocked_urls} of {audit.urls} URLs listed in your sitemaps "
+            f"are disallowed by robots.txt for {agents} - unblock them or drop them from the sitemap"
+        )
+    elif audit.urls:
+        insights.append(f"✅ **Sitemap Consistent**: All {audit.urls} sitemap URLs are crawlable")
+    
+    failed = [row for row in audit.sitemaps if row['Error']]
+    if failed:
+        insights.append(f"⚠️ **Sitemap Errors**: {len(failed)} of {len(audit.sitemaps)} sitemaps could not be read completely")
+    if audit.off_host:
+        insights.append(f"💡 **Other Hosts**: {audit.off_host} sitemap URLs point to other hosts, whose own robots.txt applies")
+    if audit.skipped:
+        insights.append(f"💡 **Partial Audit**: {audit.skipped} sitemaps were not fetched because of the audit limits")
+    return insights
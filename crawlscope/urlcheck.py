@@ -0,0 +1,185 @@
+"""Check large URL lists against one robots.txt
+
+URLs are streamed from plain text or CSV files (optionally gzipped), checked
+in batches across worker processes and written out as one verdict row per URL
+in input order. Only a bounded number of batches is in flight at any time, so
+memory stays flat however long the list is.
+"""
+import csv
+import gzip
+import io
+import itertools
+import json
+import os
+import sys
+import time
+from collections import deque
+
+from .robots import RobustRobotsParser, normalize_user_agent, url_match_path
+
+# User agents checked when none are given
+DEFAULT_URLCHECK_USER_AGENTS = ['Googlebot', 'Bingbot', 'GPTBot', 'ClaudeBot', 'CCBot', 'PerplexityBot']
+
+# URLs per batch sent to a worker, and batches queued per worker
+URLCHECK_BATCH_SIZE = 5000
+URLCHECK_PENDING_PER_WORKER = 2
+
+# CSV header names (lowercased) recognised as the URL column, e.g. crawler exports
+URL_COLUMNS = ('url', 'address', 'loc', 'uri', 'page')
+
+
+def open_text(path):
+    """Open a text file for reading, transparently decompressing gzip ('-' for stdin)"""
+    if path == '-':
+        return sys.stdin
+    with open(path, 'rb') as probe:
+        gzipped = probe.read(2) == b'\x1f\x8b'
+    if gzipped:
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace', newline='')
+    return open(path, encoding='utf-8', errors='replace', newline='')
+
+
+def iter_urls(path):
+    """Yield URLs from a text file (one per line) or a CSV file with a URL column"""
+    stream = open_text(path)
+    try:
+        name = path[:-3] if path.endswith('.gz') else path
+        if name.endswith('.csv'):
+            reader = csv.reader(stream)
+            header = next(reader, None)
+            if header is None:
+                return
+            lowered = [title.strip().lower() for title in header]
+            column = next((lowered.index(title) for title in URL_COLUMNS if title in lowered), None)
+            if column is None:
+                # No header row: the first column holds the URLs
+                column = 0
+                reader = itertools.chain([header], reader)
+            for row in reader:
+                if len(row) > column and row[column].strip():
+                    yield row[column].strip()
+        else:
+            for line in stream:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    yield line
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+class UrlChecker:
+    """Per-URL verdicts for a fixed list of user agents
+    
+    User agents that resolve to the same robots.txt group share one decision,
+    so each URL costs one rule-program lookup per distinct group.
+    """
+    
+    def __init__(self, robots_content, user_agents):
+        parser = RobustRobotsParser(robots_content, '')
+        self.user_agents = list(user_agents)
+        # Position in programs for each user agent
+        group_keys, self.columns = parser.group_columns(normalize_user_agent(user_agent) for user_agent in self.user_agents)
+        # Compiled program per distinct group; None means no rules apply (allow)
+        self.programs = [parser.program(key) for key in group_keys]
+    
+    def check(self, url):
+        """Return one True (allowed) / False (blocked) per user agent"""
+        path = url_match_path(url)
+        # Nothing matching means allowed, so only an explicit False blocks
+        decisions = [program is None or program.decide(path) is not False for program in self.programs]
+        return [decisions[column] for column in self.columns]
+    
+    def check_batch(self, urls, output_format='csv'):
+        """Check a batch; return (formatted verdict rows, blocked count per user agent)"""
+        blocked = [0] * len(self.user_agents)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for url in urls:
+            verdicts = self.check(url)
+            if output_format == 'jsonl':
+                row = {'URL': url}
+                row.update(zip(self.user_agents, verdicts))
+                buffer.write(json.dumps(row) + '\n')
+            else:
+                writer.writerow([url, *verdicts])
+            for i, allowed in enumerate(verdicts):
+                if not allowed:
+                    blocked[i] += 1
+        return buffer.getvalue(), blocked
+
+
+# Per-process checker, built once by the pool initializer
+_worker_checker = None
+
+
+def _init_worker(robots_content, user_agents):
+    global _worker_checker
+    _worker_checker = UrlChecker(robots_content, user_agents)
+
+
+def _check_batch(urls, output_format):
+    return _worker_checker.check_batch(urls, output_format)
+
+
+def _batches(urls, batch_size):
+    batch = []
+    for url in urls:
+        batch.append(url)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def check_urls(urls, robots_content, output, user_agents=None, output_format='csv',
+               workers=None, batch_size=URLCHECK_BATCH_SIZE):
+    """Write a verdict row per URL to a text stream and return summary counts
+    
+    With more than one worker, batches are checked in a process pool while
+    the next ones are read; results are written in input order.
+    """
+    user_agents = list(user_agents or DEFAULT_URLCHECK_USER_AGENTS)
+    workers = workers or os.cpu_count() or 1
+    if output_format == 'csv':
+        csv.writer(output).writerow(['URL', *user_agents])
+    
+    checked = 0
+    blocked = [0] * len(user_agents)
+    start = time.perf_counter()
+    
+    def write(result, size):
+        nonlocal checked
+        text, batch_blocked = result
+        output.write(text)
+        checked += size
+        for i, count in enumerate(batch_blocked):
+            blocked[i] += count
+    
+    if workers == 1:
+        checker = UrlChecker(robots_content, user_agents)
+        for batch in _batches(urls, batch_size):
+            write(checker.check_batch(batch, output_format), len(batch))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(robots_content, user_agents)) as pool:
+            pending = deque()
+            for batch in _batches(urls, batch_size):
+                pending.append((pool.submit(_check_batch, batch, output_format), len(batch)))
+                # Bound the batches held in memory; write the oldest first to keep order
+                if len(pending) >= workers * URLCHECK_PENDING_PER_WORKER:
+                    future, size = pending.popleft()
+                    write(future.result(), size)
+            while pending:
+                future, size = pending.popleft()
+                write(future.result(), size)
+    
+    seconds = time.perf_counter() - start
+    return {
+        'URLs': checked,
+        'Seconds': round(seconds, 3),
+        'URLs/s': round(checked / seconds) if seconds else None,
+        'Blocked': dict(zip(user_agents, blocked))
+    }
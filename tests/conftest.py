@@ -0,0 +1,73 @@
+import http.server
+import socket
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def robots_server():
+    """Start local servers; each answers with its queued (status, headers, body) responses in order
+
+    ``delay`` seconds pass before each answer.
+    """
+    servers = []
+
+    def start(delay=0):
+        responses = []
+        hits = []
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                hits.append(self.path)
+                time.sleep(delay)
+                status, headers, body = responses.pop(0) if len(responses) > 1 else responses[0]
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        servers.append(httpd)
+        return f"http://127.0.0.1:{httpd.server_address[1]}", responses, hits
+
+    yield start
+    for httpd in servers:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+@pytest.fixture
+def hanging_server():
+    """Start local servers that accept connections and never answer"""
+    listeners = []
+
+    def start():
+        listener = socket.create_server(('127.0.0.1', 0), backlog=16)
+        connections = []
+
+        def accept():
+            while True:
+                try:
+                    connections.append(listener.accept()[0])
+                except OSError:
+                    return
+
+        threading.Thread(target=accept, daemon=True).start()
+        listeners.append((listener, connections))
+        return f"http://127.0.0.1:{listener.getsockname()[1]}"
+
+    yield start
+    for listener, connections in listeners:
+        listener.close()
+        for connection in connections:
+            connection.close()
@@ -0,0 +1,53 @@
+"""Bulk audits against local servers: host limits, streaming and error rows"""
+import threading
+from urllib.parse import urlparse
+
+from crawlscope import bulk
+from crawlscope.bulk import run_bulk_audit
+from crawlscope.cache import ResultStore
+
+ROBOTS = b"User-agent: *\nDisallow: /private\n"
+
+
+def test_bulk_audit_streams_rows_within_the_host_limits(robots_server, monkeypatch):
+    slow_url, slow, _ = robots_server(delay=0.8)
+    fast_url, fast, fast_hits = robots_server(delay=0.05)
+    missing_url, missing, _ = robots_server()
+    slow.append((200, {}, ROBOTS))
+    fast.append((200, {}, ROBOTS))
+    missing.append((404, {}, b'not found'))
+
+    # Count fetches in flight per host around the real fetch
+    lock = threading.Lock()
+    active = {}
+    peaks = {}
+    fetch_robots_txt = bulk.fetch_robots_txt
+
+    def counting_fetch(url, *args, **kwargs):
+        host = urlparse(url).netloc
+        with lock:
+            active[host] = active.get(host, 0) + 1
+            peaks[host] = max(peaks.get(host, 0), active[host])
+        try:
+            return fetch_robots_txt(url, *args, **kwargs)
+        finally:
+            with lock:
+                active[host] -= 1
+
+    monkeypatch.setattr(bulk, 'fetch_robots_txt', counting_fetch)
+    domains = [slow_url, 'https://[not-a-host', missing_url] + [fast_url] * 20
+    rows = run_bulk_audit(
+        domains, max_concurrency=8, per_host_concurrency=2, cache=False, store=ResultStore()
+    )
+
+    assert len(rows) == len(domains) and len(fast_hits) == 20
+    assert peaks[urlparse(fast_url).netloc] == 2
+    # Rows arrive as they complete: the slow host was submitted first but isn't waited for
+    assert [row['Domain'] for row in rows].index(urlparse(slow_url).netloc) >= 10
+    by_status = {}
+    for row in rows:
+        by_status.setdefault(row['Status'], []).append(row)
+    assert len(by_status['✅ Analyzed']) == 21
+    assert by_status['🚫 No robots.txt (all allowed)'][0]['HTTP Status'] == 404
+    error, = by_status['⚠️ Error']
+    assert error['Domain'] == 'https://[not-a-host' and 'IPv6' in error['Error']
@@ -0,0 +1,14 @@
+"""Line readers behind the CLI's --input and --paths-file options"""
+from crawlscope.cli import read_domains, read_lines
+
+
+def test_paths_keep_their_commas(tmp_path):
+    paths = tmp_path / 'paths.txt'
+    paths.write_text("# matrix paths\n/search?q=a,b\n\n/tags/x,y/\n")
+    assert list(read_lines(str(paths))) == ['/search?q=a,b', '/tags/x,y/']
+
+
+def test_domains_come_from_the_first_csv_column(tmp_path):
+    domains = tmp_path / 'domains.csv'
+    domains.write_text("example.com,1200\n# comment\nexample.org\n,missing\n")
+    assert list(read_domains(str(domains))) == ['example.com', 'example.org']
@@ -0,0 +1,74 @@
+"""Content-keyed results must agree with how the parser reads the file"""
+import random
+
+import pytest
+
+from crawlscope.analysis import check_crawler_access, robots_content_key, stored_crawler_access
+from crawlscope.cache import ResultStore
+from crawlscope.robots import RobotsDocument
+
+# Textual variants of one file that normalize_robots_content treats as equal
+EQUIVALENT = [
+    "User-agent: *\nDisallow: /\n",
+    "\ufeffUser-agent: *\nDisallow: /\n",
+    "User-agent: *\r\nDisallow: /\r\n",
+    "# comment\n\n  User-agent: *\n\tDisallow: /\n",
+]
+
+
+def test_equivalent_files_share_a_key():
+    assert len({robots_content_key(content, 'test') for content in EQUIVALENT}) == 1
+
+
+@pytest.mark.parametrize('content', EQUIVALENT)
+def test_equivalent_files_evaluate_alike(content):
+    expected = check_crawler_access(EQUIVALENT[0], '', None)
+    results = check_crawler_access(content, '', None)
+    assert results.allowed == 0
+    assert results.bits == expected.bits
+
+
+def test_byte_order_mark_is_not_part_of_the_first_field():
+    document = RobotsDocument("\ufeffUser-agent: *\nDisallow: /\n")
+    assert document.directives[0][1] == 'user-agent'
+    assert document.groups['*']['disallows'] == ['/']
+
+
+def test_store_does_not_mix_up_bom_and_plain_files():
+    store = ResultStore()
+    with_bom = stored_crawler_access("\ufeffUser-agent: *\nDisallow: /\n", '', store)
+    plain = stored_crawler_access("User-agent: *\nDisallow: /\n", '', store)
+    assert with_bom.allowed == plain.allowed == 0
+    assert store.stats()['memory_hits'] == 1
+
+
+def random_file(rng):
+    """A small robots.txt with the layout noise normalization removes, and its plain form"""
+    lines = []
+    for agent in rng.sample(['*', 'Googlebot', 'GPTBot', 'CCBot'], rng.randint(1, 3)):
+        lines.append(f"User-agent: {agent}")
+        for _ in range(rng.randint(0, 4)):
+            lines.append(f"{rng.choice(['Allow', 'Disallow'])}: /{rng.choice(['', 'a', 'b/', '*.pdf$', 'a*b'])}")
+    decorated = []
+    for line in lines:
+        if rng.random() < 0.3:
+            decorated.append(rng.choice(['', '# note', '   ']))
+        decorated.append(rng.choice(['', ' ', '\t']) + line + rng.choice(['', ' ', '\r']))
+    prefix = '\ufeff' if rng.random() < 0.5 else ''
+    return '\n'.join(lines), prefix + '\n'.join(decorated)
+
+
+def test_files_with_a_shared_key_parse_alike():
+    rng = random.Random(9309)
+    keys = {}
+    for _ in range(300):
+        plain, decorated = random_file(rng)
+        key = robots_content_key(decorated, 'test')
+        assert key == robots_content_key(plain, 'test')
+        # Source line numbers differ, and are not part of the keyed results
+        rules = [{ua: dict(group, line=None) for ua, group in RobotsDocument(content).groups.items()}
+                 for content in (decorated, plain)]
+        assert rules[0] == rules[1]
+        assert check_crawler_access(decorated, '', None).bits == check_crawler_access(plain, '', None).bits
+        # Files with different rules never share a key
+        assert keys.setdefault(key, plain) == plain
@@ -0,0 +1,40 @@
+"""Gzipped WARC archives stream records whatever the member layout"""
+import gzip
+
+import pytest
+
+from crawlscope.corpus import analyze_corpus
+
+
+def warc_record(n):
+    body = f"User-agent: *\nDisallow: /private{n}/\n".encode()
+    response = b"HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\n\r\n" + body
+    return (
+        f"WARC/1.0\r\nWARC-Type: response\r\nWARC-Target-URI: https://site{n}.example/robots.txt\r\n"
+        f"Content-Length: {len(response)}\r\n\r\n"
+    ).encode() + response + b"\r\n\r\n"
+
+
+RECORDS = [warc_record(n) for n in range(200)]
+RAW = b''.join(RECORDS)
+LAYOUTS = {
+    'member per record': b''.join(gzip.compress(record) for record in RECORDS),
+    'single member': gzip.compress(RAW),
+    # Members that cut records in half
+    'fixed-size members': b''.join(gzip.compress(RAW[i:i + 1000]) for i in range(0, len(RAW), 1000)),
+}
+
+
+def urls(path, range_bytes):
+    rows = []
+    analyze_corpus([str(path)], on_row=lambda row, _: rows.append((row['URL'], row['Error'])),
+                   workers=1, range_bytes=range_bytes)
+    return rows
+
+
+@pytest.mark.parametrize('layout', LAYOUTS)
+@pytest.mark.parametrize('range_bytes', [512, 4096, 2**20])
+def test_every_record_is_read_once(tmp_path, layout, range_bytes):
+    path = tmp_path / 'corpus.warc.gz'
+    path.write_bytes(LAYOUTS[layout])
+    assert urls(path, range_bytes) == [(f"https://site{n}.example/robots.txt", None) for n in range(200)]
@@ -0,0 +1,47 @@
+"""Corpus bodies past the RFC 9309 size limit are cut at a line boundary"""
+import gzip
+
+from crawlscope.corpus import analyze_corpus, robots_text
+from crawlscope.fetch import ROBOTS_MAX_BYTES
+
+HEAD = b"User-agent: *\n"
+RULE = b"Disallow: /archive/2019/\n"
+
+
+def oversized_robots():
+    """A file whose size limit falls right after 'Disallow: /' in its last rule"""
+    padding = ROBOTS_MAX_BYTES - len(HEAD) - len(b"Disallow: /")
+    lines = (b"#" * 99 + b"\n") * (padding // 100) + b"#" * (padding % 100 - 1) + b"\n"
+    return HEAD + lines + RULE
+
+
+def rows(path):
+    found = []
+    analyze_corpus([str(path)], on_row=lambda row, _: found.append(row), workers=1)
+    return found
+
+
+def test_partial_last_line_is_dropped():
+    text, truncated = robots_text(oversized_robots())
+    assert truncated and text.endswith('#\n') and 'Disallow' not in text
+
+
+def test_oversized_local_file_does_not_parse_half_a_rule(tmp_path):
+    path = tmp_path / 'robots.txt'
+    path.write_bytes(oversized_robots())
+    row, = rows(path)
+    # "Disallow: /" alone would block every crawler
+    assert row['Blocked'] == 0
+
+
+def test_oversized_warc_record_does_not_parse_half_a_rule(tmp_path):
+    body = oversized_robots()
+    response = b"HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\n\r\n" + body
+    record = (
+        f"WARC/1.0\r\nWARC-Type: response\r\nWARC-Target-URI: https://big.example/robots.txt\r\n"
+        f"Content-Length: {len(response)}\r\n\r\n"
+    ).encode() + response + b"\r\n\r\n"
+    path = tmp_path / 'big.warc.gz'
+    path.write_bytes(gzip.compress(record))
+    row, = rows(path)
+    assert row['URL'] == 'https://big.example/robots.txt' and row['Blocked'] == 0
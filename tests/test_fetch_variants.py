@@ -0,0 +1,82 @@
+"""fetch_robots_txt_with_fallbacks only substitutes a variant for an unreachable URL"""
+import time
+
+import pytest
+
+from crawlscope import fetch
+from crawlscope.fetch import FETCH_SUCCESS, FETCH_UNAVAILABLE, FETCH_UNREACHABLE, create_http_session
+
+VARIANT_ROBOTS = b"User-agent: *\nDisallow: /\n"
+
+
+@pytest.fixture
+def variants(robots_server, monkeypatch):
+    """An original server and a www stand-in; returns a function that sets the variant list"""
+    original_url, original, original_hits = robots_server()
+    variant_url, variant, variant_hits = robots_server()
+    variant.append((200, {}, VARIANT_ROBOTS))
+
+    def use(original=original_url, www=variant_url):
+        monkeypatch.setattr(fetch, 'url_variants', lambda url: [('Original URL', original), ('With WWW', www)])
+        return original
+
+    use()
+    return original_url, original, variant, variant_hits, use
+
+
+def fallbacks(url, **kwargs):
+    return fetch.fetch_robots_txt_with_fallbacks(url, session=create_http_session(retries=0), cache=False, **kwargs)
+
+
+def test_missing_robots_txt_is_not_replaced_by_a_variant(variants):
+    url, original, _, variant_hits, _ = variants
+    original.append((404, {}, b'not found'))
+    result = fallbacks(url)
+    assert result.outcome == FETCH_UNAVAILABLE and result.variant == 'Original URL'
+    assert variant_hits == []
+
+
+def test_unreachable_url_falls_back_to_a_variant(variants):
+    url, original, _, _, _ = variants
+    original.append((503, {}, b'down'))
+    result = fallbacks(url)
+    assert result.outcome == FETCH_SUCCESS and result.variant == 'With WWW'
+    assert result.content == VARIANT_ROBOTS.decode()
+
+
+def test_reachable_url_needs_no_variants(variants):
+    url, original, _, variant_hits, _ = variants
+    original.append((200, {}, b"User-agent: *\nAllow: /\n"))
+    assert fallbacks(url).variant == 'Original URL'
+    assert variant_hits == []
+
+
+def test_failed_variants_are_recorded(variants):
+    url, original, variant, _, _ = variants
+    original.append((503, {}, b'down'))
+    variant[:] = [(503, {}, b'down too')]
+    result = fallbacks(url)
+    assert result.outcome == FETCH_UNREACHABLE and result.status_code == 503
+    assert result.variant == 'Original URL' and result.tried_variants == ['With WWW']
+
+
+def test_hung_original_still_races_the_variants(variants, hanging_server, monkeypatch):
+    url = variants[4](original=hanging_server())
+    monkeypatch.setattr(fetch, 'FETCH_READ_TIMEOUT', 1)
+    start = time.monotonic()
+    # The original alone outlasts the deadline; the variants still get their turn
+    result = fallbacks(url, deadline=0.5)
+    assert result.outcome == FETCH_SUCCESS and result.variant == 'With WWW'
+    assert time.monotonic() - start < 3
+
+
+def test_variants_that_do_not_answer_are_abandoned_at_the_deadline(variants, hanging_server):
+    url, original, _, _, use = variants
+    original.append((503, {}, b'down'))
+    use(www=hanging_server())
+    start = time.monotonic()
+    result = fallbacks(url, deadline=0.5)
+    assert time.monotonic() - start < 2
+    assert result.outcome == FETCH_UNREACHABLE and result.variant == 'Original URL'
+    # The hung variant was never settled, so it is not reported as tried
+    assert result.tried_variants == []
@@ -0,0 +1,130 @@
+"""RFC 9309 rule matching: precedence, wildcards and the trie against the flat program"""
+import random
+import re
+import time
+
+import pytest
+
+from crawlscope.matching import PrefixRuleIndex, RuleProgram, compile_pattern, compile_rules
+from crawlscope.robots import RobustRobotsParser
+
+
+def reference_match(pattern, path):
+    """The pattern as a regex: '*' is any run of characters, a trailing '$' ends the URL"""
+    anchored = pattern.endswith('$')
+    body = pattern[:-1] if anchored else pattern
+    regex = '.*'.join(re.escape(segment) for segment in body.split('*'))
+    return re.match(regex + (r'\Z' if anchored else ''), path, re.DOTALL) is not None
+
+
+def reference_decide(rules, path):
+    """Longest matching pattern wins, counting a '$'; Allow wins ties"""
+    matches = [(len(pattern), allowed) for pattern, allowed in rules if pattern and reference_match(pattern, path)]
+    return max(matches)[1] if matches else None
+
+
+@pytest.mark.parametrize('rules, path, expected', [
+    # Longest match wins, whichever comes first in the file
+    ([('/a', False), ('/a/b', True)], '/a/b/c', True),
+    ([('/a/b', True), ('/a', False)], '/a/c', False),
+    ([('/shop', True), ('/shop/cart', False)], '/shop/cart/1', False),
+    # Allow wins a tie between patterns of the same length
+    ([('/p', False), ('/p', True)], '/p/x', True),
+    ([('/a*', False), ('/ab', True)], '/abc', True),
+    # The '$' anchor counts towards the pattern length
+    ([('/page', False), ('/page$', True)], '/page', True),
+    ([('/page', False), ('/page$', True)], '/page2', False),
+    # Wildcard patterns are measured by their text, not by what they match
+    ([('/*.php', False), ('/admin/', True)], '/admin/x.php', True),
+    ([('/', True), ('/*', False)], '/x', False),
+    # Empty patterns match nothing
+    ([('', False)], '/x', None),
+    ([], '/x', None),
+])
+def test_precedence(rules, path, expected):
+    assert RuleProgram([rule for rule in rules if rule[0]]).decide(path) is expected
+    assert compile_rules(rules, index_min_rules=1).decide(path) is expected
+    assert reference_decide(rules, path) is expected
+
+
+@pytest.mark.parametrize('pattern, matches, misses', [
+    ('/fish', ['/fish', '/fish.html', '/fishheads/x'], ['/Fish', '/catfish']),
+    ('/fish*', ['/fish', '/fishy'], ['/fis']),
+    ('/fish/', ['/fish/', '/fish/?id=1'], ['/fish']),
+    ('/*.php', ['/index.php', '/a/b.php?x=1', '/x.phpx'], ['/', '/php']),
+    ('/*.php$', ['/index.php', '/a/b.php'], ['/index.php?x', '/x.phpx']),
+    ('/fish*.php', ['/fish.php', '/fishheads/catfish.php?p=1'], ['/Fish.PHP']),
+    ('/a$', ['/a'], ['/ab', '/a/']),
+    ('/$', ['/'], ['/a']),
+    ('*', ['/', '/anything'], []),
+    ('/a*b*c', ['/abc', '/aXbYc', '/abbc/d'], ['/acb', '/ab']),
+    ('/a*a$', ['/aa', '/aXa'], ['/a', '/aab']),
+])
+def test_wildcard_and_anchor_semantics(pattern, matches, misses):
+    matcher = compile_pattern(pattern)
+    for path in matches:
+        assert matcher(path), path
+    for path in misses:
+        assert not matcher(path), path
+
+
+def test_hostile_wildcards_do_not_backtrack():
+    matcher = compile_pattern('/*a*a*a*a*a*a*a*a*b')
+    start = time.perf_counter()
+    assert not matcher('/' + 'a' * 50000)
+    assert time.perf_counter() - start < 1
+
+
+def random_pattern(rng, alphabet='ab/.'):
+    pattern = '/' + ''.join(rng.choice(alphabet + '*') for _ in range(rng.randint(0, 5)))
+    return pattern + '$' if rng.random() < 0.25 else pattern
+
+
+def random_path(rng, alphabet='ab/.'):
+    return '/' + ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 8)))
+
+
+def test_patterns_agree_with_the_reference():
+    rng = random.Random(9309)
+    for _ in range(3000):
+        pattern = random_pattern(rng)
+        path = random_path(rng)
+        assert compile_pattern(pattern)(path) == reference_match(pattern, path), (pattern, path)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_trie_agrees_with_the_flat_program(seed):
+    rng = random.Random(seed)
+    rules = [(random_pattern(rng), rng.random() < 0.5) for _ in range(rng.randint(64, 200))]
+    # Some patterns both allowed and disallowed
+    rules.extend((pattern, not allowed) for pattern, allowed in rng.sample(rules, 10))
+    index = PrefixRuleIndex(rules)
+    program = RuleProgram(rules)
+    assert len(index) == len(program)
+    for _ in range(300):
+        path = random_path(rng)
+        assert index.match(path) == program.match(path), path
+        assert program.decide(path) == reference_decide(rules, path), path
+
+
+def test_parser_decides_alike_with_and_without_the_trie():
+    rng = random.Random(42)
+    lines = ['User-agent: *']
+    for _ in range(100):
+        lines.append(f"{rng.choice(['Allow', 'Disallow'])}: {random_pattern(rng)}")
+    content = '\n'.join(lines)
+    indexed = RobustRobotsParser(content, '', index_min_rules=1)
+    flat = RobustRobotsParser(content, '', index_min_rules=None)
+    assert isinstance(indexed.rules['*']['program'], PrefixRuleIndex)
+    assert isinstance(flat.rules['*']['program'], RuleProgram)
+    for _ in range(500):
+        path = random_path(rng)
+        assert indexed.can_fetch('AnyBot', path) == flat.can_fetch('AnyBot', path), path
+
+
+def test_group_columns_share_one_entry_per_group():
+    parser = RobustRobotsParser("User-agent: GPTBot\nDisallow: /\n\nUser-agent: *\nDisallow: /a\n", '')
+    group_keys, columns = parser.group_columns(['gptbot', 'googlebot', 'ccbot', '', 'gptbot'])
+    assert group_keys == ['GPTBot', '*', None]
+    assert columns == [0, 1, 1, 2, 0]
+    assert parser.program(None) is None and parser.program('GPTBot').decide('/x') is False
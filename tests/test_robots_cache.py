@@ -0,0 +1,79 @@
+"""RobotsCache revalidation against a local HTTP server"""
+import pytest
+
+from crawlscope.fetch import (
+    DISALLOW_ALL_ROBOTS,
+    FETCH_SUCCESS,
+    FETCH_UNREACHABLE,
+    FetchResult,
+    RobotsCache,
+    create_http_session,
+    fetch_robots_txt
+)
+
+ROBOTS = "User-agent: *\nDisallow: /private\n"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    # Zero TTLs make every entry stale, so each fetch revalidates
+    cache = RobotsCache(str(tmp_path / 'robots.sqlite3'), ttls={FETCH_SUCCESS: 0, FETCH_UNREACHABLE: 0})
+    yield cache
+    cache.close()
+
+
+def test_unreachable_revalidation_serves_the_cached_copy(robots_server, cache):
+    url, responses, _ = robots_server()
+    session = create_http_session(retries=0)
+    responses[:] = [(200, {'ETag': '"v1"'}, ROBOTS.encode()), (304, {}, b''), (503, {}, b'down')]
+
+    assert fetch_robots_txt(url, session, cache).content == ROBOTS
+    assert fetch_robots_txt(url, session, cache).from_cache
+
+    stale = fetch_robots_txt(url, session, cache)
+    assert stale.outcome == FETCH_SUCCESS and stale.stale
+    assert stale.effective_content == ROBOTS
+    assert stale.error == 'HTTP 503'
+    # The failure did not replace the good copy
+    assert cache.get(f"{url}/robots.txt")['body'] == ROBOTS
+
+
+def test_unreachable_without_a_cached_copy_disallows_all(robots_server, cache):
+    url, responses, _ = robots_server()
+    responses[:] = [(503, {}, b'down')]
+    result = fetch_robots_txt(url, create_http_session(retries=0), cache)
+    assert result.outcome == FETCH_UNREACHABLE and not result.stale
+    assert result.effective_content == DISALLOW_ALL_ROBOTS
+
+
+def test_force_downloads_a_fresh_entry_again(robots_server, tmp_path):
+    url, responses, hits = robots_server()
+    session = create_http_session(retries=0)
+    responses[:] = [(200, {}, ROBOTS.encode()), (200, {}, b"User-agent: *\nAllow: /\n")]
+    fresh = RobotsCache(str(tmp_path / 'fresh.sqlite3'))
+    try:
+        fetch_robots_txt(url, session, fresh)
+        assert fetch_robots_txt(url, session, fresh).from_cache
+        assert len(hits) == 1
+
+        forced = fetch_robots_txt(url, session, fresh, force=True)
+        assert not forced.from_cache and forced.content == "User-agent: *\nAllow: /\n"
+        # The new download replaces the cached copy
+        assert fetch_robots_txt(url, session, fresh).content == forced.content
+    finally:
+        fresh.close()
+
+
+def test_eviction_keeps_the_size_total_and_drops_the_oldest(tmp_path):
+    small = RobotsCache(str(tmp_path / 'small.sqlite3'), max_bytes=1000)
+    try:
+        for n in range(12):
+            small.put(FetchResult(f"https://site{n}.example/robots.txt", FETCH_SUCCESS, content='x' * 100))
+        # Replacing an entry counts only the new body
+        small.put(FetchResult("https://site11.example/robots.txt", FETCH_SUCCESS, content='x' * 50))
+        stored = small._conn.execute('SELECT COALESCE(SUM(size), 0) FROM robots_fetches').fetchone()[0]
+        assert small._size == stored <= 1000
+        assert small.get("https://site0.example/robots.txt") is None
+        assert small.get("https://site11.example/robots.txt")['body'] == 'x' * 50
+    finally:
+        small.close()